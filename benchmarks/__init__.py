@@ -0,0 +1 @@
+# 合成仓库上的基准测试，运行方式见 __main__.py
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import BENCHMARKS, run_suite
+from benchmarks.synthetic import make_repo
+
+# 基准入口：
+#   python -m benchmarks                         生成合成仓库并运行全部基准
+#   python -m benchmarks --quick                 小规模（调试用）
+#   python -m benchmarks -o result.json          写入 JSON 结果
+#   python -m benchmarks --save-baseline         保存为基线；之后的运行自动与基线比较
+#   python -m benchmarks --repo 路径              在已有仓库上运行（跳过生成）
+# 耗时与机器相关，基线不随代码提交：默认保存在 ~/.git_manager/benchmarks/baseline.json，
+# 同一台机器上的各个检出共用；CI 等环境可用 --baseline 指定其他位置。
+
+DEFAULT_BASELINE = os.path.join(os.path.expanduser('~'), '.git_manager', 'benchmarks', 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+QUICK = {'files': 2000, 'dirty': 200, 'branches': 20, 'history': 200}
+
+
+def _git_version():
+    try:
+        return subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    # 按 p50 比较；返回 [(名称, 基线 ms, 本次 ms, 比值, 结论)]
+    rows = []
+    for name, current in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base or not base.get('p50_ms'):
+            rows.append((name, None, current['p50_ms'], None, 'new'))
+            continue
+        ratio = current['p50_ms'] / base['p50_ms']
+        if ratio > 1 + tolerance:
+            verdict = 'slower'
+        elif ratio < 1 - tolerance:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        rows.append((name, base['p50_ms'], current['p50_ms'], round(ratio, 3), verdict))
+    return rows
+
+
+def _print_table(results, comparison):
+    verdicts = {row[0]: row for row in comparison}
+    labels = {'slower': '变慢', 'faster': '变快', 'same': '持平', 'new': '无基线'}
+    print(f"{'基准':<16}{'p50 (ms)':>12}{'p95 (ms)':>12}{'基线 p50':>12}{'比值':>8}  结论")
+    for name, result in results.items():
+        row = verdicts.get(name)
+        base = f"{row[1]:.2f}" if row and row[1] is not None else '-'
+        ratio = f"{row[3]:.2f}" if row and row[3] is not None else '-'
+        verdict = labels[row[4]] if row else ''
+        print(f"{name:<16}{result['p50_ms']:>12.2f}{result['p95_ms']:>12.2f}{base:>12}{ratio:>8}  {verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Git Manager 基准测试")
+    parser.add_argument('--files', type=int, default=20000, help="文件数")
+    parser.add_argument('--dirty', type=int, default=2000, help="脏路径数")
+    parser.add_argument('--branches', type=int, default=200, help="分支数")
+    parser.add_argument('--history', type=int, default=2000, help="提交数")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--quick', action='store_true', help="使用小规模参数")
+    parser.add_argument('--repo', help="在已有仓库上运行，不生成合成仓库")
+    parser.add_argument('--keep', action='store_true', help="保留生成的合成仓库")
+    parser.add_argument('--repeat', type=int, default=5, help="每项重复次数")
+    parser.add_argument('--only', help="只运行指定的基准（逗号分隔）：" + ','.join(BENCHMARKS))
+    parser.add_argument('-o', '--output', help="把 JSON 结果写入文件")
+    parser.add_argument('--json', action='store_true', help="在标准输出打印 JSON 而不是表格")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="基线文件")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="p50 变化超过该比例视为变化")
+    parser.add_argument('--fail-on-regression', action='store_true', help="有基准变慢时以退出代码 1 结束")
+    args = parser.parse_args(argv)
+
+    params = {'files': args.files, 'dirty': args.dirty, 'branches': args.branches, 'history': args.history,
+              'seed': args.seed}
+    if args.quick:
+        params.update(QUICK)
+    only = set(args.only.split(',')) if args.only else None
+    log = (lambda msg: print(msg, file=sys.stderr)) if args.json else print
+
+    workdir = None
+    if args.repo:
+        repo = os.path.abspath(args.repo)
+        params = {'repo': repo}
+    else:
+        workdir = tempfile.mkdtemp(prefix='gitpro-bench-')
+        log(f"生成合成仓库 {params} ...")
+        started = time.perf_counter()
+        repo = make_repo(workdir, **params)
+        log(f"生成完成，用时 {time.perf_counter() - started:.1f} s: {repo}")
+    try:
+        results = run_suite(repo, repeat=args.repeat, only=only, on_progress=lambda name: log(f"运行 {name} ..."))
+    finally:
+        if workdir and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params': params,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'git': _git_version(),
+        },
+        'results': results,
+    }
+    comparison = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('params') != params:
+            log(f"注意：基线参数 {baseline.get('meta', {}).get('params')} 与本次不同，比较结果仅供参考")
+        comparison = compare(results, baseline, args.tolerance)
+        report['comparison'] = [dict(zip(('name', 'baseline_p50_ms', 'p50_ms', 'ratio', 'verdict'), row))
+                                for row in comparison]
+
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    else:
+        _print_table(results, comparison)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        log(f"已保存基线: {args.baseline}")
+    if args.fail_on_regression and any(row[4] == 'slower' for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import heapq
+import itertools
+import threading
+import time
+
+# 无界面运行 UiDispatcher 的替身根窗口：只实现 after / after_idle / after_cancel，
+# 可从任意线程调用。不使用 tkinter.Tcl()：没有运行 mainloop 时，Tcl 的跨线程
+# after() 会等待约 1 秒后失败，测得的延迟没有意义。
+
+
+class HeadlessRoot:
+    def __init__(self):
+        self._timers = []
+        self._seq = itertools.count()
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def after(self, ms, callback=None, *args):
+        seq = next(self._seq)
+        after_id = f"after#{seq}"
+        with self._lock:
+            heapq.heappush(self._timers, (time.perf_counter() + ms / 1000.0, seq, after_id, callback, args))
+        self._wake.set()
+        return after_id
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, after_id):
+        with self._lock:
+            self._cancelled.add(after_id)
+
+    def pump(self, timeout=0.01):
+        # 执行所有到期的定时器；没有到期的定时器时最多等待 timeout 秒
+        with self._lock:
+            next_due = self._timers[0][0] if self._timers else None
+        wait = timeout if next_due is None else max(0.0, min(timeout, next_due - time.perf_counter()))
+        if wait:
+            self._wake.wait(wait)
+        self._wake.clear()
+        now = time.perf_counter()
+        while True:
+            with self._lock:
+                if not self._timers or self._timers[0][0] > now:
+                    return
+                _, _, after_id, callback, args = heapq.heappop(self._timers)
+                if after_id in self._cancelled:
+                    self._cancelled.discard(after_id)
+                    continue
+            callback(*args)
+
+
+def pump_until(root, predicate, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("等待界面回调超时")
+        root.pump(0.005)
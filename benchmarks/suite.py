@@ -0,0 +1,280 @@
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from gitpro.branches import BranchIndex, BranchMatcher
+from gitpro.cache import RepoStateCache
+from gitpro.diffs import MODE_UNTRACKED, load_diff
+from gitpro.dispatch import UiDispatcher
+from gitpro.executor import GitExecutor, PRIORITY_INTERACTIVE
+from gitpro.logbuffer import LogBuffer
+from gitpro.perf import PerfRecorder, summarize
+from gitpro.porcelain import STATUS_COMMAND, parse_status
+from gitpro.service import GitService
+from gitpro.snapshot import REFS_COMMAND, RepoSnapshot, collect_snapshot, parse_refs
+from gitpro.staging import plan_staging
+from gitpro.status_model import StatusModel
+
+from benchmarks.headless import HeadlessRoot, pump_until
+
+# 各项基准：每项重复 repeat 次，返回 summarize() 的统计加上附加信息。
+# 界面部分使用 HeadlessRoot，与应用中相同的 UiDispatcher / GitExecutor / StatusModel。
+
+DISPATCH_CALLBACKS = 5000
+LOG_LINES = 100000
+LOG_FRAME_LINES = 1000
+# 分支搜索逐字输入的查询
+BRANCH_QUERIES = ['feature/branch-01', 'fb01', 'origin/ma']
+# 差异基准的新文件行数（约 40 MB 的差异）与每次读取的可见行数
+DIFF_LINES = 600000
+DIFF_WINDOW = 60
+
+
+def _capture(command, cwd):
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS='0')
+    return subprocess.run(command, cwd=cwd, capture_output=True, env=env, check=True).stdout
+
+
+def _timed(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def bench_status_parse(repo, repeat):
+    # 只解析：status --porcelain=v2 -z 的输出已预先取得
+    data = _capture(STATUS_COMMAND, repo)
+    _, entries = parse_status(data)
+    result = summarize(_timed(lambda: parse_status(data), repeat))
+    result.update(entries=len(entries), bytes=len(data))
+    return result
+
+
+def bench_status_snapshot(repo, repeat):
+    # 启动 git status 并边读边解析（不含分支）
+    snapshots = []
+    result = summarize(_timed(lambda: snapshots.append(collect_snapshot(repo, with_refs=False)), repeat))
+    result.update(entries=len(snapshots[-1].entries), processes=snapshots[-1].process_count)
+    return result
+
+
+def bench_status_model(repo, repeat):
+    # 全量加载后再做一次约 10% 变化的增量刷新
+    _, entries = parse_status(_capture(STATUS_COMMAND, repo))
+    rows = [(entry.code, entry.path, entry.orig_path) for entry in entries]
+    changed = [(('A ' if i % 10 == 0 else code), path, orig) for i, (code, path, orig) in enumerate(rows)]
+    def cycle():
+        model = StatusModel()
+        for batch in (rows, changed):
+            model.begin_update()
+            model.feed(batch)
+            model.end_update()
+    result = summarize(_timed(cycle, repeat))
+    result.update(entries=len(rows))
+    return result
+
+
+def bench_stage_plan(repo, repeat):
+    # 由已解析的状态生成暂存计划（含大文件检查），不启动 git
+    snapshot = collect_snapshot(repo, with_refs=False)
+    plans = []
+    result = summarize(_timed(lambda: plans.append(plan_staging(repo, snapshot.entries)), repeat))
+    result.update(entries=len(snapshot.entries), paths=len(plans[-1].paths))
+    return result
+
+
+def bench_diff_stream(repo, repeat):
+    # 读取一个大文件的差异（git diff --no-index，与新文件相同），以及按滚动位置读取可见行
+    with tempfile.TemporaryDirectory(prefix='gitpro-bench-') as root:
+        with open(os.path.join(root, 'large.txt'), 'w', encoding='utf-8') as f:
+            for i in range(DIFF_LINES):
+                f.write(f"line {i:07d} {'x' * 56}\n")
+        documents = []
+        result = summarize(_timed(lambda: documents.append(load_diff(root, MODE_UNTRACKED, 'large.txt')), repeat))
+        document = documents[-1]
+        step = max(1, document.line_count // 200)
+        started = time.perf_counter()
+        for line in range(0, document.line_count, step):
+            document.lines(line, DIFF_WINDOW)
+        window_ms = (time.perf_counter() - started) * 1000 / len(range(0, document.line_count, step))
+        result.update(lines=document.line_count, mb=round(document.size / 1048576, 1), window_ms=round(window_ms, 3))
+        for document in documents:
+            document.close()
+    return result
+
+
+def bench_branch_parse(repo, repeat):
+    output = _capture(REFS_COMMAND, repo).decode('utf-8', errors='replace')
+    snapshot = RepoSnapshot(path=repo)
+    result = summarize(_timed(lambda: parse_refs(output, RepoSnapshot(path=repo)), repeat))
+    parse_refs(output, snapshot)
+    result.update(local=len(snapshot.local_branches), remote=len(snapshot.remote_branches))
+    return result
+
+
+def bench_branch_index(repo, repeat):
+    # for-each-ref 全量加载（含上游与领先 / 落后）
+    indexes = []
+    def load():
+        index = BranchIndex(repo)
+        index.refresh()
+        indexes.append(index)
+    result = summarize(_timed(load, repeat))
+    result.update(branches=len(indexes[-1]), processes=indexes[-1].process_count)
+    return result
+
+
+def bench_branch_search(repo, repeat):
+    # 模拟逐字输入：每次按键的耗时，匹配缓存在每轮开始时清空
+    index = BranchIndex(repo)
+    index.refresh()
+    ordered = index.ordered
+    durations = []
+    for _ in range(repeat):
+        matcher = BranchMatcher([b.name for b in ordered], [b.short_name for b in ordered],
+                                remotes={b.remote for b in ordered if b.remote})
+        for query in BRANCH_QUERIES:
+            for length in range(1, len(query) + 1):
+                started = time.perf_counter()
+                matcher.search(query[:length])
+                durations.append(time.perf_counter() - started)
+    result = summarize(durations)
+    result.update(branches=len(ordered), keystrokes=len(durations))
+    return result
+
+
+def bench_dispatch(repo, repeat):
+    # 后台线程连续投递回调，统计从投递到在“界面线程”执行的延迟与吞吐
+    latencies = []
+    durations = []
+    for _ in range(repeat):
+        root = HeadlessRoot()
+        recorder = PerfRecorder(max_samples=DISPATCH_CALLBACKS)
+        dispatcher = UiDispatcher(root, recorder=recorder)
+        dispatcher.start()
+        done = []
+        def producer():
+            for i in range(DISPATCH_CALLBACKS):
+                dispatcher.post(done.append, i)
+        started = time.perf_counter()
+        thread = threading.Thread(target=producer)
+        thread.start()
+        pump_until(root, lambda: len(done) >= DISPATCH_CALLBACKS)
+        durations.append(time.perf_counter() - started)
+        thread.join()
+        dispatcher.stop()
+        latencies.append(recorder.callback_stats()['list.append']['latency_p95_ms'])
+    result = summarize(durations)
+    result.update(callbacks=DISPATCH_CALLBACKS, latency_p95_ms=max(latencies),
+                  per_second=round(DISPATCH_CALLBACKS / (sum(durations) / len(durations))))
+    return result
+
+
+def bench_log(repo, repeat):
+    # 每帧取出一次，与界面刷新节奏相同；同时写入磁盘日志
+    line = "remote: Counting objects: 100% (1234/1234), done.\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            buffer = LogBuffer(max_lines=1000, spill_path=os.path.join(tmp, 'logs', 'session.log'))
+            for i in range(LOG_LINES):
+                buffer.append(line, 'OUTPUT')
+                if i % LOG_FRAME_LINES == 0:
+                    buffer.drain()
+            buffer.close()
+        durations = _timed(run, repeat)
+    result = summarize(durations)
+    result.update(lines=LOG_LINES, per_second=round(LOG_LINES / (sum(durations) / len(durations))))
+    return result
+
+
+def _refresh(repo, executor, dispatcher, root, cache, model):
+    # 与 GitProManager.refresh_all_status 相同的流程：快照任务在工作线程执行，
+    # 状态条目逐批投递到界面线程，完成后结束模型更新
+    finished = []
+    model.begin_update()
+    def task(job):
+        snapshot = collect_snapshot(repo, job=job, cache=cache,
+                                    on_entries=lambda batch: dispatcher.post(
+                                        model.feed, ([(e.code, e.path, e.orig_path) for e in batch],)))
+        return {'stdout': '', 'stderr': '', 'returncode': 0, 'snapshot': snapshot}
+    def on_done(result):
+        model.end_update()
+        finished.append(result)
+    executor.submit(task, on_done=lambda result: dispatcher.post(on_done, result), group=repo,
+                    priority=PRIORITY_INTERACTIVE, name='snapshot')
+    pump_until(root, lambda: bool(finished))
+    return finished[0]['snapshot']
+
+
+def _bench_refresh(repo, repeat, warm):
+    root = HeadlessRoot()
+    dispatcher = UiDispatcher(root)
+    dispatcher.start()
+    executor = GitExecutor(max_workers=4)
+    cache = RepoStateCache()
+    model = StatusModel()
+    snapshots = []
+    try:
+        _refresh(repo, executor, dispatcher, root, cache, model)
+        def run():
+            if not warm:
+                cache.invalidate(repo)
+            snapshots.append(_refresh(repo, executor, dispatcher, root, cache, model))
+        durations = _timed(run, repeat)
+    finally:
+        executor.shutdown()
+        dispatcher.stop()
+    result = summarize(durations)
+    result.update(processes=snapshots[-1].process_count, entries=len(model))
+    return result
+
+
+def bench_refresh_cold(repo, repeat):
+    return _bench_refresh(repo, repeat, warm=False)
+
+
+def bench_refresh_warm(repo, repeat):
+    # 分支数据命中指纹缓存，只启动 git status
+    return _bench_refresh(repo, repeat, warm=True)
+
+
+def bench_sync(repo, repeat):
+    # 对本地 origin 执行 git pull（已是最新）
+    service = GitService(repo)
+    outcomes = []
+    result = summarize(_timed(lambda: outcomes.append(service.sync_branch()), repeat))
+    result.update(ok=all(outcome.ok for outcome in outcomes))
+    return result
+
+
+BENCHMARKS = {
+    'status_parse': bench_status_parse,
+    'status_snapshot': bench_status_snapshot,
+    'status_model': bench_status_model,
+    'stage_plan': bench_stage_plan,
+    'diff_stream': bench_diff_stream,
+    'branch_parse': bench_branch_parse,
+    'branch_index': bench_branch_index,
+    'branch_search': bench_branch_search,
+    'dispatch': bench_dispatch,
+    'log': bench_log,
+    'refresh_cold': bench_refresh_cold,
+    'refresh_warm': bench_refresh_warm,
+    'sync': bench_sync,
+}
+
+
+def run_suite(repo, repeat=5, only=None, on_progress=None):
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        if on_progress:
+            on_progress(name)
+        results[name] = bench(repo, repeat)
+    return results
@@ -0,0 +1,93 @@
+import os
+import random
+import subprocess
+
+# 合成测试仓库：用 git fast-import 一次性写入 N 个文件、深历史与 K 个分支，
+# 检出后制造 M 个脏路径，并创建本地裸仓库作为 origin。固定种子与提交时间，结果可复现。
+
+BENCH_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'Bench', 'GIT_AUTHOR_EMAIL': 'bench@example.com',
+    'GIT_COMMITTER_NAME': 'Bench', 'GIT_COMMITTER_EMAIL': 'bench@example.com',
+}
+BASE_TIME = 1700000000
+
+
+def _git(args, cwd, input=None):
+    env = dict(os.environ, **BENCH_IDENTITY)
+    result = subprocess.run(["git"] + args, cwd=cwd, input=input, capture_output=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} 失败: {result.stderr.decode('utf-8', errors='replace')}")
+    return result.stdout
+
+
+def file_path(i):
+    # 约 100 个顶层目录、每个目录下再分子目录，接近真实项目的目录深度
+    return f"src/d{i % 100:03d}/sub{(i // 100) % 10}/file_{i:06d}.txt"
+
+
+def _data(text):
+    raw = text.encode('utf-8')
+    return b'data %d\n%s\n' % (len(raw), raw)
+
+
+def _fast_import_stream(files, history, branches, rng):
+    chunks = []
+    # 第 1 个提交写入全部文件
+    chunks.append(b'commit refs/heads/main\nmark :1\n')
+    chunks.append(b'committer Bench <bench@example.com> %d +0000\n' % BASE_TIME)
+    chunks.append(_data('初始导入'))
+    for i in range(files):
+        chunks.append(b'M 100644 inline %s\n' % file_path(i).encode())
+        chunks.append(_data(f"file {i}\n" + "x" * rng.randint(16, 256)))
+    # 之后每个提交修改一个文件，形成深历史
+    for n in range(1, history):
+        mark = n + 1
+        chunks.append(b'commit refs/heads/main\nmark :%d\n' % mark)
+        chunks.append(b'committer Bench <bench@example.com> %d +0000\n' % (BASE_TIME + n * 60))
+        chunks.append(_data(f"修改 {n}"))
+        chunks.append(b'from :%d\n' % (mark - 1))
+        target = rng.randrange(files) if files else 0
+        chunks.append(b'M 100644 inline %s\n' % file_path(target).encode())
+        chunks.append(_data(f"file {target} rev {n}\n"))
+    # 分支指向历史中的随机提交
+    for k in range(branches):
+        chunks.append(b'reset refs/heads/feature/branch-%04d\nfrom :%d\n\n' % (k, rng.randint(1, max(1, history))))
+    return b''.join(chunks)
+
+
+def make_dirty(work, files, dirty, rng):
+    # 一半修改已跟踪文件，十分之一删除，其余为未跟踪文件
+    modified = dirty // 2
+    deleted = min(dirty // 10, max(0, files - modified))
+    untracked = max(0, dirty - modified - deleted)
+    tracked = rng.sample(range(files), min(files, modified + deleted))
+    for i in tracked[:modified]:
+        with open(os.path.join(work, file_path(i)), 'a', encoding='utf-8') as f:
+            f.write("dirty\n")
+    for i in tracked[modified:]:
+        os.remove(os.path.join(work, file_path(i)))
+    for i in range(untracked):
+        path = os.path.join(work, 'untracked', f"u{i % 50:02d}", f"new_{i:06d}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"untracked {i}\n")
+    return {'modified': modified, 'deleted': len(tracked) - modified, 'untracked': untracked}
+
+
+def make_repo(root, files=20000, dirty=2000, branches=200, history=2000, seed=1):
+    # 在 root 下创建 work（工作仓库）与 origin.git（裸仓库），返回 work 的路径
+    rng = random.Random(seed)
+    history = max(1, history)
+    work = os.path.join(root, 'work')
+    origin = os.path.join(root, 'origin.git')
+    os.makedirs(work)
+    _git(["init", "-q", "-b", "main"], work)
+    _git(["fast-import", "--quiet"], work, input=_fast_import_stream(files, history, branches, rng))
+    _git(["reset", "-q", "--hard", "main"], work)
+    _git(["clone", "-q", "--bare", work, origin], root)
+    _git(["remote", "add", "origin", origin], work)
+    _git(["fetch", "-q", "origin"], work)
+    _git(["branch", "-q", "-u", "origin/main"], work)
+    _git(["remote", "set-head", "origin", "main"], work)
+    make_dirty(work, files, dirty, rng)
+    return work
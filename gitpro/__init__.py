@@ -0,0 +1 @@
+# Git Pro Manager 的非界面核心模块
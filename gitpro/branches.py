@@ -0,0 +1,275 @@
+import os
+import re
+import threading
+from typing import NamedTuple
+
+from gitpro.cache import repo_fingerprint, stat_key
+from gitpro.executor import run_git
+from gitpro.gitdir import resolve_common_dir, resolve_git_dir
+
+# 分支索引：for-each-ref 的机器可读输出，包含本地 / 远程分支、上游、领先 / 落后与最后提交时间。
+# refs 变化时只对改动过的松散引用重新执行 for-each-ref；packed-refs 或 config 变化时整体重建。
+# 搜索按前缀、子串、子序列三档排序；输入追加字符时只在上一次的结果中继续筛选。
+
+BRANCH_FORMAT = ('--format=%(refname)%00%(objectname)%00%(upstream:short)%00%(upstream:track,nobracket)'
+                 '%00%(committerdate:unix)%00%(symref)')
+BRANCH_PATTERNS = ["refs/heads", "refs/remotes"]
+# 改动的松散引用超过该数量时整体重建（也避免命令行过长）
+INCREMENTAL_LIMIT = 256
+MATCH_CACHE_SIZE = 64
+_TRACK_RE = re.compile(r'(ahead|behind) (\d+)')
+
+
+class Branch(NamedTuple):
+    # name：本地分支为 "main"，远程分支为 "origin/main"
+    name: str
+    refname: str
+    remote: str
+    oid: str
+    upstream: str
+    ahead: int
+    behind: int
+    # 上游已被删除
+    gone: bool
+    date: int
+
+    @property
+    def is_remote(self):
+        return bool(self.remote)
+
+    @property
+    def short_name(self):
+        # 去掉远程名的部分，用于前缀匹配与切换
+        return self.name[len(self.remote) + 1:] if self.remote else self.name
+
+
+def parse_branch(line):
+    # 返回 (Branch 或 None, 默认分支或 None)
+    fields = line.split('\0')
+    if len(fields) < 6:
+        return None, None
+    refname, oid, upstream, track, date, symref = fields[:6]
+    if refname.startswith('refs/heads/'):
+        name, remote = refname[len('refs/heads/'):], ''
+    elif refname.startswith('refs/remotes/'):
+        name = refname[len('refs/remotes/'):]
+        remote = name.split('/', 1)[0]
+        if symref:
+            # refs/remotes/origin/HEAD -> refs/remotes/origin/main
+            default = symref.split('/')[-1] if name == 'origin/HEAD' else None
+            return None, default
+    else:
+        return None, None
+    ahead = behind = 0
+    for kind, count in _TRACK_RE.findall(track):
+        if kind == 'ahead':
+            ahead = int(count)
+        else:
+            behind = int(count)
+    return Branch(name, refname, remote, oid, upstream, ahead, behind, track == 'gone', int(date or 0)), None
+
+
+def _sort_key(branch):
+    # 本地分支在前，其后按名称
+    return (1 if branch.remote else 0, branch.name.lower())
+
+
+class BranchMatcher:
+    def __init__(self, names, short_names=None, remotes=()):
+        self.names = names
+        self._lower = [name.lower() for name in names]
+        # 远程分支去掉远程名后的名称，"feat" 能以前缀匹配到 "origin/feat"
+        self._short = [name.lower() for name in short_names] if short_names else self._lower
+        self._remotes = [remote.lower() for remote in remotes]
+        # 查询 -> (包含查询的下标, 只按子序列匹配的下标)；追加输入时从最长的已缓存前缀开始筛选，退格时直接命中
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _matches(self, query):
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+        lower = self._lower
+        parent = None
+        for length in range(len(query) - 1, 0, -1):
+            parent = self._cache.get(query[:length])
+            if parent is not None:
+                break
+        if parent is None:
+            # 先用首字符做一次 C 层的 in 过滤
+            first = query[0]
+            candidates, fuzzy_candidates = [i for i, name in enumerate(lower) if first in name], []
+        else:
+            candidates, fuzzy_candidates = parent
+        contains = [i for i in candidates if query in lower[i]]
+        fuzzy = []
+        if len(query) > 1:
+            # [^a]*a[^b]*b...：每个字符只有一种走法，不会回溯
+            match = re.compile(''.join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in query)).match
+            if len(contains) < len(candidates):
+                fuzzy = [i for i in candidates if query not in lower[i] and match(lower[i])]
+            if fuzzy_candidates:
+                fuzzy = sorted(fuzzy + [i for i in fuzzy_candidates if match(lower[i])])
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[query] = result = (contains, fuzzy)
+        return result
+
+    def search(self, query):
+        # 返回匹配的下标，按 前缀 > 子串 > 子序列 排序，同档内保持原顺序
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.names)))
+        lower, short = self._lower, self._short
+        contains, fuzzy = self._matches(query)
+        # 只有查询可能以远程名开头时才需要检查完整名称
+        if any(remote.startswith(query) or query.startswith(remote + '/') for remote in self._remotes):
+            prefix = [i for i in contains if short[i].startswith(query) or lower[i].startswith(query)]
+        else:
+            prefix = [i for i in contains if short[i].startswith(query)]
+        if not prefix or len(prefix) == len(contains):
+            return contains + fuzzy
+        found = set(prefix)
+        return prefix + [i for i in contains if i not in found] + fuzzy
+
+
+class BranchIndex:
+    def __init__(self, path):
+        self.path = path
+        self.default_branch = None
+        # refname -> Branch
+        self.branches = {}
+        self.ordered = []
+        self.matcher = BranchMatcher([])
+        self._by_name = {}
+        self._fingerprint = None
+        self._config = None
+        self._lock = threading.Lock()
+        self.process_count = 0
+
+    def __len__(self):
+        return len(self.ordered)
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def search(self, query):
+        return [self.ordered[i] for i in self.matcher.search(query)]
+
+    @property
+    def local(self):
+        return [branch for branch in self.ordered if not branch.remote]
+
+    def refresh(self, job=None):
+        # 在调用线程中同步执行；返回 (新增, 删除, 变化) 的 refname 集合，无变化时为 None
+        with self._lock:
+            return self._refresh(job)
+
+    def _refresh(self, job):
+        fingerprint = repo_fingerprint(self.path)
+        if fingerprint is None:
+            raise ValueError(f"不是一个 Git 仓库: {self.path}")
+        git_dir = resolve_git_dir(self.path)
+        common_dir = resolve_common_dir(git_dir)
+        config = stat_key(os.path.join(common_dir, 'config'))
+        previous = self._fingerprint
+        if previous is not None and previous.refs == fingerprint.refs and config == self._config:
+            return None
+        changed = None
+        if previous is not None and previous.packed_refs == fingerprint.packed_refs and config == self._config:
+            changed = _changed_refnames(previous.loose_refs, fingerprint.loose_refs, common_dir)
+            if changed is not None and len(changed) > INCREMENTAL_LIMIT:
+                changed = None
+        if changed is None:
+            branches, default = self._query(BRANCH_PATTERNS, job)
+            removed = set(self.branches) - set(branches)
+            added = set(branches) - set(self.branches)
+            updated = {ref for ref in set(branches) & set(self.branches) if branches[ref] != self.branches[ref]}
+        else:
+            # 分支变化会改变以它为上游的本地分支的领先 / 落后；上游可以是远程分支，也可以是本地分支
+            upstreams = {ref[len('refs/remotes/'):] for ref in changed if ref.startswith('refs/remotes/')}
+            upstreams |= {ref[len('refs/heads/'):] for ref in changed if ref.startswith('refs/heads/')}
+            changed |= {branch.refname for branch in self.branches.values()
+                        if not branch.remote and branch.upstream in upstreams}
+            found, default = self._query(sorted(changed), job) if changed else ({}, None)
+            branches = dict(self.branches)
+            removed = {ref for ref in changed if ref not in found and ref in branches}
+            for ref in removed:
+                del branches[ref]
+            added = set(found) - set(self.branches)
+            updated = {ref for ref in found if ref in self.branches and found[ref] != self.branches[ref]}
+            branches.update(found)
+        self._fingerprint = fingerprint
+        self._config = config
+        if changed is None or 'refs/remotes/origin/HEAD' in changed:
+            self.default_branch = default
+        if added or removed or updated:
+            ordered = sorted(branches.values(), key=_sort_key)
+            by_name = {branch.name: branch for branch in ordered}
+            matcher = BranchMatcher([branch.name for branch in ordered], [branch.short_name for branch in ordered],
+                                    remotes={branch.remote for branch in ordered if branch.remote})
+            # 一次性替换，界面线程读取时不会看到一半的状态
+            self.branches, self.ordered, self._by_name, self.matcher = branches, ordered, by_name, matcher
+        return added, removed, updated
+
+    def _query(self, patterns, job):
+        command = ["git", "for-each-ref", BRANCH_FORMAT] + list(patterns)
+        result = run_git(command, self.path, job)
+        self.process_count += 1
+        if result['returncode'] != 0:
+            raise ValueError(result['stderr'].strip() or f"for-each-ref 失败，退出代码 {result['returncode']}")
+        branches = {}
+        default = None
+        for line in result['stdout'].splitlines():
+            branch, head = parse_branch(line)
+            if branch is not None:
+                branches[branch.refname] = branch
+            elif head is not None:
+                default = head
+        return branches, default
+
+
+def _changed_refnames(old_keys, new_keys, common_dir):
+    # 对比两次 refs 目录的 stat 列表，返回改动的分支引用；无法判断时返回 None
+    old = {key[0]: key[1:] for key in old_keys}
+    new = {key[0]: key[1:] for key in new_keys}
+    changed = set()
+    for path in set(old) | set(new):
+        if old.get(path) == new.get(path):
+            continue
+        if os.path.isdir(path):
+            continue
+        refname = os.path.relpath(path, common_dir).replace(os.sep, '/')
+        if refname.endswith('.lock'):
+            continue
+        if refname.startswith('refs/heads/') or refname.startswith('refs/remotes/'):
+            changed.add(refname)
+    return changed
+
+
+def read_head(path):
+    # 当前分支名；分离 HEAD 或无法读取时返回 None。不启动 git 进程
+    git_dir = resolve_git_dir(path)
+    if git_dir is None:
+        return None
+    try:
+        with open(os.path.join(git_dir, 'HEAD'), encoding='utf-8') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    return content[len('ref: refs/heads/'):] if content.startswith('ref: refs/heads/') else None
+
+
+def describe_branch(branch, head=None):
+    # 选择器中显示的说明：上游与领先 / 落后
+    parts = []
+    if branch.name == head:
+        parts.append('当前')
+    if branch.upstream:
+        track = '上游已删除' if branch.gone else ' '.join(
+            text for text in (f"↑{branch.ahead}" if branch.ahead else '', f"↓{branch.behind}" if branch.behind else '')
+            if text) or '同步'
+        parts.append(f"{branch.upstream} {track}")
+    return '  '.join(parts)
@@ -0,0 +1,317 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from gitpro.executor import PRIORITY_NETWORK
+
+# 批量获取 / 拉取 / 推送：对多个仓库执行同一网络操作。
+# 同时进行的仓库数不超过 concurrency（同时受执行引擎网络线程数的限制），
+# 每次尝试有独立的超时；网络类的临时错误会在退避后重试，
+# 每个仓库的状态变化通过 on_progress 报告，全部结束后调用 on_finished。
+
+BULK_FETCH = 'fetch'
+BULK_PULL = 'pull'
+BULK_PUSH = 'push'
+
+# 拉取只允许快进：批量操作不在几十个仓库里留下合并提交或冲突状态，分叉的仓库单独处理
+BULK_COMMANDS = {
+    BULK_FETCH: ["git", "fetch", "--prune"],
+    BULK_PULL: ["git", "pull", "--ff-only"],
+    BULK_PUSH: ["git", "push", "--porcelain"],
+}
+BULK_LABELS = {BULK_FETCH: '获取', BULK_PULL: '拉取', BULK_PUSH: '推送'}
+
+# 可保存在工作区设置中的默认值
+BULK_DEFAULTS = {'concurrency': 4, 'timeout': 120, 'retries': 1}
+RETRY_DELAY = 2.0
+
+STATE_QUEUED = 'queued'
+STATE_RUNNING = 'running'
+STATE_RETRYING = 'retrying'
+STATE_DONE = 'done'
+STATE_LABELS = {STATE_QUEUED: '排队中', STATE_RUNNING: '进行中', STATE_RETRYING: '等待重试', STATE_DONE: '完成'}
+
+OUTCOME_UPDATED = 'updated'
+OUTCOME_UP_TO_DATE = 'up_to_date'
+OUTCOME_CONFLICT = 'conflict'
+OUTCOME_SKIPPED = 'skipped'
+OUTCOME_FAILED = 'failed'
+OUTCOME_CANCELLED = 'cancelled'
+OUTCOME_ORDER = [OUTCOME_UPDATED, OUTCOME_UP_TO_DATE, OUTCOME_CONFLICT, OUTCOME_SKIPPED, OUTCOME_FAILED,
+                 OUTCOME_CANCELLED]
+OUTCOME_LABELS = {
+    OUTCOME_UPDATED: {BULK_FETCH: '有更新', BULK_PULL: '已快进', BULK_PUSH: '已推送'},
+    OUTCOME_UP_TO_DATE: '已是最新',
+    OUTCOME_CONFLICT: {BULK_FETCH: '冲突', BULK_PULL: '无法快进', BULK_PUSH: '被拒绝'},
+    OUTCOME_SKIPPED: '跳过',
+    OUTCOME_FAILED: '失败',
+    OUTCOME_CANCELLED: '已取消',
+}
+
+# 按英文输出分类，运行时固定语言；批量执行时不等待输入凭据
+_BULK_ENV = {'LC_ALL': 'C', 'LANGUAGE': 'C', 'GIT_TERMINAL_PROMPT': '0'}
+_TRANSIENT_ERRORS = (
+    'could not resolve host', 'connection timed out', 'connection refused', 'connection reset',
+    'operation timed out', 'failed to connect', 'the remote end hung up', 'early eof', 'unexpected disconnect',
+    'rpc failed', 'unable to access', 'ssh: connect to host', 'temporary failure',
+)
+_CONFLICT_ERRORS = (
+    'not possible to fast-forward', 'diverging branches', 'would be overwritten',
+    'your local changes', 'merge conflict', 'unmerged files',
+)
+_SKIP_ERRORS = (
+    'no tracking information', 'not currently on a branch', 'has no upstream branch',
+    'no configured push destination',
+)
+
+
+def outcome_label(outcome, operation):
+    label = OUTCOME_LABELS.get(outcome, outcome)
+    return label.get(operation, '') if isinstance(label, dict) else label
+
+
+def is_transient(result):
+    if result.get('timed_out'):
+        return True
+    if result.get('cancelled') or result['returncode'] == 0:
+        return False
+    stderr = result['stderr'].lower()
+    return any(pattern in stderr for pattern in _TRANSIENT_ERRORS)
+
+
+def _first_line(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('hint:'):
+            return line
+    return ''
+
+
+def classify(operation, result):
+    # 返回 (结果类型, 简短说明)
+    if result.get('cancelled'):
+        return OUTCOME_CANCELLED, ''
+    if result.get('timed_out'):
+        return OUTCOME_FAILED, _first_line(result['stderr'])
+    stdout, stderr = result['stdout'], result['stderr']
+    if operation == BULK_PUSH:
+        # --porcelain：每个引用一行 "<标记>\t<源>:<目标>\t<说明>"，'=' 为无变化，'!' 为被拒绝
+        flags = [line[0] for line in stdout.splitlines() if '\t' in line and line[:1] in ' +-*=!']
+        if '!' in flags:
+            rejected = [line.split('\t')[-1] for line in stdout.splitlines() if line.startswith('!')]
+            return OUTCOME_CONFLICT, rejected[0] if rejected else _first_line(stderr)
+    if result['returncode'] != 0:
+        lowered = stderr.lower()
+        if any(pattern in lowered for pattern in _SKIP_ERRORS):
+            return OUTCOME_SKIPPED, _first_line(stderr)
+        if any(pattern in lowered for pattern in _CONFLICT_ERRORS):
+            return OUTCOME_CONFLICT, _first_line(stderr)
+        return OUTCOME_FAILED, _first_line(stderr) or f"退出代码 {result['returncode']}"
+    if operation == BULK_FETCH:
+        # 非 verbose 模式下 fetch 只输出有变化的引用
+        updated = [line for line in stderr.splitlines() if ' -> ' in line]
+        if updated:
+            return OUTCOME_UPDATED, f"{len(updated)} 个引用有更新"
+        return OUTCOME_UP_TO_DATE, ''
+    if operation == BULK_PULL:
+        if 'Already up to date' in stdout or 'Already up-to-date' in stdout:
+            return OUTCOME_UP_TO_DATE, ''
+        return OUTCOME_UPDATED, _first_line(stdout)
+    if all(flag == '=' for flag in flags):
+        return OUTCOME_UP_TO_DATE, ''
+    return OUTCOME_UPDATED, f"{sum(1 for flag in flags if flag != '=')} 个引用"
+
+
+@dataclass
+class BulkItem:
+    path: str
+    state: str = STATE_QUEUED
+    outcome: Optional[str] = None
+    message: str = ''
+    attempts: int = 0
+    # 所有尝试的累计执行时间（秒）
+    duration: float = 0.0
+    result: Optional[dict] = None
+
+    @property
+    def name(self):
+        return os.path.basename(os.path.normpath(self.path))
+
+
+class BulkRun:
+    def __init__(self, executor, operation, paths, concurrency=BULK_DEFAULTS['concurrency'],
+                 timeout=BULK_DEFAULTS['timeout'], retries=BULK_DEFAULTS['retries'], retry_delay=RETRY_DELAY,
+                 on_progress=None, on_finished=None):
+        if operation not in BULK_COMMANDS:
+            raise ValueError(f"未知的批量操作: {operation}")
+        self.executor = executor
+        self.operation = operation
+        self.items = [BulkItem(path) for path in dict.fromkeys(paths)]
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout or None
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        # 回调均在工作线程中执行
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.group = ('bulk', id(self))
+        self.started = None
+        self.elapsed = 0.0
+        self.cancelled = False
+        self._queue = deque(self.items)
+        self._active = 0
+        self._remaining = len(self.items)
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def label(self):
+        return BULK_LABELS[self.operation]
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def start(self):
+        self.started = time.perf_counter()
+        if not self.items:
+            self._complete()
+            return self
+        self._launch()
+        return self
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled or self._done.is_set():
+                return
+            self.cancelled = True
+            queued = list(self._queue) + [item for item, timer in self._timers.values()]
+            timers = [timer for item, timer in self._timers.values()]
+            self._queue.clear()
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        for item in queued:
+            self._settle(item, OUTCOME_CANCELLED, '', None)
+        # 排队和正在执行的任务以“已取消”结果回调 _on_result
+        self.executor.cancel_group(self.group)
+
+    def counts(self):
+        counts = dict.fromkeys(OUTCOME_ORDER, 0)
+        for item in self.items:
+            if item.outcome is not None:
+                counts[item.outcome] += 1
+        return counts
+
+    def summary(self):
+        done = sum(1 for item in self.items if item.state == STATE_DONE)
+        parts = [f"{outcome_label(outcome, self.operation)} {count}"
+                 for outcome, count in self.counts().items() if count]
+        return f"{self.label} {done}/{len(self.items)}" + (f"：{'，'.join(parts)}" if parts else '')
+
+    def report_text(self):
+        lines = [f"批量{self.label}：{len(self.items)} 个仓库，用时 {self.elapsed:.1f} 秒", self.summary(), '']
+        for outcome in OUTCOME_ORDER:
+            items = [item for item in self.items if item.outcome == outcome]
+            if not items:
+                continue
+            lines.append(f"[{outcome_label(outcome, self.operation)}]")
+            for item in items:
+                retry = f"（尝试 {item.attempts} 次）" if item.attempts > 1 else ''
+                lines.append(f"  {item.path}{retry}")
+                if item.message:
+                    lines.append(f"      {item.message}")
+            lines.append('')
+        return '\n'.join(lines)
+
+    @property
+    def ok(self):
+        counts = self.counts()
+        return not (counts[OUTCOME_CONFLICT] or counts[OUTCOME_FAILED] or counts[OUTCOME_CANCELLED])
+
+    # ---- 调度 ----
+    def _launch(self):
+        launch = []
+        with self._lock:
+            while self._queue and self._active < self.concurrency and not self.cancelled:
+                item = self._queue.popleft()
+                item.state = STATE_RUNNING
+                item.attempts += 1
+                self._active += 1
+                launch.append(item)
+        for item in launch:
+            self._notify(item)
+            self._submit(item)
+
+    def _submit(self, item):
+        command = BULK_COMMANDS[self.operation]
+        env = dict(os.environ, **_BULK_ENV)
+        def task(job):
+            started = time.perf_counter()
+            try:
+                return job.run(command, cwd=item.path, env=env)
+            finally:
+                item.duration += time.perf_counter() - started
+        self.executor.submit(task, on_done=lambda result: self._on_result(item, result), group=self.group,
+                             priority=PRIORITY_NETWORK, network=True, timeout=self.timeout,
+                             name=f'bulk_{self.operation}')
+
+    def _on_result(self, item, result):
+        retry = False
+        with self._lock:
+            self._active -= 1
+            if not self.cancelled and item.attempts <= self.retries and is_transient(result):
+                retry = True
+                item.state = STATE_RETRYING
+                item.message = _first_line(result['stderr'])
+                # 退避：第 n 次重试前等待 retry_delay * 2^(n-1) 秒，期间让出并发名额
+                timer = threading.Timer(self.retry_delay * 2 ** (item.attempts - 1), self._requeue, (item,))
+                timer.daemon = True
+                self._timers[id(item)] = (item, timer)
+        if retry:
+            timer.start()
+            self._notify(item)
+        else:
+            outcome, message = classify(self.operation, result)
+            self._settle(item, outcome, message, result)
+        self._launch()
+
+    def _requeue(self, item):
+        with self._lock:
+            if self._timers.pop(id(item), None) is None:
+                return
+            item.state = STATE_QUEUED
+            self._queue.appendleft(item)
+        self._notify(item)
+        self._launch()
+
+    def _settle(self, item, outcome, message, result):
+        with self._lock:
+            if item.state == STATE_DONE:
+                return
+            item.state = STATE_DONE
+            item.outcome = outcome
+            item.message = message
+            item.result = result
+            self._remaining -= 1
+            finished = self._remaining == 0
+        self._notify(item)
+        if finished:
+            self._complete()
+
+    def _complete(self):
+        self.elapsed = time.perf_counter() - self.started
+        self._done.set()
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def _notify(self, item):
+        if self.on_progress is not None:
+            self.on_progress(item)
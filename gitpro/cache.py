@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from gitpro.gitdir import resolve_common_dir, resolve_git_dir
+
+# 仓库状态缓存：按 .git/index、HEAD、packed-refs 与松散 refs 的
+# (mtime, size, inode) 指纹判断是否变化，未变化时直接复用分支列表与默认分支。
+
+
+def stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _walk_refs(refs_dir):
+    # git 通过 lock 文件改名更新引用，目录与文件的 stat 一起即可发现变化
+    keys = []
+    stack = [refs_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    keys.append((entry.path, st.st_mtime_ns, st.st_size, st.st_ino))
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    keys.sort()
+    return tuple(keys)
+
+
+class RepoFingerprint(NamedTuple):
+    head: Optional[tuple]
+    index: Optional[tuple]
+    packed_refs: Optional[tuple]
+    loose_refs: tuple
+
+    @property
+    def refs(self):
+        # 分支列表与默认分支只取决于 refs 部分
+        return (self.packed_refs, self.loose_refs)
+
+
+def repo_fingerprint(path):
+    git_dir = resolve_git_dir(path)
+    if git_dir is None:
+        return None
+    common_dir = resolve_common_dir(git_dir)
+    return RepoFingerprint(
+        head=stat_key(os.path.join(git_dir, 'HEAD')),
+        index=stat_key(os.path.join(git_dir, 'index')),
+        packed_refs=stat_key(os.path.join(common_dir, 'packed-refs')),
+        loose_refs=_walk_refs(os.path.join(common_dir, 'refs')),
+    )
+
+
+class _RefsEntry:
+    __slots__ = ('fingerprint', 'default_branch', 'local_branches', 'remote_branches')
+
+    def __init__(self, fingerprint, snapshot):
+        self.fingerprint = fingerprint
+        self.default_branch = snapshot.default_branch
+        self.local_branches = list(snapshot.local_branches)
+        self.remote_branches = list(snapshot.remote_branches)
+
+
+class RepoStateCache:
+    def __init__(self, max_repos=8):
+        self.max_repos = max_repos
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fingerprint(self, path):
+        return repo_fingerprint(path)
+
+    def load_refs(self, path, fingerprint, snapshot):
+        # 指纹一致时把缓存的分支数据填入 snapshot 并返回 True
+        with self._lock:
+            entry = self._entries.get(path)
+            if fingerprint is None or entry is None or entry.fingerprint != fingerprint.refs:
+                self.misses += 1
+                return False
+            self._entries.move_to_end(path)
+            self.hits += 1
+        snapshot.default_branch = entry.default_branch
+        snapshot.local_branches = list(entry.local_branches)
+        snapshot.remote_branches = list(entry.remote_branches)
+        return True
+
+    def store_refs(self, path, fingerprint, snapshot):
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries[path] = _RefsEntry(fingerprint.refs, snapshot)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_repos:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'repos': len(self._entries)}
@@ -0,0 +1,404 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from gitpro.branches import BranchIndex, describe_branch, read_head
+from gitpro.bulk import BULK_COMMANDS, BulkRun, STATE_DONE, outcome_label
+from gitpro.clone import FILTERS, CloneOptions, cache_entries, clear_cache, repo_name_from_url, run_clone
+from gitpro.executor import GitExecutor
+from gitpro.maintenance import format_checks
+from gitpro.service import GitService, ServiceError, describe_event, head_summary
+from gitpro.staging import LARGE_FILE_THRESHOLD
+from gitpro.status_model import classify
+from gitpro.units import format_size
+from gitpro.workspace import Workspace, collect_all, discover_repos, is_repo_dir, normalize_path, summarize_repo
+
+# 命令行入口：与界面共用 GitService，不导入 tkinter，可在脚本和构建机上使用。
+#   python git.py status [--json]
+#   python git.py branches [关键字] [--json] [--local]
+#   python git.py sync
+#   python git.py save -m "提交信息" [路径或通配符...] [--include-large]
+#   python git.py finish [--delete]
+#   python git.py report [-o 文件[.gz]]
+#   python git.py accelerate [--check] [--no-benchmark]
+#   python git.py workflow status | resume | rollback | discard
+#   python git.py workspace list | add 路径... | scan 目录 | remove 路径... | status [--json] [-j N]
+#   python git.py clone URL [目录] [--depth N] [--filter blob:none|tree:0] [--sparse 目录...] [--cache]
+#   python git.py clone-cache list | clear [URL]
+#   python git.py workspace fetch | pull | push [路径...] [-j N] [--timeout 秒] [--retries N]
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NOT_A_REPO = 128
+
+
+def _print_event(event):
+    text, tag = describe_event(event)
+    stream = sys.stderr if tag == 'ERROR' else sys.stdout
+    stream.write(text if text.endswith('\n') else text + '\n')
+    stream.flush()
+
+
+def _service(args):
+    on_event = None if args.quiet else _print_event
+    return GitService(os.path.abspath(args.repo), on_event=on_event)
+
+
+def _finish(outcome):
+    if outcome.message:
+        print(outcome.message, file=sys.stdout if outcome.ok else sys.stderr)
+    if outcome.interrupted:
+        print("操作已中断，进度已保存：解决问题后运行 'workflow resume' 继续，或 'workflow rollback' 回滚。",
+              file=sys.stderr)
+    return EXIT_OK if outcome.ok else EXIT_FAILED
+
+
+def cmd_status(args):
+    snapshot = _service(args).snapshot()
+    if not snapshot.is_repo:
+        print(f"不是一个 Git 仓库: {snapshot.path}", file=sys.stderr)
+        return EXIT_NOT_A_REPO
+    if args.json:
+        json.dump({
+            'path': snapshot.path,
+            'head': snapshot.head,
+            'oid': snapshot.oid,
+            'upstream': snapshot.upstream,
+            'ahead': snapshot.ahead,
+            'behind': snapshot.behind,
+            'default_branch': snapshot.default_branch,
+            'branches': snapshot.branches,
+            'entries': [{'code': entry.code, 'path': entry.path, 'orig_path': entry.orig_path}
+                        for entry in snapshot.entries],
+        }, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+        return EXIT_OK
+    print(f"仓库: {snapshot.path}")
+    print(head_summary(snapshot))
+    if snapshot.default_branch:
+        print(f"默认分支: {snapshot.default_branch}")
+    if snapshot.is_clean:
+        print("工作区是干净的")
+        return EXIT_OK
+    print(f"{snapshot.dirty_count} 项改动:")
+    for entry in snapshot.entries:
+        status_text, _ = classify(entry.code)
+        path = f"{entry.orig_path} -> {entry.path}" if entry.orig_path else entry.path
+        print(f"  {status_text:<12} {path}")
+    return EXIT_OK
+
+
+def cmd_branches(args):
+    index = BranchIndex(os.path.abspath(args.repo))
+    try:
+        index.refresh()
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_NOT_A_REPO
+    head = read_head(index.path)
+    branches = [branch for branch in index.search(args.query or '') if not (args.local and branch.remote)]
+    if args.json:
+        json.dump({
+            'head': head,
+            'default_branch': index.default_branch,
+            'branches': [{'name': branch.name, 'remote': branch.remote or None, 'oid': branch.oid,
+                          'upstream': branch.upstream or None, 'ahead': branch.ahead, 'behind': branch.behind,
+                          'gone': branch.gone, 'date': branch.date} for branch in branches],
+        }, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+        return EXIT_OK
+    for branch in branches:
+        marker = '*' if branch.name == head else ' '
+        print(f"{marker} {branch.name:<40} {describe_branch(branch)}".rstrip())
+    return EXIT_OK
+
+
+def cmd_sync(args):
+    return _finish(_service(args).sync_branch())
+
+
+def cmd_save(args):
+    return _finish(_service(args).save_progress(args.message, selectors=args.paths or None,
+                                                include_large=args.include_large))
+
+
+def cmd_finish(args):
+    service = _service(args)
+    branch, default_branch = service.finish_target(service.snapshot())
+    outcome = service.finish_branch(branch, default_branch)
+    if outcome.ok and args.delete:
+        outcome = service.delete_branch(branch, remote=not args.keep_remote)
+    return _finish(outcome)
+
+
+def cmd_workflow(args):
+    service = _service(args)
+    if args.action == 'status':
+        state = service.pending_workflow()
+        if state is None:
+            print("没有未完成的操作")
+            return EXIT_OK
+        print(state.describe())
+        for index, step in enumerate(state.steps):
+            marker = '>' if index == state.next else ('✓' if index < state.next else ' ')
+            print(f"  {marker} {index + 1}. {step.label}: {' '.join(step.command)}")
+        return EXIT_FAILED
+    if args.action == 'discard':
+        service.discard_workflow()
+        return EXIT_OK
+    if args.action == 'resume':
+        return _finish(service.resume_workflow())
+    return _finish(service.rollback_workflow())
+
+
+def _write_now(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def cmd_report(args):
+    # 输出到终端时边执行边显示；写入文件时以 .gz 结尾则 gzip 压缩
+    service = GitService(os.path.abspath(args.repo))
+    if args.output:
+        service.report().export(args.output)
+        print(f"诊断报告已写入 {args.output}")
+    else:
+        service.report(on_text=_write_now)
+    return EXIT_OK
+
+
+def cmd_accelerate(args):
+    service = _service(args)
+    if args.check:
+        checks = service.maintenance_checks()
+        sys.stdout.write(format_checks(checks))
+        return EXIT_FAILED if any(not check.ok and check.supported for check in checks) else EXIT_OK
+    return _finish(service.accelerate(benchmark=not args.no_benchmark))
+
+
+def cmd_clone(args):
+    target = os.path.abspath(args.target or repo_name_from_url(args.url))
+    options = CloneOptions(url=args.url, target=target, depth=args.depth, filter=args.filter,
+                           sparse=args.sparse or [], use_cache=args.cache, branch=args.branch)
+    interactive = sys.stderr.isatty() and not args.quiet
+    def on_progress(progress):
+        if args.quiet:
+            return
+        if not progress.phase:
+            if interactive:
+                sys.stderr.write('\n')
+            print(f"[{progress.step}/{progress.steps}] {progress.label}", file=sys.stderr, flush=True)
+            return
+        line = f"  {progress.phase}: {progress.percent}% ({progress.done}/{progress.total})"
+        if progress.rate:
+            line += f"  {progress.size} | {progress.rate}"
+        # 终端中在同一行刷新进度；重定向时只输出每个阶段完成的一行
+        if interactive:
+            sys.stderr.write('\r' + line.ljust(70))
+            sys.stderr.flush()
+        elif progress.percent >= 100:
+            print(line, file=sys.stderr, flush=True)
+    def on_line(line):
+        if not args.quiet:
+            if interactive:
+                sys.stderr.write('\n')
+            print(line, file=sys.stderr, flush=True)
+    outcome = run_clone(options, on_progress=on_progress, on_line=on_line)
+    if interactive:
+        sys.stderr.write('\n')
+    if outcome.ok:
+        print(f"已克隆到 {target}")
+    return _finish(outcome)
+
+
+def cmd_clone_cache(args):
+    if args.action == 'clear':
+        for path in clear_cache(args.url):
+            print(f"已删除: {path}")
+        return EXIT_OK
+    total = 0
+    for entry in cache_entries():
+        total += entry.size
+        last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.last_used))
+        print(f"{entry.size / 1024 / 1024:>9.1f} MB  {last_used}  {entry.url}")
+    print(f"共 {total / 1024 / 1024:.1f} MB")
+    return EXIT_OK
+
+
+def cmd_workspace(args):
+    workspace = Workspace().load()
+    action = args.action
+    if action in ('add', 'remove', 'scan'):
+        if not args.paths:
+            print("请指定路径", file=sys.stderr)
+            return EXIT_USAGE
+        rejected = []
+        if action == 'add':
+            rejected = [path for path in args.paths if not is_repo_dir(normalize_path(path))]
+            changed = workspace.add(*args.paths)
+        elif action == 'remove':
+            changed = workspace.remove(*args.paths)
+        else:
+            changed = workspace.add(*[repo for root in args.paths for repo in discover_repos(root)])
+        workspace.save()
+        verb = '移除' if action == 'remove' else '加入'
+        for path in changed:
+            print(f"已{verb}: {path}")
+        for path in rejected:
+            print(f"不是 Git 仓库，未加入: {normalize_path(path)}", file=sys.stderr)
+        print(f"工作区共 {len(workspace)} 个仓库")
+        return EXIT_NOT_A_REPO if rejected else EXIT_OK
+    if action == 'list':
+        for path in workspace.repos:
+            print(path)
+        return EXIT_OK
+    if action in BULK_COMMANDS:
+        return _bulk(args, workspace)
+    # status：所有仓库并发刷新，同时运行的 git 进程数不超过 -j
+    executor = GitExecutor(max_workers=args.concurrency or workspace.bulk['concurrency'])
+    try:
+        results = collect_all(executor, workspace.repos)
+    finally:
+        executor.shutdown()
+    summaries = [summarize_repo(path, results[path].get('snapshot'), results[path]) for path in workspace.repos]
+    if args.json:
+        json.dump([summary._asdict() for summary in summaries], sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    else:
+        width = max([len(summary.name) for summary in summaries] + [4])
+        for summary in summaries:
+            if summary.error:
+                print(f"{summary.name:<{width}}  ❌ {summary.error}")
+                continue
+            dirty = f"{summary.dirty} 项改动" if summary.dirty else "干净"
+            track = f"  ↑{summary.ahead} ↓{summary.behind}" if summary.upstream else ""
+            print(f"{summary.name:<{width}}  {summary.branch:<24} {dirty}{track}")
+    return EXIT_FAILED if any(summary.error for summary in summaries) else EXIT_OK
+
+
+def _bulk(args, workspace):
+    paths = [normalize_path(path) for path in args.paths] if args.paths else list(workspace.repos)
+    if not paths:
+        print("工作区中没有仓库", file=sys.stderr)
+        return EXIT_USAGE
+    settings = dict(workspace.bulk)
+    for name in ('concurrency', 'timeout', 'retries'):
+        value = getattr(args, name)
+        if value is not None:
+            settings[name] = value
+    # 网络任务最多占用 max_workers - 1 个线程，多留一个使并发数恰好为 concurrency
+    executor = GitExecutor(max_workers=settings['concurrency'] + 1)
+    lock = threading.Lock()
+    finished = [0]
+    def on_progress(item):
+        if item.state != STATE_DONE or args.quiet:
+            return
+        with lock:
+            finished[0] += 1
+            message = f"  {item.message}" if item.message else ''
+            print(f"[{finished[0]}/{len(run.items)}] {item.name:<24} {outcome_label(item.outcome, run.operation)}{message}",
+                  flush=True)
+    run = BulkRun(executor, args.action, paths, on_progress=on_progress, **settings)
+    try:
+        run.start()
+        while not run.wait(0.2):
+            pass
+    except KeyboardInterrupt:
+        run.cancel()
+        run.wait()
+    finally:
+        executor.shutdown()
+    print()
+    print(run.report_text())
+    return EXIT_OK if run.ok else EXIT_FAILED
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='git.py', description="Git Manager 命令行模式（不带参数运行时打开图形界面）")
+    parser.add_argument('-C', '--repo', default='.', help="仓库路径（默认为当前目录）")
+    parser.add_argument('-q', '--quiet', action='store_true', help="不输出执行的命令及其输出")
+    commands = parser.add_subparsers(dest='command', metavar='命令')
+
+    status = commands.add_parser('status', help="显示分支与工作区状态")
+    status.add_argument('--json', action='store_true', help="以 JSON 输出")
+    status.set_defaults(func=cmd_status)
+
+    branches = commands.add_parser('branches', help="列出分支及其上游、领先 / 落后，可按关键字筛选")
+    branches.add_argument('query', nargs='?', help="筛选关键字（前缀、子串或按顺序出现的字符）")
+    branches.add_argument('--local', action='store_true', help="只列出本地分支")
+    branches.add_argument('--json', action='store_true', help="以 JSON 输出")
+    branches.set_defaults(func=cmd_branches)
+
+    commands.add_parser('sync', help="同步当前分支（git pull）").set_defaults(func=cmd_sync)
+
+    save = commands.add_parser('save', help="保存进度：add、commit 并 push")
+    save.add_argument('-m', '--message', required=True, help="提交信息")
+    save.add_argument('paths', nargs='*', help="只提交这些文件、目录或通配符（默认为全部改动）")
+    save.add_argument('--include-large', action='store_true', help=f"包含超过 {format_size(LARGE_FILE_THRESHOLD)} 的大文件（默认跳过）")
+    save.set_defaults(func=cmd_save)
+
+    finish = commands.add_parser('finish', help="把当前分支合并到默认分支并推送")
+    finish.add_argument('--delete', action='store_true', help="合并成功后删除该分支")
+    finish.add_argument('--keep-remote', action='store_true', help="与 --delete 一起使用时只删除本地分支")
+    finish.set_defaults(func=cmd_finish)
+
+    workflow = commands.add_parser('workflow', help="查看、继续或回滚中断的多步操作（如合并冲突后的完成分支）")
+    workflow.add_argument('action', choices=['status', 'resume', 'rollback', 'discard'],
+                          help="status 查看；resume 从停下的步骤继续；rollback 恢复到开始前；discard 只删除保存的进度")
+    workflow.set_defaults(func=cmd_workflow)
+
+    report = commands.add_parser('report', help="生成诊断报告")
+    report.add_argument('-o', '--output', help="写入文件而不是标准输出（以 .gz 结尾时 gzip 压缩）")
+    report.set_defaults(func=cmd_report)
+
+    accelerate = commands.add_parser('accelerate', help="启用 git 的加速设置（未跟踪文件缓存、manyFiles、fsmonitor、提交图等）")
+    accelerate.add_argument('--check', action='store_true', help="只检查，有可启用的设置时返回 1")
+    accelerate.add_argument('--no-benchmark', action='store_true', help="不测量启用前后的耗时")
+    accelerate.set_defaults(func=cmd_accelerate)
+
+    clone = commands.add_parser('clone', help="克隆仓库（支持浅克隆、部分克隆、稀疏检出与本地对象缓存）")
+    clone.add_argument('url', help="远程仓库 URL")
+    clone.add_argument('target', nargs='?', help="目标目录（默认为仓库名）")
+    clone.add_argument('-b', '--branch', help="检出的分支")
+    clone.add_argument('--depth', type=int, help="浅克隆，只获取最近 N 个提交")
+    clone.add_argument('--filter', default='', choices=[f for f in FILTERS if f], help="部分克隆，按需下载对象")
+    clone.add_argument('--sparse', nargs='+', metavar='目录', help="稀疏检出（cone 模式），只检出这些目录")
+    clone.add_argument('--cache', action='store_true', help="使用 ~/.git_manager/clone-cache 中的对象缓存")
+    clone.set_defaults(func=cmd_clone)
+
+    clone_cache = commands.add_parser('clone-cache', help="查看或清理克隆用的对象缓存")
+    clone_cache.add_argument('action', choices=['list', 'clear'], help="操作")
+    clone_cache.add_argument('url', nargs='?', help="clear 时只删除该 URL 的缓存")
+    clone_cache.set_defaults(func=cmd_clone_cache)
+
+    workspace = commands.add_parser('workspace', help="管理工作区并汇总所有仓库的状态")
+    workspace.add_argument('action', choices=['list', 'add', 'remove', 'scan', 'status'] + list(BULK_COMMANDS),
+                           help="操作；fetch / pull / push 对工作区中的仓库批量执行")
+    workspace.add_argument('paths', nargs='*', help="仓库路径（scan 时为要扫描的目录；批量操作时默认为全部仓库）")
+    workspace.add_argument('--json', action='store_true', help="status 以 JSON 输出")
+    workspace.add_argument('-j', '--jobs', dest='concurrency', type=int, help="同时运行的 git 进程数上限（默认取工作区设置）")
+    workspace.add_argument('--timeout', type=int, help="批量操作时每个仓库每次尝试的超时（秒）")
+    workspace.add_argument('--retries', type=int, help="批量操作遇到网络错误或超时时的重试次数")
+    workspace.set_defaults(func=cmd_workspace)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return EXIT_USAGE
+    try:
+        return args.func(args)
+    except ServiceError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+
+
+if __name__ == '__main__':
+    sys.exit(main())
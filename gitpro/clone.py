@@ -0,0 +1,354 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional
+
+from gitpro.executor import popen_git
+from gitpro.service import OperationResult, ServiceError
+
+# 快速克隆：浅克隆（--depth）、部分克隆（--filter）、稀疏检出（cone 模式），
+# 以及由本工具管理的本地对象缓存（每个远程 URL 一个 mirror，克隆时 --reference + --dissociate）。
+# 进度从 git 的 --progress 输出中解析，按时间间隔节流后回调，而不是逐行转发到日志。
+
+CACHE_ROOT = os.path.join(os.path.expanduser('~'), '.git_manager', 'clone-cache')
+FILTERS = {
+    '': '完整克隆',
+    'blob:none': '不下载文件内容（按需获取）',
+    'tree:0': '不下载目录树与文件内容（按需获取）',
+}
+# 进度回调的最短间隔（秒）；阶段变化和到达 100% 时总是回调
+PROGRESS_INTERVAL = 0.1
+_READ_SIZE = 4096
+_LAST_USED = 'gitpro-last-used'
+
+# 以英文输出解析进度
+_CLONE_ENV = {'LC_ALL': 'C', 'LANGUAGE': 'C'}
+_PROGRESS_RE = re.compile(
+    r'^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+(?P<percent>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)'
+    r'(?:, (?P<size>[\d.]+ [KMGT]?i?B))?(?: \| (?P<rate>[\d.]+ [KMGT]?i?B/s))?')
+
+
+@dataclass
+class CloneOptions:
+    url: str
+    target: str
+    depth: Optional[int] = None
+    # '' / 'blob:none' / 'tree:0'
+    filter: str = ''
+    # 稀疏检出的目录（cone 模式）；为空时检出全部文件
+    sparse: List[str] = field(default_factory=list)
+    use_cache: bool = False
+    branch: Optional[str] = None
+
+    def validate(self):
+        if not self.url:
+            raise ServiceError("请输入远程仓库的 URL")
+        if self.filter not in FILTERS:
+            raise ServiceError(f"不支持的过滤条件: {self.filter}")
+        if self.depth is not None and self.depth < 1:
+            raise ServiceError("克隆深度必须大于 0")
+        # 缓存 mirror 是完整的对象库，与浅克隆、部分克隆组合时 --dissociate 无法得到完整的仓库
+        if self.use_cache and (self.depth or self.filter):
+            raise ServiceError("使用对象缓存时不能同时使用浅克隆或部分克隆")
+        if os.path.isdir(self.target) and os.listdir(self.target):
+            raise ServiceError(f"目标目录已存在且非空: {self.target}")
+        return self
+
+
+class CloneProgress(NamedTuple):
+    # step / steps：当前是第几条命令（更新缓存、克隆、稀疏检出）
+    step: int
+    steps: int
+    label: str
+    phase: str
+    percent: int
+    done: int
+    total: int
+    size: str
+    rate: str
+
+
+class CloneStep(NamedTuple):
+    label: str
+    command: List[str]
+    cwd: Optional[str] = None
+    # 本步骤更新的缓存目录
+    cache: Optional[str] = None
+
+
+def repo_name_from_url(url):
+    name = url.rstrip('/').rsplit('/', 1)[-1].rsplit(':', 1)[-1]
+    return name[:-4] if name.endswith('.git') else name
+
+
+def parse_progress(line):
+    # 返回 (阶段, 百分比, 完成数, 总数, 已传输大小, 速率)；不是进度行时返回 None
+    match = _PROGRESS_RE.match(line.strip())
+    if match is None:
+        return None
+    return (match['phase'], int(match['percent']), int(match['done']), int(match['total']),
+            match['size'] or '', match['rate'] or '')
+
+
+class ProgressThrottle:
+    def __init__(self, callback, interval=PROGRESS_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self._last = 0.0
+        self._phase = None
+        self._pending = None
+        self._last_progress = None
+
+    def update(self, progress):
+        # git 在阶段结束时会以 ", done." 再输出一次 100%
+        if self._last_progress is not None and progress[3:7] == self._last_progress[3:7]:
+            return
+        now = time.monotonic()
+        if progress.phase != self._phase or progress.percent >= 100 or now - self._last >= self.interval:
+            self._phase = progress.phase
+            self._last = now
+            self._pending = None
+            self._last_progress = progress
+            self.callback(progress)
+        else:
+            self._pending = progress
+
+    def flush(self):
+        if self._pending is not None:
+            self._last_progress = self._pending
+            self.callback(self._pending)
+            self._pending = None
+
+
+# ---- 对象缓存 ----
+def _normalize_url(url):
+    url = url.strip().rstrip('/')
+    return url[:-4] if url.endswith('.git') else url
+
+
+def cache_path(url, root=CACHE_ROOT):
+    url = _normalize_url(url)
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', repo_name_from_url(url))[:40]
+    return os.path.join(root, f"{name}-{digest}.git")
+
+
+class CacheEntry(NamedTuple):
+    path: str
+    url: str
+    size: int
+    last_used: float
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def _cache_url(path):
+    # mirror 的 config 中 [remote "origin"] 的 url
+    try:
+        with open(os.path.join(path, 'config'), encoding='utf-8', errors='replace') as f:
+            section = None
+            for line in f:
+                line = line.strip()
+                if line.startswith('['):
+                    section = line
+                elif section == '[remote "origin"]' and line.startswith('url'):
+                    return line.split('=', 1)[1].strip()
+    except OSError:
+        pass
+    return ''
+
+
+def cache_entries(root=CACHE_ROOT):
+    entries = []
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return entries
+    for name in names:
+        path = os.path.join(root, name)
+        if not name.endswith('.git') or not os.path.isdir(path):
+            continue
+        marker = os.path.join(path, _LAST_USED)
+        last_used = os.path.getmtime(marker) if os.path.exists(marker) else os.path.getmtime(path)
+        entries.append(CacheEntry(path, _cache_url(path), _dir_size(path), last_used))
+    return entries
+
+
+def clear_cache(url=None, root=CACHE_ROOT):
+    # 删除指定 URL 的缓存，或全部缓存；返回删除的目录
+    paths = [cache_path(url, root)] if url else [entry.path for entry in cache_entries(root)]
+    removed = []
+    for path in paths:
+        if os.path.isdir(path):
+            with _cache_lock(path):
+                shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+
+_cache_locks = {}
+_cache_locks_guard = threading.Lock()
+
+
+def _cache_lock(path):
+    # 同一进程内对同一缓存的更新串行进行
+    with _cache_locks_guard:
+        return _cache_locks.setdefault(path, threading.Lock())
+
+
+# ---- 克隆 ----
+def clone_plan(options, cache_root=CACHE_ROOT):
+    steps = []
+    command = ["git", "clone", "--progress"]
+    if options.use_cache:
+        mirror = cache_path(options.url, cache_root)
+        if os.path.isdir(mirror):
+            steps.append(CloneStep("更新对象缓存", ["git", "fetch", "--progress", "--prune", "origin"], mirror, mirror))
+        else:
+            steps.append(CloneStep("建立对象缓存", ["git", "clone", "--progress", "--mirror", "--", options.url, mirror],
+                                   None, mirror))
+        # 克隆完成后复制所需对象，缓存之后被清理也不影响新仓库
+        command += ["--reference-if-able", mirror, "--dissociate"]
+    if options.depth:
+        command += ["--depth", str(options.depth)]
+    if options.filter:
+        command += [f"--filter={options.filter}"]
+    if options.sparse:
+        command.append("--sparse")
+    if options.branch:
+        command += ["--branch", options.branch]
+    command += ["--", options.url, options.target]
+    steps.append(CloneStep("克隆", command))
+    if options.sparse:
+        steps.append(CloneStep("稀疏检出", ["git", "sparse-checkout", "set", "--cone", "--"] + list(options.sparse),
+                               options.target))
+    return steps
+
+
+def _run_step(command, cwd, job, on_progress, on_line):
+    # 读取 stderr：按 \r 或 \n 分割，进度行交给 on_progress，其他行交给 on_line
+    env = dict(os.environ, **_CLONE_ENV)
+    process = popen_git(command, cwd, job, env=env, stdout=subprocess.DEVNULL)
+    lines = []
+    buffer = b''
+    try:
+        while True:
+            chunk = process.stderr.read1(_READ_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            parts = re.split(rb'[\r\n]', buffer)
+            buffer = parts.pop()
+            for part in parts:
+                line = part.decode('utf-8', errors='replace').rstrip()
+                if not line.strip():
+                    continue
+                parsed = parse_progress(line)
+                if parsed is not None:
+                    on_progress(parsed)
+                else:
+                    lines.append(line)
+                    on_line(line)
+        if buffer.strip():
+            line = buffer.decode('utf-8', errors='replace')
+            lines.append(line)
+            on_line(line)
+        process.wait()
+    finally:
+        if job is not None:
+            job.release(process)
+    if job is not None:
+        job.check()
+    return {'stdout': '', 'stderr': '\n'.join(lines), 'returncode': process.returncode}
+
+
+def run_clone(options, job=None, on_progress=None, on_line=None, cache_root=CACHE_ROOT):
+    # on_progress(CloneProgress) 经过节流；on_line(文本) 为 git 输出的非进度行。均在调用线程中回调
+    options.validate()
+    steps = clone_plan(options, cache_root)
+    on_line = on_line or (lambda line: None)
+    outcome = OperationResult('clone')
+    # validate() 允许目标为已存在的空目录：失败时只清空其内容，不删除目录本身
+    existed = os.path.isdir(options.target)
+    if options.use_cache:
+        os.makedirs(cache_root, exist_ok=True)
+    for index, step in enumerate(steps, 1):
+        throttle = ProgressThrottle(on_progress or (lambda progress: None))
+        if on_progress is not None:
+            on_progress(CloneProgress(index, len(steps), step.label, '', 0, 0, 0, '', ''))
+        report = lambda parsed, i=index, label=step.label: throttle.update(CloneProgress(i, len(steps), label, *parsed))
+        new_cache = step.cache is not None and not os.path.isdir(step.cache)
+        try:
+            if step.cache is not None:
+                with _cache_lock(step.cache):
+                    result = _run_step(step.command, step.cwd, job, report, on_line)
+            else:
+                result = _run_step(step.command, step.cwd, job, report, on_line)
+        except BaseException:
+            # 取消、超时或 Ctrl-C：被结束的 git 来不及清理，删除本次新建的缓存与目标目录中的内容
+            if new_cache and step.cache:
+                shutil.rmtree(step.cache, ignore_errors=True)
+            _discard_target(options.target, existed)
+            raise
+        throttle.flush()
+        outcome.steps.append((step.command, result))
+        if step.cache is not None:
+            # 缓存失败时继续：--reference-if-able 在缓存不存在时退化为普通克隆
+            if result['returncode'] != 0:
+                on_line(f"对象缓存不可用，改为普通克隆: {step.cache}")
+                if new_cache:
+                    shutil.rmtree(step.cache, ignore_errors=True)
+            else:
+                _touch(step.cache)
+            continue
+        if result['returncode'] != 0:
+            outcome.ok = False
+            lines = result['stderr'].strip().splitlines()
+            outcome.message = lines[-1] if lines else f"退出代码 {result['returncode']}"
+            if step.cwd is None:
+                # 克隆本身失败：不留下写了一半的目标，下次可直接重试
+                _discard_target(options.target, existed)
+            break
+    return outcome
+
+
+def _discard_target(target, existed):
+    if not existed:
+        shutil.rmtree(target, ignore_errors=True)
+        return
+    try:
+        names = os.listdir(target)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(target, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _touch(path):
+    if os.path.isdir(path):
+        try:
+            with open(os.path.join(path, _LAST_USED), 'w'):
+                pass
+        except OSError:
+            pass
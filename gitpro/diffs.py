@@ -0,0 +1,306 @@
+import fnmatch
+import os
+import subprocess
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import accumulate, islice
+from typing import NamedTuple
+
+from gitpro.cache import stat_key
+from gitpro.executor import popen_git, run_git
+from gitpro.gitdir import resolve_git_dir
+from gitpro.status_model import UNMERGED_CODES
+
+# 状态条目的差异：git diff 的输出边读边写入磁盘上的临时文件，只在内存中保存稀疏的行偏移索引
+# 与 hunk 的起始行，视图按需读取可见的行，50 MB 的差异也只占用很少的内存。
+# 二进制文件与生成的文件（lock 文件、压缩后的脚本、linguist-generated 等）先用 --numstat
+# 与 check-attr 识别，默认折叠不读取。最近查看的差异保存在一个小的 LRU 中，
+# 以索引与工作区文件的 stat 作为指纹，任一变化即失效。
+
+MODE_WORKTREE = 'worktree'
+MODE_STAGED = 'staged'
+MODE_UNTRACKED = 'untracked'
+MODE_LABELS = {MODE_WORKTREE: '工作区', MODE_STAGED: '已暂存', MODE_UNTRACKED: '新文件'}
+
+KIND_TEXT = 'text'
+KIND_BINARY = 'binary'
+KIND_GENERATED = 'generated'
+
+DIFF_CACHE_SIZE = 8
+READ_SIZE = 64 * 1024
+# 每隔多少行记录一次文件偏移
+INDEX_STRIDE = 64
+# 视图中单行显示的最大字符数，超出部分截断
+MAX_LINE_CHARS = 2000
+GENERATED_PATTERNS = [
+    '*.min.js', '*.min.css', '*.map', '*.lock', 'package-lock.json', 'npm-shrinkwrap.json', 'pnpm-lock.yaml',
+    'go.sum', '*_pb2.py', '*_pb2_grpc.py', '*.pb.go', '*.pb.h', '*.pb.cc', '*.generated.*', '*.g.dart',
+]
+
+_DIFF_BASE = ["git", "-c", "core.quotePath=false", "diff", "--no-color", "--no-ext-diff"]
+
+
+class DiffInfo(NamedTuple):
+    kind: str
+    added: int
+    deleted: int
+    # 折叠的原因（生成的文件）
+    reason: str = ''
+
+
+def available_modes(code):
+    # code 为两位 porcelain 状态码（与 StatusModel 相同）；未暂存的改动在前
+    if code == '??':
+        return [MODE_UNTRACKED]
+    modes = []
+    if code[1] != ' ':
+        modes.append(MODE_WORKTREE)
+    if code[0] not in ' ?!' and code not in UNMERGED_CODES:
+        modes.append(MODE_STAGED)
+    return modes
+
+
+def diff_command(mode, path, orig_path=None, numstat=False):
+    options = ["--numstat"] if numstat else []
+    if mode == MODE_UNTRACKED:
+        # 与空文件比较；--no-index 有差异时退出代码为 1
+        return _DIFF_BASE + options + ["--no-index", "--", os.devnull, path]
+    if mode == MODE_STAGED:
+        options.append("--cached")
+    paths = [orig_path, path] if orig_path else [path]
+    return _DIFF_BASE + options + ["--"] + paths
+
+
+def is_generated_name(path):
+    name = path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in GENERATED_PATTERNS)
+
+
+def parse_numstat(output):
+    # 返回 (新增行数, 删除行数, 是否二进制)
+    added = deleted = 0
+    binary = False
+    for line in output.splitlines():
+        fields = line.split('\t')
+        if len(fields) < 3:
+            continue
+        if fields[0] == '-':
+            binary = True
+            continue
+        added += int(fields[0])
+        deleted += int(fields[1])
+    return added, deleted, binary
+
+
+def parse_check_attr(output):
+    # check-attr -z 的输出：路径\0属性\0值\0...
+    fields = output.split('\0')
+    return {fields[i + 1]: fields[i + 2] for i in range(0, len(fields) - 2, 3)}
+
+
+def diff_fingerprint(repo_path, path):
+    git_dir = resolve_git_dir(repo_path)
+    index = stat_key(os.path.join(git_dir, 'index')) if git_dir else None
+    return (index, stat_key(os.path.join(repo_path, path)))
+
+
+class DiffDocument:
+    def __init__(self, path, mode, info, fingerprint=None):
+        self.path = path
+        self.mode = mode
+        self.info = info
+        self.fingerprint = fingerprint
+        self.line_count = 0
+        self.size = 0
+        self.complete = False
+        self.error = ''
+        # 生成的文件在用户要求后仍读取内容
+        self.expanded = False
+        # 第 i * INDEX_STRIDE 行在临时文件中的偏移
+        self._offsets = array('Q')
+        # hunk（@@ 行）与文件头（diff --git 行）所在的行号
+        self.hunks = array('L')
+        self._file = None
+        self._pending = b''
+        self._lock = threading.Lock()
+
+    @property
+    def collapsed(self):
+        return self.info.kind != KIND_TEXT and not self.expanded
+
+    # ---- 写入（工作线程） ----
+    def feed(self, data):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='gitpro-diff-')
+        data = self._pending + data
+        end = data.rfind(b'\n') + 1
+        self._pending = data[end:]
+        if end:
+            self._append(data[:end])
+
+    def finish(self, error=''):
+        if self._pending:
+            self._append(self._pending + b'\n')
+            self._pending = b''
+        self.error = error
+        self.complete = True
+
+    def _append(self, data):
+        # 行偏移用 accumulate 在 C 层计算；hunk 行用 find 查找，避免逐行循环
+        lines = data.split(b'\n')
+        lines.pop()
+        first = self.line_count
+        skip = -first % INDEX_STRIDE
+        ends = list(accumulate(len(line) + 1 for line in lines))
+        # 第 first + i 行的偏移为 size + ends[i - 1]；最后一项是下一块的第一行，不在这里记录
+        offsets = [self.size] if skip == 0 and lines else []
+        start = skip - 1 if skip else INDEX_STRIDE - 1
+        offsets.extend(self.size + end for end in islice(ends, start, len(lines) - 1, INDEX_STRIDE))
+        hunks = []
+        for marker in (b'@@', b'diff --git'):
+            if data.startswith(marker):
+                hunks.append(0)
+            position = data.find(b'\n' + marker)
+            while position >= 0:
+                hunks.append(position + 1)
+                position = data.find(b'\n' + marker, position + 1)
+        hunks = sorted(first + bisect_right(ends, position) for position in hunks)
+        with self._lock:
+            self._file.seek(self.size)
+            self._file.write(data)
+            self._offsets.extend(offsets)
+            self.hunks.extend(hunks)
+            self.size += len(data)
+            self.line_count += len(lines)
+
+    # ---- 读取（界面线程） ----
+    def lines(self, start, count):
+        # 返回 [start, start + count) 行的文本（已解码、过长的行已截断）
+        with self._lock:
+            total = self.line_count
+            if self._file is None or start >= total:
+                return []
+            stop = min(total, start + count)
+            block = start // INDEX_STRIDE
+            self._file.seek(self._offsets[block])
+            result = []
+            for number in range(block * INDEX_STRIDE, stop):
+                line = self._file.readline(MAX_LINE_CHARS * 4)
+                truncated = not line.endswith(b'\n')
+                while truncated:
+                    rest = self._file.readline(READ_SIZE)
+                    if not rest or rest.endswith(b'\n'):
+                        break
+                if number >= start:
+                    text = line.rstrip(b'\n').decode('utf-8', errors='replace')
+                    if truncated or len(text) > MAX_LINE_CHARS:
+                        text = text[:MAX_LINE_CHARS] + ' …'
+                    result.append(text)
+            return result
+
+    def next_hunk(self, line, direction=1):
+        hunks = self.hunks
+        if direction > 0:
+            index = bisect_right(hunks, line)
+            return hunks[index] if index < len(hunks) else None
+        index = bisect_left(hunks, line)
+        return hunks[index - 1] if index else None
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class DiffCache:
+    def __init__(self, max_entries=DIFF_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fingerprint):
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                return None
+            if document.fingerprint != fingerprint or not document.complete:
+                del self._entries[key]
+                document.close()
+                return None
+            self._entries.move_to_end(key)
+            return document
+
+    def put(self, key, document):
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None and old is not document:
+                evicted.append(old)
+            self._entries[key] = document
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+
+    def clear(self):
+        with self._lock:
+            documents = list(self._entries.values())
+            self._entries.clear()
+        for document in documents:
+            document.close()
+
+
+def inspect_diff(repo_path, mode, path, orig_path=None, job=None):
+    # 读取差异前先判断类型：numstat 给出行数与是否二进制，check-attr 给出 -diff 与 linguist-generated
+    numstat = run_git(diff_command(mode, path, orig_path, numstat=True), repo_path, job)
+    added, deleted, binary = parse_numstat(numstat['stdout'])
+    attrs = parse_check_attr(run_git(["git", "check-attr", "-z", "diff", "linguist-generated", "--", path],
+                                  repo_path, job)['stdout'])
+    if binary or attrs.get('diff') == 'unset':
+        return DiffInfo(KIND_BINARY, added, deleted)
+    if attrs.get('linguist-generated') in ('set', 'true'):
+        return DiffInfo(KIND_GENERATED, added, deleted, '.gitattributes 标记为生成的文件')
+    if is_generated_name(path):
+        return DiffInfo(KIND_GENERATED, added, deleted, '按文件名判断为生成的文件')
+    return DiffInfo(KIND_TEXT, added, deleted)
+
+
+def load_diff(repo_path, mode, path, orig_path=None, job=None, expand=False, on_progress=None):
+    # 在调用线程中读取差异；on_progress(document) 在每读入一块后调用（由调用方节流）。
+    # expand 为 True 时生成的文件也读取内容
+    fingerprint = diff_fingerprint(repo_path, path)
+    info = inspect_diff(repo_path, mode, path, orig_path, job)
+    document = DiffDocument(path, mode, info, fingerprint)
+    document.expanded = expand and info.kind == KIND_GENERATED
+    if document.collapsed:
+        document.finish()
+        return document
+    command = diff_command(mode, path, orig_path)
+    process = popen_git(command, repo_path, job, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            chunk = process.stdout.read1(READ_SIZE)
+            if not chunk:
+                break
+            document.feed(chunk)
+            if on_progress is not None:
+                on_progress(document)
+        process.wait()
+        if job is not None:
+            job.check()
+    except BaseException:
+        # 取消或出错时不保留读了一半的文档
+        process.kill()
+        document.close()
+        raise
+    finally:
+        if job is not None:
+            job.release(process, document.size)
+    # --no-index 有差异时退出代码为 1
+    failed = process.returncode not in ((0, 1) if mode == MODE_UNTRACKED else (0,))
+    document.finish(f"git diff 退出代码 {process.returncode}" if failed else '')
+    return document
@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+
+# 界面线程回调调度器：后台线程通过 post() 投递 (callback, args)，
+# 主线程每一帧在时间预算内尽量多地执行回调，队列为空时退回空闲状态。
+
+
+def callback_name(callback):
+    # 例如 GitProManager.run_operation.on_result
+    name = getattr(callback, '__qualname__', None) or getattr(callback, '__name__', None) or repr(callback)
+    return name.replace('.<locals>', '')
+
+
+class UiDispatcher:
+    def __init__(self, root, budget_ms=8, idle_ms=250, on_error=None, recorder=None):
+        self.root = root
+        # 可选的性能记录器：记录每个回调的耗时与从投递到执行的延迟
+        self.recorder = recorder
+        self.budget = budget_ms / 1000.0
+        self.idle_ms = idle_ms
+        self.on_error = on_error
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._idle_after_id = None
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._schedule_idle_poll()
+
+    def stop(self):
+        self._running = False
+        if self._idle_after_id is not None:
+            try:
+                self.root.after_cancel(self._idle_after_id)
+            except Exception:
+                pass
+            self._idle_after_id = None
+
+    def post(self, callback, args=()):
+        # 可在任意线程调用；args 为元组时展开传参，否则作为单个参数传入
+        self._queue.put((callback, args, time.perf_counter()))
+        self._wake()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _wake(self):
+        with self._lock:
+            if self._wake_pending or not self._running:
+                return
+            self._wake_pending = True
+        try:
+            # 线程版 Tcl 会把跨线程调用转交给主线程执行
+            self.root.after(0, self._tick)
+        except Exception:
+            # 主循环尚未启动或已退出：保持 _wake_pending，避免每次投递都重试，
+            # 由空闲轮询兜底
+            pass
+
+    def _schedule_idle_poll(self):
+        if not self._running:
+            return
+        try:
+            self._idle_after_id = self.root.after(self.idle_ms, self._idle_poll)
+        except Exception:
+            self._idle_after_id = None
+
+    def _idle_poll(self):
+        self._idle_after_id = None
+        if not self._queue.empty():
+            self._tick()
+        self._schedule_idle_poll()
+
+    def _tick(self):
+        with self._lock:
+            self._wake_pending = False
+        deadline = time.perf_counter() + self.budget
+        while True:
+            try:
+                callback, args, posted = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            started = time.perf_counter()
+            self._invoke(callback, args)
+            finished = time.perf_counter()
+            if self.recorder is not None:
+                self.recorder.record_callback(callback_name(callback), finished - started, started - posted)
+            if finished >= deadline:
+                break
+        if not self._queue.empty():
+            # 预算用完：先让出给重绘等空闲任务，再继续处理剩余回调
+            with self._lock:
+                if self._wake_pending:
+                    return
+                self._wake_pending = True
+            self.root.after_idle(self._continue)
+
+    def _continue(self):
+        try:
+            self.root.after(0, self._tick)
+        except Exception:
+            with self._lock:
+                self._wake_pending = False
+
+    def _invoke(self, callback, args):
+        try:
+            if isinstance(args, tuple):
+                callback(*args)
+            else:
+                callback(args)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(callback, e)
+            else:
+                print(f"执行回调 {getattr(callback, '__name__', callback)} 时出错: {e}")
@@ -0,0 +1,395 @@
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# 共享的 git 命令执行引擎：固定大小的工作线程池 + 优先级队列，
+# 相同的只读命令在排队期间合并执行，支持超时与按分组（通常是仓库路径）取消。
+
+CREATE_NO_WINDOW = subprocess.CREATE_NO_WINDOW if sys.platform.startswith("win") else 0
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_NETWORK = 2
+
+DEFAULT_TIMEOUT = 60
+NETWORK_TIMEOUT = 600
+# 结束进程后等待其输出管道关闭的最长时间（秒）
+KILL_GRACE = 2
+
+NETWORK_COMMANDS = {'push', 'pull', 'fetch', 'clone', 'ls-remote'}
+READ_ONLY_COMMANDS = {
+    'status', 'rev-parse', 'symbolic-ref', 'log', 'show', 'diff', 'for-each-ref',
+    'ls-files', 'rev-list', 'cat-file', 'describe', 'check-attr', 'show-ref',
+}
+# 仅列出分支的 git branch 参数
+_BRANCH_LIST_ARGS = {'-a', '-r', '-v', '-vv', '-avv', '--all', '--list', '--no-color'}
+
+
+def git_subcommand(command):
+    # 跳过 "git" 以及 -C <path> / -c <k=v> 等全局选项，返回子命令名
+    args = list(command[1:]) if command and command[0] == 'git' else list(command)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('-C', '-c', '--git-dir', '--work-tree'):
+            i += 2
+            continue
+        if arg.startswith('-'):
+            i += 1
+            continue
+        return arg, args[i + 1:]
+    return '', []
+
+
+def is_network_command(command):
+    return git_subcommand(command)[0] in NETWORK_COMMANDS
+
+
+def is_read_only_command(command):
+    sub, rest = git_subcommand(command)
+    if sub == 'branch':
+        return all(arg in _BRANCH_LIST_ARGS for arg in rest)
+    return sub in READ_ONLY_COMMANDS
+
+
+class CommandCancelled(Exception):
+    pass
+
+
+class CommandTimeout(Exception):
+    pass
+
+
+def make_result(stdout='', stderr='', returncode=0, **extra):
+    result = {'stdout': stdout, 'stderr': stderr, 'returncode': returncode}
+    result.update(extra)
+    return result
+
+
+class Job:
+    def __init__(self, fn, group, priority, network, key, timeout, name=None, recorder=None):
+        self.fn = fn
+        self.name = name or getattr(fn, '__name__', 'task')
+        self.recorder = recorder
+        self.group = group
+        self.priority = priority
+        self.network = network
+        self.key = key
+        self.timeout = timeout
+        self.callbacks = []
+        self.cancelled = False
+        self.timed_out = False
+        self.started = False
+        self.deadline = None
+        self.submitted = time.perf_counter()
+        # 本任务启动的进程数与读取的标准输出大小（供性能记录）
+        self.process_count = 0
+        self.stdout_bytes = 0
+        self._processes = []
+        self._process_started = {}
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+        for process in processes:
+            _kill(process)
+
+    def expire(self):
+        # 超时看门狗：结束仍在运行的进程，使阻塞在管道读取上的任务返回
+        with self._lock:
+            self.timed_out = True
+            processes = list(self._processes)
+        for process in processes:
+            _kill(process)
+
+    # ---- 供任务函数使用的上下文接口 ----
+    def check(self):
+        if self.cancelled:
+            raise CommandCancelled()
+        if self.timed_out or (self.deadline is not None and time.monotonic() > self.deadline):
+            raise CommandTimeout()
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def popen(self, command, cwd=None, **kwargs):
+        self.check()
+        kwargs.setdefault('stdin', subprocess.DEVNULL)
+        kwargs.setdefault('stdout', subprocess.PIPE)
+        kwargs.setdefault('stderr', subprocess.PIPE)
+        kwargs.setdefault('creationflags', CREATE_NO_WINDOW)
+        # 在独立的进程组中启动，结束时连同 git 启动的 ssh 等子进程一起结束
+        if os.name == 'posix':
+            kwargs.setdefault('start_new_session', True)
+        process = subprocess.Popen(command, cwd=cwd, **kwargs)
+        with self._lock:
+            self._processes.append(process)
+            self._process_started[process] = (command, time.perf_counter())
+            self.process_count += 1
+            stopped = self.cancelled or self.timed_out
+        if stopped:
+            _kill(process)
+        return process
+
+    def release(self, process, stdout_bytes=0):
+        # 进程结束后调用；stdout_bytes 为调用方读取的标准输出大小
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+            started = self._process_started.pop(process, None)
+            self.stdout_bytes += stdout_bytes
+        if self.recorder is not None and started is not None:
+            command, start = started
+            self.recorder.record_process(command, time.perf_counter() - start, process.poll(), stdout_bytes)
+
+    def detach(self, process):
+        # 跨多个任务读取的进程（如提交历史的分页读取）：本任务结束前移出，
+        # 返回的启动记录交给下一个任务的 attach()，最后由 release() 记录整个进程
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+            return self._process_started.pop(process, None)
+
+    def attach(self, process, started):
+        with self._lock:
+            self._processes.append(process)
+            if started is not None:
+                self._process_started[process] = started
+            stopped = self.cancelled or self.timed_out
+        if stopped:
+            _kill(process)
+
+    def run(self, command, cwd=None, input=None, env=None, text=True):
+        # 同步执行一条命令并返回结果字典；受任务的取消与超时约束
+        kwargs = {'env': env}
+        if input is not None:
+            kwargs['stdin'] = subprocess.PIPE
+        # 以字节读取，记录的输出大小不受解码影响
+        if text and input is not None:
+            input = input.encode('utf-8')
+        process = self.popen(command, cwd=cwd, **kwargs)
+        stdout = None
+        try:
+            stdout, stderr = process.communicate(input=input, timeout=self.remaining())
+        except subprocess.TimeoutExpired:
+            _kill(process)
+            _drain(process)
+            raise CommandTimeout()
+        finally:
+            self.release(process, len(stdout) if stdout else 0)
+        self.check()
+        if text:
+            stdout, stderr = _decode(stdout), _decode(stderr)
+        return make_result(stdout, stderr, process.returncode)
+
+
+def run_git(command, cwd, job=None, input=None, env=None, timeout=None):
+    # 同步执行一条命令并返回结果字典。有 job 时经由执行引擎（取消与超时以异常向上传播）；
+    # 否则直接执行（命令行、基准等不经过执行引擎的调用），超时与启动失败写入结果字典
+    if job is not None:
+        return job.run(command, cwd=cwd, input=input, env=env)
+    if timeout is None:
+        timeout = NETWORK_TIMEOUT if is_network_command(command) else DEFAULT_TIMEOUT
+    stdin = {'input': input} if input is not None else {'stdin': subprocess.DEVNULL}
+    try:
+        process = subprocess.run(command, cwd=cwd, env=env, **stdin, capture_output=True, text=True,
+                                 encoding='utf-8', errors='replace', timeout=timeout,
+                                 creationflags=CREATE_NO_WINDOW)
+    except subprocess.TimeoutExpired:
+        return make_result('', f'命令超时（{timeout} 秒）\n', -1, timed_out=True)
+    except OSError as e:
+        return make_result('', str(e), -1, error=str(e))
+    return make_result(process.stdout, process.stderr, process.returncode)
+
+
+def popen_git(command, cwd, job=None, **kwargs):
+    # 启动需要边读边处理输出的进程；有 job 时由任务登记（结束后调用方需 job.release()）
+    if job is not None:
+        return job.popen(command, cwd=cwd, **kwargs)
+    kwargs.setdefault('stdin', subprocess.DEVNULL)
+    kwargs.setdefault('stdout', subprocess.PIPE)
+    kwargs.setdefault('stderr', subprocess.PIPE)
+    kwargs.setdefault('creationflags', CREATE_NO_WINDOW)
+    return subprocess.Popen(command, cwd=cwd, **kwargs)
+
+
+def _decode(data):
+    # 与 text=True 相同：UTF-8 解码并统一换行符
+    return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _kill(process):
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.poll() is None:
+            process.kill()
+    except OSError:
+        pass
+
+
+def _drain(process):
+    # 子进程仍持有管道时不无限等待
+    try:
+        process.communicate(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        for stream in (process.stdin, process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+        process.wait()
+
+
+class GitExecutor:
+    def __init__(self, max_workers=4, max_network=None, recorder=None):
+        self.max_workers = max(1, max_workers)
+        # 可选的性能记录器（gitpro.perf.PerfRecorder）
+        self.recorder = recorder
+        # 网络操作最多占用 max_workers - 1 个线程，保证交互式读取始终有空闲线程
+        self.max_network = max_network or max(1, self.max_workers - 1)
+        self._pending = []
+        self._running = set()
+        self._by_key = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._threads = []
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"git-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn, on_done=None, group=None, priority=PRIORITY_NORMAL,
+               network=False, key=None, timeout=DEFAULT_TIMEOUT, name=None):
+        # fn(job) 在工作线程中执行，返回结果字典；on_done(result) 同样在工作线程中回调
+        with self._cond:
+            if key is not None:
+                existing = self._by_key.get(key)
+                if existing is not None and not existing.started and not existing.cancelled:
+                    if on_done:
+                        existing.callbacks.append(on_done)
+                    if priority < existing.priority:
+                        existing.priority = priority
+                        self._pending.sort(key=lambda item: (item[1].priority, item[0]))
+                    return existing
+            job = Job(fn, group, priority, network, key, timeout, name=name, recorder=self.recorder)
+            if on_done:
+                job.callbacks.append(on_done)
+            self._pending.append((next(self._seq), job))
+            self._pending.sort(key=lambda item: (item[1].priority, item[0]))
+            if key is not None:
+                self._by_key[key] = job
+            self._cond.notify()
+            return job
+
+    def run_command(self, command, cwd, on_done=None, group=None, priority=None,
+                    timeout=None, read_only=None):
+        network = is_network_command(command)
+        if read_only is None:
+            read_only = is_read_only_command(command)
+        if priority is None:
+            if network:
+                priority = PRIORITY_NETWORK
+            elif read_only:
+                priority = PRIORITY_INTERACTIVE
+            else:
+                priority = PRIORITY_NORMAL
+        if timeout is None:
+            timeout = NETWORK_TIMEOUT if network else DEFAULT_TIMEOUT
+        key = (cwd, tuple(command)) if read_only else None
+        return self.submit(lambda job: job.run(command, cwd=cwd), on_done=on_done,
+                           group=cwd if group is None else group, priority=priority,
+                           network=network, key=key, timeout=timeout, name=f"git {git_subcommand(command)[0]}")
+
+    def cancel_group(self, group):
+        with self._cond:
+            dropped = [job for _, job in self._pending if job.group == group]
+            self._pending = [item for item in self._pending if item[1].group != group]
+            running = [job for job in self._running if job.group == group]
+            for job in dropped:
+                self._forget(job)
+        for job in dropped + running:
+            job.cancel()
+        for job in dropped:
+            self._finish(job, make_result('', '已取消', -1, cancelled=True))
+        return len(dropped) + len(running)
+
+    def shutdown(self):
+        with self._cond:
+            self._shutdown = True
+            pending = [job for _, job in self._pending]
+            self._pending = []
+            running = list(self._running)
+            self._cond.notify_all()
+        for job in pending + running:
+            job.cancel()
+
+    def _forget(self, job):
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def _take(self):
+        network_running = sum(1 for job in self._running if job.network)
+        for index, (_, job) in enumerate(self._pending):
+            if job.network and network_running >= self.max_network:
+                continue
+            del self._pending[index]
+            return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = None
+                while not self._shutdown:
+                    job = self._take()
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                job.started = True
+                self._forget(job)
+                self._running.add(job)
+            started = time.perf_counter()
+            watchdog = None
+            if job.timeout:
+                job.deadline = time.monotonic() + job.timeout
+                watchdog = threading.Timer(job.timeout, job.expire)
+                watchdog.daemon = True
+                watchdog.start()
+            try:
+                job.check()
+                result = job.fn(job)
+            except CommandCancelled:
+                result = make_result('', '已取消', -1, cancelled=True)
+            except CommandTimeout:
+                result = make_result('', f'命令超时（{job.timeout} 秒）\n', -1, timed_out=True)
+            except Exception as e:
+                result = make_result('', str(e), -1, error=str(e))
+            if watchdog is not None:
+                watchdog.cancel()
+            if job.cancelled and not result.get('cancelled'):
+                result = dict(result, cancelled=True)
+            if self.recorder is not None:
+                self.recorder.record_job(job.name, time.perf_counter() - started, started - job.submitted,
+                                         job.process_count, job.stdout_bytes, result)
+            with self._cond:
+                self._running.discard(job)
+                # 网络任务结束后可能有被限流的任务可以开始
+                self._cond.notify_all()
+            self._finish(job, result)
+
+    def _finish(self, job, result):
+        for callback in job.callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"执行回调 {getattr(callback, '__name__', callback)} 时出错: {e}")
@@ -0,0 +1,33 @@
+import os
+
+# 定位仓库的 .git 目录；支持 .git 为 "gitdir: ..." 文件的工作树与子模块。
+
+
+def resolve_git_dir(path):
+    dot_git = os.path.join(path, '.git')
+    if os.path.isdir(dot_git):
+        return dot_git
+    if os.path.isfile(dot_git):
+        try:
+            with open(dot_git, encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if content.startswith('gitdir:'):
+            git_dir = content[len('gitdir:'):].strip()
+            if not os.path.isabs(git_dir):
+                git_dir = os.path.normpath(os.path.join(path, git_dir))
+            return git_dir if os.path.isdir(git_dir) else None
+    return None
+
+
+def resolve_common_dir(git_dir):
+    # 链接工作树的 refs / packed-refs 存放在 commondir 指向的主仓库目录中
+    try:
+        with open(os.path.join(git_dir, 'commondir'), encoding='utf-8') as f:
+            common = f.read().strip()
+    except OSError:
+        return git_dir
+    if not os.path.isabs(common):
+        common = os.path.normpath(os.path.join(git_dir, common))
+    return common
@@ -0,0 +1,200 @@
+from typing import NamedTuple, Tuple
+
+from gitpro.executor import popen_git
+
+# 提交历史的分页读取与图形布局：保持一个 git log 进程，按页从管道中读取，
+# 每读到一个提交就增量计算它所在的泳道，不一次性加载整个历史。
+# 在执行引擎中读取时，进程挂在当前读取页的任务上，受该任务的取消与超时约束，
+# 并在结束时记入性能记录。
+
+PAGE_SIZE = 500
+LOG_FORMAT = '--format=%H%x00%P%x00%an%x00%at%x00%D%x00%s'
+
+
+class Commit(NamedTuple):
+    oid: str
+    parents: Tuple[str, ...]
+    author: str
+    timestamp: int
+    refs: str
+    subject: str
+
+
+class GraphRow(NamedTuple):
+    commit: Commit
+    column: int
+    # 穿过本行、与本提交无关的泳道
+    passing: Tuple[int, ...]
+    # 从上方汇入本提交的泳道（包括本提交自身的泳道；分支顶端为空）
+    joins: Tuple[int, ...]
+    # 从本提交向下连到父提交的泳道
+    forks: Tuple[int, ...]
+    width: int
+
+
+def parse_commit(line):
+    fields = line.rstrip('\n').split('\0')
+    if len(fields) < 6:
+        return None
+    oid, parents, author, timestamp, refs, subject = fields[:6]
+    return Commit(oid, tuple(parents.split()), author, int(timestamp or 0), refs, subject)
+
+
+def build_log_command(revisions=None, author=None, paths=None, all_refs=True):
+    # 泳道布局要求子提交先于父提交输出；有 commit-graph 时 git 可以增量输出拓扑序
+    command = ["git", "log", LOG_FORMAT, "--topo-order", "--no-color"]
+    if author:
+        command.append(f"--author={author}")
+    if revisions:
+        command.extend(revisions)
+    elif all_refs:
+        command.append("--all")
+    if paths:
+        # 按路径过滤时让 %P 输出简化后的父提交，否则泳道会等待不会出现的提交
+        command.append("--parents")
+        command.append("--")
+        command.extend(paths)
+    return command
+
+
+class LaneLayout:
+    def __init__(self):
+        # lanes[i] 为该泳道等待的下一个提交
+        self.lanes = []
+
+    def add(self, commit):
+        lanes = self.lanes
+        joins = [i for i, oid in enumerate(lanes) if oid == commit.oid]
+        if joins:
+            column = joins[0]
+        else:
+            column = self._free_column()
+        for i in joins:
+            lanes[i] = None
+        passing = tuple(i for i, oid in enumerate(lanes) if oid is not None)
+        forks = []
+        for n, parent in enumerate(commit.parents):
+            if n == 0:
+                existing = [i for i, oid in enumerate(lanes) if oid == parent]
+                if existing and existing[0] != column:
+                    # 第一父提交已在其他泳道等待：本泳道直接汇入
+                    forks.append(existing[0])
+                else:
+                    lanes[column] = parent
+                    forks.append(column)
+                continue
+            if parent in lanes:
+                forks.append(lanes.index(parent))
+            else:
+                i = self._free_column(exclude=column)
+                lanes[i] = parent
+                forks.append(i)
+        while lanes and lanes[-1] is None:
+            lanes.pop()
+        width = max([len(lanes), column + 1] + [i + 1 for i in forks])
+        return GraphRow(commit, column, passing, tuple(joins), tuple(forks), width)
+
+    def _free_column(self, exclude=None):
+        for i, oid in enumerate(self.lanes):
+            if oid is None and i != exclude:
+                return i
+        self.lanes.append(None)
+        return len(self.lanes) - 1
+
+
+class CommitStream:
+    def __init__(self, repo_path, command):
+        self.repo_path = repo_path
+        self.command = command
+        self.exhausted = False
+        self.error = ''
+        self._process = None
+        # 进程的启动记录，在读取各页的任务之间传递
+        self._started = None
+        self.bytes_read = 0
+        self.layout = LaneLayout()
+
+    def read_page(self, count=PAGE_SIZE, job=None):
+        # 从管道中读取最多 count 个提交并计算布局；git 在管道写满后会自行暂停
+        if self.exhausted:
+            return []
+        if self._process is None:
+            self._process = popen_git(self.command, self.repo_path, job)
+        elif job is not None:
+            job.attach(self._process, self._started)
+        rows = []
+        stdout = self._process.stdout
+        try:
+            while len(rows) < count:
+                line = stdout.readline()
+                if not line:
+                    self._finish(job)
+                    break
+                self.bytes_read += len(line)
+                commit = parse_commit(line.decode('utf-8', errors='replace'))
+                if commit is not None:
+                    rows.append(self.layout.add(commit))
+        finally:
+            if job is not None and not self.exhausted:
+                self._started = job.detach(self._process)
+        if job is not None:
+            job.check()
+        return rows
+
+    def _finish(self, job=None):
+        self.exhausted = True
+        process = self._process
+        process.wait()
+        if job is not None:
+            job.release(process, self.bytes_read)
+        if process.returncode not in (0, None) and process.stderr is not None:
+            self.error = process.stderr.read().decode('utf-8', errors='replace').strip()
+
+    def close(self):
+        process = self._process
+        if process is not None and process.poll() is None:
+            try:
+                process.kill()
+            except OSError:
+                pass
+            process.wait()
+        self.exhausted = True
+
+
+class HistoryModel:
+    def __init__(self, repo_path, revisions=None, author=None, paths=None, all_refs=True):
+        self.repo_path = repo_path
+        self.command = build_log_command(revisions, author, paths, all_refs)
+        self.stream = CommitStream(repo_path, self.command)
+        self.rows = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def exhausted(self):
+        return self.stream.exhausted
+
+    def fetch(self, count=PAGE_SIZE, job=None):
+        # 在后台线程中调用；返回新行，由界面线程调用 extend() 合并
+        return self.stream.read_page(count, job)
+
+    def extend(self, rows):
+        start = len(self.rows)
+        self.rows.extend(rows)
+        for offset, row in enumerate(rows):
+            self._index[row.commit.oid] = start + offset
+
+    def find(self, oid):
+        index = self._index.get(oid)
+        if index is None:
+            # 允许使用缩写的提交号
+            for full, i in self._index.items():
+                if full.startswith(oid):
+                    return i
+            return -1
+        return index
+
+    def close(self):
+        self.stream.close()
@@ -0,0 +1,143 @@
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+
+# 输出日志的内存环形缓冲：保留最近 max_lines 行供界面显示与搜索，
+# 完整的会话日志由后台线程写入可轮转的磁盘文件，界面线程不做文件 I/O。
+
+DEFAULT_TAG = 'OUTPUT'
+
+
+class _SpillFile:
+    def __init__(self, path, max_bytes, backup_count):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self._handler.setFormatter(logging.Formatter('%(message)s'))
+        self._handler.terminator = ''
+        self.failed = False
+        # 写入在后台线程中进行，队列中的 None 表示关闭
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name='log-spill', daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        self._queue.put(text)
+
+    def _writer(self):
+        while True:
+            text = self._queue.get()
+            if text is None:
+                break
+            # 一次写入队列中积累的全部文本
+            parts = [text]
+            while True:
+                try:
+                    text = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if text is None:
+                    self._queue.put(None)
+                    break
+                parts.append(text)
+            if self.failed:
+                continue
+            try:
+                self._handler.emit(logging.makeLogRecord({'msg': ''.join(parts)}))
+            except OSError:
+                self.failed = True
+        self._handler.close()
+
+    def close(self):
+        # 等待队列中的内容写完
+        self._queue.put(None)
+        self._thread.join()
+
+
+class LogBuffer:
+    def __init__(self, max_lines=1000, spill_path=None, max_bytes=5 * 1024 * 1024, backup_count=3):
+        self.max_lines = max_lines
+        # 每个片段为 (text, tag)；text 以换行结尾时表示一行结束
+        self._segments = deque()
+        self._line_count = 0
+        self._pending = []
+        self._pending_reset = False
+        self._lock = threading.Lock()
+        self.total_lines = 0
+        self.spill = None
+        if spill_path:
+            try:
+                self.spill = _SpillFile(spill_path, max_bytes, backup_count)
+                self.spill.write(f"\n===== 会话开始 {time.strftime('%Y-%m-%d %H:%M:%S')} =====\n")
+            except OSError:
+                self.spill = None
+
+    def __len__(self):
+        return self._line_count
+
+    def append(self, message, tag=None):
+        tag = tag or DEFAULT_TAG
+        segments = [(line, tag) for line in message.splitlines(keepends=True)]
+        if not segments:
+            return
+        with self._lock:
+            self._segments.extend(segments)
+            added = message.count('\n')
+            self._line_count += added
+            self.total_lines += added
+            # 超出容量时从头部按行丢弃
+            while self._line_count > self.max_lines and self._segments:
+                text, _ = self._segments.popleft()
+                if text.endswith('\n'):
+                    self._line_count -= 1
+            self._pending.extend(segments)
+            if len(self._pending) > 2 * self.max_lines:
+                # 一帧内涌入的输出超过显示容量：界面只需要最后 max_lines 行
+                self._pending = list(self._segments)
+                self._pending_reset = True
+        if self.spill is not None:
+            self.spill.write(message)
+
+    def drain(self):
+        # 取出自上次调用以来新增的片段（供界面批量插入）；
+        # 返回 (segments, reset)，reset 为 True 时界面应先清空再插入
+        with self._lock:
+            pending, self._pending = self._pending, []
+            reset, self._pending_reset = self._pending_reset, False
+        return pending, reset
+
+    def segments(self, tag=None):
+        with self._lock:
+            items = list(self._segments)
+        if tag is None:
+            return items
+        return [item for item in items if item[1] == tag]
+
+    def tags(self):
+        with self._lock:
+            return sorted({tag for _, tag in self._segments})
+
+    def search(self, pattern, tag=None, regex=False, ignore_case=True):
+        # 在缓冲区内查找，返回匹配的 (text, tag) 片段，不依赖界面控件
+        flags = re.IGNORECASE if ignore_case else 0
+        matcher = re.compile(pattern if regex else re.escape(pattern), flags)
+        return [item for item in self.segments(tag) if matcher.search(item[0])]
+
+    def clear(self):
+        with self._lock:
+            self._segments.clear()
+            self._line_count = 0
+            self._pending = []
+            self._pending_reset = True
+
+    def close(self):
+        # 退出前调用，保证会话日志的末尾写入磁盘
+        spill, self.spill = self.spill, None
+        if spill is not None:
+            spill.close()
@@ -0,0 +1,179 @@
+import os
+import re
+import statistics
+import sys
+import time
+from typing import NamedTuple
+
+from gitpro.executor import run_git
+from gitpro.gitdir import resolve_common_dir, resolve_git_dir
+from gitpro.porcelain import STATUS_COMMAND
+from gitpro.workflow import step
+
+# 仓库加速：检查并启用 git 自带的加速功能——未跟踪文件缓存（core.untrackedCache）、
+# 大仓库预设（feature.manyFiles，索引版本 4）、内置的文件系统监视（core.fsmonitor，
+# Windows / macOS 上的 git 2.37+）、提交图（commit-graph，加快 log --graph 等历史遍历）
+# 以及多包索引（multi-pack-index）。启用前后各测量一次 status 与 log --graph 的耗时。
+
+BENCH_RUNS = 3
+LOG_BENCH_LIMIT = 5000
+LOG_BENCH_COMMAND = ["git", "log", "--graph", "--all", "--oneline", "--no-color", "-n", str(LOG_BENCH_LIMIT)]
+CONFIG_COMMAND = ["git", "config", "--list", "-z"]
+VERSION_COMMAND = ["git", "version"]
+FSMONITOR_MIN_VERSION = (2, 37)
+FSMONITOR_PLATFORMS = ('win32', 'darwin')
+# 与界面刷新相同：status 不写回索引
+_BENCH_ENV = {'GIT_OPTIONAL_LOCKS': '0'}
+WARMUP_COMMAND = ["git", "status", "--porcelain"]
+_STATUS_SETTINGS = ('many_files', 'untracked_cache', 'fsmonitor')
+
+
+class Check(NamedTuple):
+    key: str
+    label: str
+    ok: bool
+    # 当前状态与建议
+    current: str
+    recommended: str
+    # 当前平台 / git 版本是否支持
+    supported: bool = True
+
+
+class Timing(NamedTuple):
+    name: str
+    before_ms: float
+    after_ms: float
+
+    @property
+    def speedup(self):
+        return self.before_ms / self.after_ms if self.after_ms else 0.0
+
+
+def parse_config(output):
+    # git config --list -z：每项为 "键\n值\0"，键已转为小写，后出现的覆盖先出现的
+    config = {}
+    for item in output.split('\0'):
+        if item:
+            key, _, value = item.partition('\n')
+            config[key] = value
+    return config
+
+
+def parse_version(output):
+    match = re.search(r'(\d+)\.(\d+)', output)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+
+def is_true(value):
+    return value is not None and value.lower() in ('true', 'yes', 'on', '1')
+
+
+def is_false(value):
+    return value is not None and value.lower() in ('false', 'no', 'off', '0', '')
+
+
+def fsmonitor_supported(version, platform=None):
+    return (platform or sys.platform) in FSMONITOR_PLATFORMS and version >= FSMONITOR_MIN_VERSION
+
+
+def check_repo(repo_path, config, version, platform=None):
+    git_dir = resolve_git_dir(repo_path)
+    common_dir = resolve_common_dir(git_dir) if git_dir else None
+    objects = os.path.join(common_dir, 'objects') if common_dir else ''
+    many_files = is_true(config.get('feature.manyfiles'))
+    untracked = config.get('core.untrackedcache')
+    # feature.manyFiles 隐含 core.untrackedCache=true，除非显式关闭
+    untracked_on = is_true(untracked) or (many_files and untracked is None)
+    fsmonitor = config.get('core.fsmonitor')
+    fsmonitor_ok = fsmonitor_supported(version, platform)
+    graph_exists = os.path.exists(os.path.join(objects, 'info', 'commit-graph')) or \
+        os.path.exists(os.path.join(objects, 'info', 'commit-graphs', 'commit-graph-chain'))
+    graph_on = graph_exists and config.get('core.commitgraph', 'true') != 'false'
+    pack_dir = os.path.join(objects, 'pack')
+    try:
+        packs = sum(1 for name in os.listdir(pack_dir) if name.endswith('.pack'))
+    except OSError:
+        packs = 0
+    midx = os.path.exists(os.path.join(pack_dir, 'multi-pack-index'))
+    return [
+        Check('untracked_cache', "未跟踪文件缓存 (core.untrackedCache)", untracked_on,
+              untracked or ('由 feature.manyFiles 启用' if untracked_on else '未设置'), 'true'),
+        Check('many_files', "大仓库预设 (feature.manyFiles)", many_files,
+              config.get('feature.manyfiles', '未设置'), 'true'),
+        # 也可能是用户自己配置的钩子路径（如 watchman），视为已启用
+        Check('fsmonitor', "文件系统监视 (core.fsmonitor)", bool(fsmonitor) and not is_false(fsmonitor),
+              fsmonitor or '未设置', 'true' if fsmonitor_ok else '当前平台或 git 版本不支持内置监视', fsmonitor_ok),
+        Check('commit_graph', "提交图 (commit-graph)", graph_on,
+              '已生成' if graph_exists else '未生成', '生成并在 fetch 时更新'),
+        Check('multi_pack_index', "多包索引 (multi-pack-index)", midx or packs <= 1,
+              '已生成' if midx else f'{packs} 个包', '生成' if packs > 1 else '无需（包不超过 1 个）', packs > 1),
+    ]
+
+
+def collect_checks(repo_path, job=None):
+    config = parse_config(run_git(CONFIG_COMMAND, repo_path, job)['stdout'])
+    version = parse_version(run_git(VERSION_COMMAND, repo_path, job)['stdout'])
+    return check_repo(repo_path, config, version)
+
+
+def acceleration_steps(checks):
+    # 为未启用且受支持的项生成工作流步骤
+    missing = {check.key for check in checks if not check.ok and check.supported}
+    steps = []
+    if 'many_files' in missing:
+        steps.append(step("启用 feature.manyFiles", ["git", "config", "feature.manyFiles", "true"]))
+        steps.append(step("把索引升级到版本 4", ["git", "update-index", "--index-version", "4"]))
+    if 'untracked_cache' in missing:
+        steps.append(step("启用未跟踪文件缓存", ["git", "config", "core.untrackedCache", "true"]))
+        steps.append(step("在索引中启用未跟踪文件缓存", ["git", "update-index", "--untracked-cache"]))
+    if 'fsmonitor' in missing:
+        steps.append(step("启用内置文件系统监视", ["git", "config", "core.fsmonitor", "true"]))
+    if 'commit_graph' in missing:
+        steps.append(step("生成提交图", ["git", "commit-graph", "write", "--reachable", "--changed-paths"]))
+        steps.append(step("fetch 时更新提交图", ["git", "config", "fetch.writeCommitGraph", "true"]))
+    if 'multi_pack_index' in missing:
+        steps.append(step("生成多包索引", ["git", "multi-pack-index", "write"]))
+    return steps
+
+
+def needs_warmup(checks):
+    # 启用了影响 status 的设置后，需要一次允许写索引的 status 填充缓存
+    return any(not check.ok and check.supported for check in checks if check.key in _STATUS_SETTINGS)
+
+
+def time_command(repo_path, command, runs=BENCH_RUNS, job=None):
+    # 先执行一次预热，再取 runs 次的中位数（毫秒）
+    env = dict(os.environ, **_BENCH_ENV)
+    durations = []
+    for index in range(runs + 1):
+        started = time.perf_counter()
+        run_git(command, repo_path, job, env=env)
+        if index:
+            durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def measure(repo_path, runs=BENCH_RUNS, job=None):
+    return {'status': time_command(repo_path, STATUS_COMMAND, runs, job),
+            'log --graph': time_command(repo_path, LOG_BENCH_COMMAND, runs, job)}
+
+
+def compare_timings(before, after):
+    return [Timing(name, before[name], after[name]) for name in before if name in after]
+
+
+def format_checks(checks):
+    lines = []
+    for check in checks:
+        mark = '✅' if check.ok else ('⚠️' if check.supported else '➖')
+        line = f"{mark} {check.label}: {check.current}"
+        if not check.ok:
+            line += f"（建议：{check.recommended}）"
+        lines.append(line)
+    missing = sum(1 for check in checks if not check.ok and check.supported)
+    lines.append(f"{missing} 项可启用，可运行“加速此仓库”（命令行：accelerate）。" if missing else "已启用全部可用的加速设置。")
+    return '\n'.join(lines) + '\n'
+
+
+def format_timings(timings):
+    return '\n'.join(f"{t.name}: {t.before_ms:.0f} ms → {t.after_ms:.0f} ms（{t.speedup:.2f}×）" for t in timings)
@@ -0,0 +1,235 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from gitpro.executor import git_subcommand
+
+# 性能记录：每个 git 进程的耗时、输出大小与退出代码，每个后台任务的排队与执行时间，
+# 每个界面回调的耗时；主线程心跳间隔超过阈值时记为一次卡顿并给出最可能的原因。
+# 记录在内存中按类型保留最近的样本，可导出为 JSON。
+
+DEFAULT_STALL_MS = 200
+HEARTBEAT_MS = 50
+MAX_SAMPLES_PER_KEY = 1000
+MAX_RECENT = 500
+MAX_STALLS = 200
+
+
+class CommandSample(NamedTuple):
+    kind: str
+    command: str
+    started: float
+    duration: float
+    returncode: int
+    stdout_bytes: int
+
+
+class JobSample(NamedTuple):
+    name: str
+    started: float
+    duration: float
+    wait: float
+    processes: int
+    stdout_bytes: int
+    returncode: int
+    status: str
+
+
+class Stall(NamedTuple):
+    started: float
+    duration: float
+    cause: str
+
+
+def percentile(sorted_values, fraction):
+    # 最近秩法；sorted_values 需已排序
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(durations):
+    values = sorted(durations)
+    if not values:
+        return {'count': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0}
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 0.5) * 1000, 2),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2),
+        'total_ms': round(sum(values) * 1000, 2),
+    }
+
+
+class PerfRecorder:
+    def __init__(self, stall_ms=DEFAULT_STALL_MS, max_samples=MAX_SAMPLES_PER_KEY):
+        self.stall_ms = stall_ms
+        self.max_samples = max_samples
+        self.created = time.time()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._commands = {}
+            self._jobs = {}
+            self._callbacks = {}
+            self._recent_commands = deque(maxlen=MAX_RECENT)
+            self._recent_jobs = deque(maxlen=MAX_RECENT)
+            self._stalls = deque(maxlen=MAX_STALLS)
+            # 自上次心跳以来耗时最长的界面回调，用于判断卡顿原因
+            self._longest_callback = None
+
+    def _bucket(self, table, key):
+        bucket = table.get(key)
+        if bucket is None:
+            bucket = table[key] = deque(maxlen=self.max_samples)
+        return bucket
+
+    # ---- 记录（任意线程） ----
+    def record_process(self, command, duration, returncode, stdout_bytes=0):
+        kind = git_subcommand(command)[0] or str(command[0] if command else '')
+        sample = CommandSample(kind, ' '.join(command), time.time() - duration, duration,
+                               -1 if returncode is None else returncode, stdout_bytes or 0)
+        with self._lock:
+            self._bucket(self._commands, kind).append(sample)
+            self._recent_commands.append(sample)
+
+    def record_job(self, name, duration, wait, processes, stdout_bytes, result):
+        if result.get('cancelled'):
+            status = 'cancelled'
+        elif result.get('timed_out'):
+            status = 'timed_out'
+        elif 'error' in result:
+            status = 'error'
+        else:
+            status = 'ok'
+        sample = JobSample(name, time.time() - duration, duration, wait, processes, stdout_bytes,
+                           result.get('returncode', 0), status)
+        with self._lock:
+            self._bucket(self._jobs, name).append(sample)
+            self._recent_jobs.append(sample)
+
+    # ---- 记录（界面线程） ----
+    def record_callback(self, name, duration, latency=0.0):
+        with self._lock:
+            self._bucket(self._callbacks, name).append((duration, latency))
+            longest = self._longest_callback
+            if longest is None or duration > longest[1]:
+                self._longest_callback = (name, duration)
+
+    def heartbeat(self, gap):
+        # gap 为两次心跳之间超出预期间隔的时间（秒）
+        with self._lock:
+            longest, self._longest_callback = self._longest_callback, None
+            if gap * 1000 < self.stall_ms:
+                return None
+            if longest is not None and longest[1] >= gap / 2:
+                cause = f"界面回调 {longest[0]}（{longest[1] * 1000:.0f} ms）"
+            else:
+                cause = "界面事件处理或重绘（不在调度回调中）"
+            stall = Stall(time.time() - gap, gap, cause)
+            self._stalls.append(stall)
+            return stall
+
+    # ---- 汇总 ----
+    def command_stats(self):
+        with self._lock:
+            buckets = {kind: list(samples) for kind, samples in self._commands.items()}
+        stats = {}
+        for kind, samples in buckets.items():
+            entry = summarize([s.duration for s in samples])
+            entry['failures'] = sum(1 for s in samples if s.returncode != 0)
+            entry['stdout_bytes'] = sum(s.stdout_bytes for s in samples)
+            stats[kind] = entry
+        return stats
+
+    def job_stats(self):
+        with self._lock:
+            buckets = {name: list(samples) for name, samples in self._jobs.items()}
+        stats = {}
+        for name, samples in buckets.items():
+            entry = summarize([s.duration for s in samples])
+            waits = sorted(s.wait for s in samples)
+            entry['wait_p95_ms'] = round(percentile(waits, 0.95) * 1000, 2)
+            entry['processes'] = sum(s.processes for s in samples)
+            entry['failures'] = sum(1 for s in samples if s.status != 'ok' or s.returncode != 0)
+            stats[name] = entry
+        return stats
+
+    def callback_stats(self):
+        with self._lock:
+            buckets = {name: list(samples) for name, samples in self._callbacks.items()}
+        stats = {}
+        for name, samples in buckets.items():
+            entry = summarize([duration for duration, _ in samples])
+            latencies = sorted(latency for _, latency in samples)
+            entry['latency_p95_ms'] = round(percentile(latencies, 0.95) * 1000, 2)
+            stats[name] = entry
+        return stats
+
+    def stalls(self):
+        with self._lock:
+            return list(self._stalls)
+
+    def recent_commands(self):
+        with self._lock:
+            return list(self._recent_commands)
+
+    def to_dict(self):
+        with self._lock:
+            recent_commands = [s._asdict() for s in self._recent_commands]
+            recent_jobs = [s._asdict() for s in self._recent_jobs]
+            stalls = [s._asdict() for s in self._stalls]
+        return {
+            'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'session_started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.created)),
+            'stall_threshold_ms': self.stall_ms,
+            'commands': self.command_stats(),
+            'jobs': self.job_stats(),
+            'callbacks': self.callback_stats(),
+            'stalls': stalls,
+            'recent_commands': recent_commands,
+            'recent_jobs': recent_jobs,
+        }
+
+    def export_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+class StallMonitor:
+    # 主线程心跳：用 root.after 定时触发，实际间隔比预期长出阈值即为卡顿
+    def __init__(self, root, recorder, interval_ms=HEARTBEAT_MS, on_stall=None):
+        self.root = root
+        self.recorder = recorder
+        self.interval = interval_ms / 1000.0
+        self.interval_ms = interval_ms
+        self.on_stall = on_stall
+        self._last = None
+        self._after_id = None
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _beat(self):
+        now = time.perf_counter()
+        gap = now - self._last - self.interval
+        self._last = now
+        stall = self.recorder.heartbeat(max(0.0, gap))
+        if stall is not None and self.on_stall is not None:
+            self.on_stall(stall)
+        self._after_id = self.root.after(self.interval_ms, self._beat)
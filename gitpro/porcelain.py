@@ -0,0 +1,174 @@
+from typing import NamedTuple, Optional
+
+# git status --porcelain=v2 -z --branch 的流式解析器。
+# 按块喂入字节数据，逐条产出 StatusEntry，分支信息汇总到 BranchInfo。
+
+STATUS_COMMAND = ["git", "status", "--porcelain=v2", "-z", "--branch"]
+CHUNK_SIZE = 64 * 1024
+
+KIND_CHANGED = '1'
+KIND_RENAMED = '2'
+KIND_UNMERGED = 'u'
+KIND_UNTRACKED = '?'
+KIND_IGNORED = '!'
+
+
+class StatusEntry(NamedTuple):
+    kind: str
+    xy: str
+    path: str
+    orig_path: Optional[str] = None
+    score: str = ''
+    submodule: str = 'N...'
+
+    @property
+    def code(self):
+        # 与 porcelain v1 一致的两位状态码（未变化的一侧为空格）
+        return self.xy.replace('.', ' ')
+
+    @property
+    def staged(self):
+        return self.kind in (KIND_CHANGED, KIND_RENAMED) and self.xy[0] != '.'
+
+    @property
+    def unstaged(self):
+        return self.kind in (KIND_UNTRACKED, KIND_UNMERGED) or (
+            self.kind in (KIND_CHANGED, KIND_RENAMED) and self.xy[1] != '.')
+
+
+class BranchInfo:
+    __slots__ = ('oid', 'head', 'upstream', 'ahead', 'behind')
+
+    def __init__(self):
+        self.oid = None
+        self.head = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+
+    @property
+    def detached(self):
+        return self.head == '(detached)'
+
+    @property
+    def initial(self):
+        return self.oid == '(initial)'
+
+    def __repr__(self):
+        return (f"BranchInfo(head={self.head!r}, oid={self.oid!r}, upstream={self.upstream!r}, "
+                f"ahead={self.ahead}, behind={self.behind})")
+
+
+class PorcelainParseError(ValueError):
+    pass
+
+
+def _decode(data):
+    return data.decode('utf-8', errors='replace')
+
+
+class PorcelainV2Parser:
+    def __init__(self):
+        self.branch = BranchInfo()
+        self.count = 0
+        # 已读取的字节数
+        self.size = 0
+        self._buffer = b''
+        self._rename = None
+
+    def feed(self, data):
+        # 解析新到达的字节块，返回其中完整的条目；不完整的尾部留待下一块
+        if not data:
+            return []
+        self.size += len(data)
+        records = (self._buffer + data).split(b'\0')
+        self._buffer = records.pop()
+        entries = []
+        for record in records:
+            entry = self._parse_record(record)
+            if entry is not None:
+                entries.append(entry)
+        self.count += len(entries)
+        return entries
+
+    def close(self):
+        if self._buffer:
+            # 最后一条记录缺少结尾的 NUL（例如输出被截断）
+            entries = self.feed(b'\0')
+        else:
+            entries = []
+        if self._rename is not None:
+            raise PorcelainParseError("重命名记录缺少原路径")
+        return entries
+
+    def _parse_record(self, record):
+        if self._rename is not None:
+            fields, path = self._rename
+            self._rename = None
+            return StatusEntry(KIND_RENAMED, fields[1], path, _decode(record), fields[8], fields[2])
+        if not record:
+            return None
+        kind = record[:1]
+        if kind == b'#':
+            self._parse_header(_decode(record[2:]))
+            return None
+        if kind == b'1':
+            fields = record.split(b' ', 8)
+            if len(fields) != 9:
+                raise PorcelainParseError(f"无法解析的状态记录: {record!r}")
+            return StatusEntry(KIND_CHANGED, _decode(fields[1]), _decode(fields[8]), None, '', _decode(fields[2]))
+        if kind == b'2':
+            fields = record.split(b' ', 9)
+            if len(fields) != 10:
+                raise PorcelainParseError(f"无法解析的重命名记录: {record!r}")
+            # -z 模式下原路径是下一条以 NUL 分隔的字段
+            self._rename = ([_decode(f) for f in fields[:9]], _decode(fields[9]))
+            return None
+        if kind == b'u':
+            fields = record.split(b' ', 10)
+            if len(fields) != 11:
+                raise PorcelainParseError(f"无法解析的冲突记录: {record!r}")
+            return StatusEntry(KIND_UNMERGED, _decode(fields[1]), _decode(fields[10]), None, '', _decode(fields[2]))
+        if kind == b'?':
+            return StatusEntry(KIND_UNTRACKED, '??', _decode(record[2:]))
+        if kind == b'!':
+            return StatusEntry(KIND_IGNORED, '!!', _decode(record[2:]))
+        raise PorcelainParseError(f"未知的记录类型: {record!r}")
+
+    def _parse_header(self, header):
+        key, _, value = header.partition(' ')
+        branch = self.branch
+        if key == 'branch.oid':
+            branch.oid = value
+        elif key == 'branch.head':
+            branch.head = value
+        elif key == 'branch.upstream':
+            branch.upstream = value
+        elif key == 'branch.ab':
+            ahead, _, behind = value.partition(' ')
+            branch.ahead = int(ahead.lstrip('+') or 0)
+            branch.behind = int(behind.lstrip('-') or 0)
+
+
+def iter_status(stream, chunk_size=CHUNK_SIZE, parser=None):
+    # 从管道中按块读取，每读到一块就产出其中的条目列表（可能为空）
+    parser = parser or PorcelainV2Parser()
+    read = getattr(stream, 'read1', stream.read)
+    while True:
+        data = read(chunk_size)
+        if not data:
+            break
+        entries = parser.feed(data)
+        if entries:
+            yield entries
+    entries = parser.close()
+    if entries:
+        yield entries
+
+
+def parse_status(data):
+    # 一次性解析完整输出，返回 (BranchInfo, [StatusEntry, ...])
+    parser = PorcelainV2Parser()
+    entries = parser.feed(data)
+    entries.extend(parser.close())
+    return parser.branch, entries
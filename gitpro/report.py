@@ -0,0 +1,219 @@
+import codecs
+import gzip
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from gitpro.executor import popen_git
+from gitpro.maintenance import CONFIG_COMMAND, collect_checks, format_checks
+from gitpro.units import format_size
+
+# 诊断报告：每个部分是一条 git 命令，输出按块读取、边读边交给调用方显示。
+# 每部分单独计时，输出超过上限时截断并结束进程，超过时限时结束进程。
+# 报告的状态保存在 DiagnosticReport 中，多个报告互不影响；可导出为文本或 gzip 压缩文件。
+
+# 分支图最多包含的提交数，完整历史请使用提交历史窗口
+REPORT_GRAPH_LIMIT = 200
+# 每部分保留的输出上限（字节）与时限（秒）
+SECTION_MAX_BYTES = 1024 * 1024
+SECTION_TIMEOUT = 30
+READ_SIZE = 64 * 1024
+
+
+class Section(NamedTuple):
+    name: str
+    command: Tuple[str, ...]
+    # 不显示命令的原始输出，而由 build(repo_path, job) 生成文本（如加速设置检查）
+    build: Optional[Callable] = None
+
+
+def _maintenance_text(repo_path, job):
+    return format_checks(collect_checks(repo_path, job))
+
+
+REPORT_SECTIONS = [
+    Section('分支图', ("git", "log", "--graph", "--all", "--decorate", "--oneline", "--abbrev-commit",
+                    "-n", str(REPORT_GRAPH_LIMIT))),
+    Section('分支列表', ("git", "branch", "-avv")),
+    Section('当前状态', ("git", "status")),
+    Section('加速设置', tuple(CONFIG_COMMAND), build=_maintenance_text),
+]
+
+
+class SectionOutcome(NamedTuple):
+    returncode: Optional[int]
+    stderr: str = ''
+    duration: float = 0.0
+    # 保留的输出大小（字节）
+    size: int = 0
+    truncated: bool = False
+    timed_out: bool = False
+    cancelled: bool = False
+
+    @property
+    def status(self):
+        if self.cancelled:
+            return "已取消"
+        if self.timed_out:
+            return "超时，输出不完整"
+        if self.truncated:
+            return "输出超过上限，已截断"
+        if self.returncode:
+            return f"失败，退出代码 {self.returncode}"
+        return "完成"
+
+
+@dataclass
+class SectionState:
+    name: str
+    command: Tuple[str, ...]
+    chunks: List[str] = field(default_factory=list)
+    outcome: Optional[SectionOutcome] = None
+
+    @property
+    def done(self):
+        return self.outcome is not None
+
+    def header(self):
+        return f"--- {self.name} ---\n$ {' '.join(self.command)}\n"
+
+    def footer(self):
+        # 部分结束后追加的内容：标准错误输出与耗时、大小
+        ends_line = not self.chunks or self.chunks[-1].endswith('\n')
+        text = '' if ends_line else '\n'
+        outcome = self.outcome
+        if outcome is None:
+            return text + "[未完成]\n\n"
+        if outcome.stderr:
+            text += f"[标准错误输出]\n{outcome.stderr}"
+            if not outcome.stderr.endswith('\n'):
+                text += '\n'
+        return text + f"[{outcome.status}，耗时 {outcome.duration * 1000:.0f} ms，{format_size(outcome.size)}]\n\n"
+
+    def text(self):
+        return self.header() + ''.join(self.chunks) + self.footer()
+
+
+class DiagnosticReport:
+    def __init__(self, repo_path, sections=None):
+        self.repo_path = repo_path
+        self.specs = list(sections or REPORT_SECTIONS)
+        self.sections = [SectionState(spec.name, spec.command) for spec in self.specs]
+        self.started = time.time()
+
+    @property
+    def complete(self):
+        return all(section.done for section in self.sections)
+
+    @property
+    def finished_count(self):
+        return sum(1 for section in self.sections if section.done)
+
+    def header(self):
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started))
+        return f"Git Manager 诊断报告\n仓库: {self.repo_path}\n生成时间: {started}\n\n"
+
+    def feed(self, index, text):
+        self.sections[index].chunks.append(text)
+
+    def finish(self, index, outcome):
+        self.sections[index].outcome = outcome
+
+    def text(self):
+        return self.header() + ''.join(section.text() for section in self.sections)
+
+    def export(self, path):
+        # 以 .gz 结尾时写入 gzip 压缩文件，便于附加到工单
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write(self.header())
+            for section in self.sections:
+                f.write(section.header())
+                f.writelines(section.chunks)
+                f.write(section.footer())
+
+
+def run_section(repo_path, spec, job=None, on_chunk=None, max_bytes=SECTION_MAX_BYTES, timeout=SECTION_TIMEOUT):
+    # 在调用线程中执行一个部分，on_chunk(text) 在读到输出时调用；返回 SectionOutcome。
+    # 有 job 时时限由执行引擎控制，取消与超时以异常向上传播
+    on_chunk = on_chunk or (lambda text: None)
+    started = time.perf_counter()
+    if spec.build is not None:
+        text = spec.build(repo_path, job)
+        on_chunk(text)
+        return SectionOutcome(0, duration=time.perf_counter() - started, size=len(text.encode('utf-8')))
+    expired = []
+    def expire():
+        expired.append(True)
+        process.kill()
+    # 标准错误写入临时文件，避免两个管道互相阻塞
+    with tempfile.TemporaryFile() as stderr_file:
+        process = popen_git(list(spec.command), repo_path, job, stderr=stderr_file)
+        timer = None
+        if job is None:
+            timer = threading.Timer(timeout, expire) if timeout else None
+            if timer is not None:
+                timer.daemon = True
+                timer.start()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        size = 0
+        truncated = False
+        try:
+            while True:
+                chunk = process.stdout.read1(READ_SIZE)
+                if not chunk:
+                    break
+                if size + len(chunk) > max_bytes:
+                    # 在上限内的最后一个换行处截断
+                    limit = max_bytes - size
+                    chunk = chunk[:chunk.rfind(b'\n', 0, limit) + 1 or limit]
+                    truncated = True
+                size += len(chunk)
+                text = decoder.decode(chunk)
+                if text:
+                    on_chunk(text)
+                if truncated:
+                    process.kill()
+                    break
+            text = decoder.decode(b'', final=True)
+            if text:
+                on_chunk(text)
+            process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if job is not None:
+                job.release(process, size)
+        if job is not None:
+            job.check()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode('utf-8', errors='replace')
+    return SectionOutcome(None if truncated or expired else process.returncode, stderr,
+                          time.perf_counter() - started, size, truncated, bool(expired))
+
+
+def failed_outcome(result, duration=0.0):
+    # 执行引擎返回的取消 / 超时 / 异常结果转换为 SectionOutcome
+    return SectionOutcome(None, '' if result.get('cancelled') else result.get('stderr', ''), duration,
+                          timed_out=bool(result.get('timed_out')), cancelled=bool(result.get('cancelled')))
+
+
+def run_report(report, on_text=None):
+    # 依次执行各部分（命令行使用），on_text(text) 按顺序收到报告的全部文本
+    on_text = on_text or (lambda text: None)
+    on_text(report.header())
+    for index, spec in enumerate(report.specs):
+        section = report.sections[index]
+        on_text(section.header())
+        def on_chunk(text, i=index):
+            report.feed(i, text)
+            on_text(text)
+        try:
+            outcome = run_section(report.repo_path, spec, on_chunk=on_chunk)
+        except OSError as e:
+            outcome = SectionOutcome(None, str(e))
+        report.finish(index, outcome)
+        on_text(section.footer())
+    return report
@@ -0,0 +1,331 @@
+import os
+from dataclasses import dataclass, field
+from typing import NamedTuple, Tuple
+
+from gitpro.branches import read_head
+from gitpro.executor import run_git
+from gitpro.maintenance import (WARMUP_COMMAND, acceleration_steps, collect_checks, compare_timings, format_checks,
+                                 format_timings, measure, needs_warmup)
+from gitpro.report import DiagnosticReport, run_report
+from gitpro.snapshot import DEFAULT_BRANCH_FALLBACK, collect_snapshot
+from gitpro.staging import STAGE_COMMAND, UNTRACKED_COMMAND, parse_untracked, plan_staging
+from gitpro.workflow import (RESET_SOFT, Workflow, clear_state, load_state, new_state, pending_marker,
+                             rollback_workflow, save_state, step)
+
+# 与界面无关的仓库操作层：每个操作声明为一个工作流（gitpro.workflow），同步执行并返回 OperationResult，
+# 执行过程通过 on_event 回调报告。界面在一个工作线程中执行整个工作流，命令行直接调用。
+
+# 事件类型
+EVENT_COMMAND = 'command'
+EVENT_STDOUT = 'stdout'
+EVENT_STDERR = 'stderr'
+EVENT_RESULT = 'result'
+EVENT_INFO = 'info'
+# 工作流进入下一步
+EVENT_STEP = 'step'
+
+
+class ServiceError(Exception):
+    # 操作的前提条件不满足（例如分离 HEAD 时完成分支），不会执行任何命令
+    pass
+
+
+class ServiceEvent(NamedTuple):
+    kind: str
+    text: str = ''
+    command: Tuple[str, ...] = ()
+    returncode: int = 0
+
+
+def describe_event(event, repo_name=''):
+    # 把事件转换为 (日志文本, 日志类型)，界面日志与命令行输出共用
+    if event.kind == EVENT_COMMAND:
+        where = f"在 {repo_name} 中" if repo_name else ""
+        return f"▶️ {where}执行: {' '.join(event.command)}\n", 'INFO'
+    if event.kind == EVENT_STDOUT:
+        return event.text, None
+    if event.kind == EVENT_STDERR:
+        tag = 'ERROR' if event.returncode != 0 else 'INFO'
+        return f"[{tag} from stderr]\n{event.text}", tag
+    if event.kind == EVENT_STEP:
+        return f"— {event.text}\n", 'INFO'
+    if event.kind == EVENT_RESULT:
+        if event.returncode == 0:
+            return "\n✅ 命令成功！\n", 'SUCCESS'
+        return f"\n❌ 命令失败，退出代码 {event.returncode}\n", 'ERROR'
+    return event.text, 'INFO'
+
+
+@dataclass
+class OperationResult:
+    operation: str
+    ok: bool = True
+    message: str = ''
+    # 前提满足、无需执行（例如工作区干净时保存进度）
+    skipped: bool = False
+    # 依次执行的 (command, result)
+    steps: list = field(default_factory=list)
+    # 可继续的工作流停在中途，进度已保存，可继续或回滚
+    interrupted: bool = False
+
+    @property
+    def returncode(self):
+        if not self.steps:
+            return 0 if self.ok else 1
+        return self.steps[-1][1]['returncode']
+
+
+class GitService:
+    def __init__(self, repo_path, on_event=None, cache=None):
+        self.repo_path = repo_path
+        self.on_event = on_event
+        self.cache = cache
+
+    def _emit(self, kind, text='', command=(), returncode=0):
+        if self.on_event is not None:
+            self.on_event(ServiceEvent(kind, text, tuple(command), returncode))
+
+    def run(self, command, job=None, quiet=False, input=None):
+        # 有 job 时受执行引擎的取消与超时约束（CommandCancelled / CommandTimeout 向上传播）
+        if not quiet:
+            self._emit(EVENT_COMMAND, command=command)
+        result = run_git(command, self.repo_path, job, input=input)
+        if not quiet:
+            if result['stdout']:
+                self._emit(EVENT_STDOUT, result['stdout'], command)
+            if result['stderr']:
+                self._emit(EVENT_STDERR, result['stderr'], command, result['returncode'])
+            self._emit(EVENT_RESULT, command=command, returncode=result['returncode'])
+        return result
+
+    def _branch_oid(self, branch, job=None):
+        result = self.run(["git", "rev-parse", "--verify", "-q", f"refs/heads/{branch}"], job, quiet=True)
+        if result['returncode'] != 0:
+            return None
+        return result['stdout'].strip() or None
+
+    def run_workflow(self, workflow, job=None, start=0, state=None):
+        # 在调用线程中依次执行各步骤，遇到第一个失败即停止；
+        # 可继续的工作流在每一步开始前保存进度，全部完成后清除
+        outcome = OperationResult(workflow.name)
+        if workflow.resumable and state is None:
+            existing = load_state(self.repo_path)
+            if existing is not None:
+                raise ServiceError(f"{existing.describe()}\n请先继续或回滚该操作。")
+            state = new_state(workflow, read_head(self.repo_path),
+                              {branch: self._branch_oid(branch, job) for branch in workflow.touches})
+        total = len(workflow.steps)
+        for index in range(start, total):
+            current = workflow.steps[index]
+            if state is not None:
+                state.next, state.failed, state.message = index, False, ''
+                save_state(self.repo_path, state)
+            self._emit(EVENT_STEP, f"步骤 {index + 1}/{total}：{current.label}")
+            result = self.run(current.command, job, input=current.input)
+            outcome.steps.append((current.command, result))
+            if result['returncode'] in current.allowed:
+                if current.publishes and state is not None:
+                    state.published = True
+                continue
+            if current.optional:
+                continue
+            outcome.ok = False
+            outcome.message = (result['stderr'] or result['stdout']).strip()
+            if state is not None:
+                state.failed = True
+                state.message = outcome.message
+                save_state(self.repo_path, state)
+                outcome.interrupted = True
+            return outcome
+        if state is not None:
+            clear_state(self.repo_path)
+        return outcome
+
+    def pending_workflow(self):
+        return load_state(self.repo_path)
+
+    def resume_workflow(self, job=None):
+        # 从停下的步骤继续；该步骤停在中途（如合并冲突已解决）时先完成它
+        state = load_state(self.repo_path)
+        if state is None:
+            raise ServiceError("没有未完成的操作")
+        start = state.next
+        current = state.current
+        concluded = []
+        if pending_marker(self.repo_path, current):
+            unmerged = self.run(["git", "diff", "--name-only", "--diff-filter=U"], job, quiet=True)['stdout'].split()
+            if unmerged:
+                raise ServiceError(f"仍有 {len(unmerged)} 个文件存在冲突，请先解决并 git add：\n" + '\n'.join(unmerged[:10]))
+            if current.conclude:
+                self._emit(EVENT_STEP, f"完成中断的步骤：{current.label}")
+                result = self.run(current.conclude, job)
+                concluded.append((current.conclude, result))
+                if result['returncode'] != 0:
+                    return OperationResult(state.name, ok=False, steps=concluded, interrupted=True,
+                                           message=(result['stderr'] or result['stdout']).strip())
+            start += 1
+        outcome = self.run_workflow(state.workflow(), job, start=start, state=state)
+        outcome.steps[:0] = concluded
+        return outcome
+
+    def rollback_workflow(self, job=None):
+        # 放弃未完成的操作，恢复开始前的分支位置；已推送到远程的操作不能回滚
+        state = load_state(self.repo_path)
+        if state is None:
+            raise ServiceError("没有未完成的操作")
+        if state.published:
+            raise ServiceError(f"操作 '{state.name}' 已推送到远程，不能自动回滚。")
+        oids = {branch: self._branch_oid(branch, job) for branch in state.refs}
+        workflow = rollback_workflow(state, read_head(self.repo_path), oids,
+                                     pending_marker(self.repo_path, state.current))
+        outcome = self.run_workflow(workflow, job)
+        if outcome.ok:
+            clear_state(self.repo_path)
+        return outcome
+
+    def discard_workflow(self):
+        # 只删除保存的进度，不改变仓库
+        clear_state(self.repo_path)
+
+    def snapshot(self, job=None, on_entries=None, with_refs=True, with_status=True):
+        return collect_snapshot(self.repo_path, job=job, on_entries=on_entries, with_refs=with_refs,
+                                with_status=with_status, cache=self.cache)
+
+    def new_branch(self, name, push=True, job=None):
+        steps = [step(f"新建分支 {name}", ["git", "switch", "-c", name])]
+        if push:
+            steps.append(step("推送并设置上游", ["git", "push", "-u", "origin", name], publishes=True))
+        return self.run_workflow(Workflow('new_branch', steps), job)
+
+    def switch_branch(self, name, pull=True, job=None, track=False):
+        # track：name 为远程分支（如 upstream/feat），建立同名的本地跟踪分支
+        steps = [step(f"切换到 {name}", ["git", "switch", "--track", name] if track else ["git", "switch", name])]
+        if pull:
+            steps.append(step("快进到上游", ["git", "pull", "--ff-only"]))
+        return self.run_workflow(Workflow('switch_branch', steps), job)
+
+    def plan_staging(self, snapshot, selectors=None, include_large=False, job=None):
+        # 由快照中已解析的状态条目生成暂存计划；只有选中未跟踪目录时才额外启动 ls-files
+        return plan_staging(self.repo_path, snapshot.entries, selectors, include_large,
+                            untracked=lambda: parse_untracked(self.run(UNTRACKED_COMMAND, job, quiet=True)['stdout']))
+
+    def stage(self, plan, job=None):
+        for line in plan.warnings():
+            self._emit(EVENT_INFO, line + '\n')
+        chunks = list(plan.chunks())
+        steps = [step(f"暂存 {len(chunk)} 个文件（{index}/{len(chunks)}）", STAGE_COMMAND, input='\0'.join(chunk) + '\0')
+                 for index, chunk in enumerate(chunks, 1)]
+        return self.run_workflow(Workflow('stage', steps), job)
+
+    def save_progress(self, message, snapshot=None, job=None, selectors=None, include_large=False, plan=None):
+        # selectors：要提交的文件、目录或通配符，None 表示全部改动
+        if snapshot is None:
+            snapshot = self.snapshot(job, with_refs=False)
+        if not snapshot.is_repo:
+            raise ServiceError(f"不是一个 Git 仓库: {self.repo_path}")
+        if snapshot.is_clean:
+            return OperationResult('save_progress', skipped=True, message="工作区是干净的。无需保存。")
+        existing = load_state(self.repo_path)
+        if existing is not None:
+            raise ServiceError(f"{existing.describe()}\n请先继续或回滚该操作。")
+        if plan is None:
+            plan = self.plan_staging(snapshot, selectors, include_large, job)
+        if plan.empty:
+            for line in plan.warnings():
+                self._emit(EVENT_INFO, line + '\n')
+            return OperationResult('save_progress', skipped=True, message="没有选中可提交的改动。")
+        staged = self.stage(plan, job)
+        if not staged.ok:
+            staged.operation = 'save_progress'
+            return staged
+        # 推送失败时提交已在本地，可继续（重试推送）或回滚（撤销提交，改动保留在暂存区）
+        outcome = self.run_workflow(Workflow('save_progress', [
+            step("提交", ["git", "commit", "-m", message]),
+            step("推送", ["git", "push"], publishes=True),
+        ], resumable=bool(snapshot.head), touches=[snapshot.head] if snapshot.head else [], reset_mode=RESET_SOFT),
+            job)
+        outcome.steps[:0] = staged.steps
+        return outcome
+
+    def sync_branch(self, job=None):
+        return self.run_workflow(Workflow('sync_branch', [step("拉取", ["git", "pull"])]), job)
+
+    def finish_target(self, snapshot):
+        # 返回 (当前分支, 默认分支)；不满足完成条件时抛出 ServiceError
+        if snapshot is None or not snapshot.is_repo:
+            raise ServiceError(f"不是一个 Git 仓库: {self.repo_path}")
+        branch = snapshot.head
+        if not branch:
+            raise ServiceError("当前处于分离 HEAD 状态，无法执行 '完成' 操作！")
+        default_branch = snapshot.default_branch or DEFAULT_BRANCH_FALLBACK
+        if branch == default_branch:
+            raise ServiceError(f"不能在默认分支 ('{default_branch}') 上执行 '完成' 操作！")
+        return branch, default_branch
+
+    def finish_branch(self, branch=None, default_branch=None, job=None):
+        if branch is None or default_branch is None:
+            branch, default_branch = self.finish_target(self.snapshot(job))
+        # git add 在没有可添加内容时也可能返回 1，允许继续。
+        # 合并冲突或推送失败时保存进度：解决冲突后继续，或回滚到开始前（默认分支恢复原位并切回原分支）
+        return self.run_workflow(Workflow('finish_branch', [
+            step("暂存所有改动", ["git", "add", "."], allowed=(0, 1)),
+            step(f"切换到 {default_branch}", ["git", "switch", default_branch]),
+            step(f"更新 {default_branch}", ["git", "pull"]),
+            step(f"合并 {branch}", ["git", "merge", "--no-ff", branch], pending='MERGE_HEAD',
+                 conclude=["git", "commit", "--no-edit"], abort=["git", "merge", "--abort"]),
+            step(f"推送 {default_branch}", ["git", "push"], publishes=True),
+        ], resumable=True, touches=[default_branch]), job)
+
+    def delete_branch(self, branch, remote=True, job=None):
+        steps = []
+        if remote:
+            # 远程分支可能已被删除，本地删除照常进行
+            steps.append(step(f"删除远程分支 {branch}", ["git", "push", "origin", "--delete", branch], optional=True,
+                              publishes=True))
+        steps.append(step(f"删除本地分支 {branch}", ["git", "branch", "-d", branch]))
+        return self.run_workflow(Workflow('delete_branch', steps), job)
+
+    def maintenance_checks(self, job=None):
+        return collect_checks(self.repo_path, job)
+
+    def accelerate(self, job=None, benchmark=True):
+        # 启用缺少的加速设置；benchmark 为 True 时在前后各测量一次 status 与 log --graph
+        checks = self.maintenance_checks(job)
+        steps = acceleration_steps(checks)
+        if not steps:
+            return OperationResult('accelerate', skipped=True, message=format_checks(checks).strip())
+        before = None
+        if benchmark:
+            self._emit(EVENT_INFO, "测量启用前的 status 与 log --graph 耗时...\n")
+            before = measure(self.repo_path, job=job)
+        outcome = self.run_workflow(Workflow('accelerate', steps), job)
+        if not outcome.ok:
+            return outcome
+        if needs_warmup(checks):
+            # 界面刷新时 status 不写索引，由这里写入未跟踪文件缓存
+            self._emit(EVENT_INFO, "预热状态缓存...\n")
+            self.run(WARMUP_COMMAND, job, quiet=True)
+        text = format_checks(self.maintenance_checks(job))
+        if before is not None:
+            self._emit(EVENT_INFO, "测量启用后的耗时...\n")
+            text += format_timings(compare_timings(before, measure(self.repo_path, job=job)))
+        outcome.message = text.strip()
+        return outcome
+
+    def report(self, on_text=None):
+        # 依次执行诊断报告的各部分；界面中由 ReportWindow 并行执行并流式显示
+        return run_report(DiagnosticReport(self.repo_path), on_text)
+
+
+def repo_name(path):
+    return os.path.basename(os.path.normpath(path))
+
+
+def head_summary(snapshot):
+    if snapshot.detached:
+        text = f"分离 HEAD ({(snapshot.oid or '')[:8]})"
+    else:
+        text = f"分支 {snapshot.head}"
+    if snapshot.upstream:
+        text += f"  ⇄ {snapshot.upstream}  ↑{snapshot.ahead} ↓{snapshot.behind}"
+    return text
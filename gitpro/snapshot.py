@@ -0,0 +1,195 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from gitpro.executor import popen_git
+from gitpro.porcelain import STATUS_COMMAND, KIND_IGNORED, PorcelainV2Parser, iter_status
+
+# 仓库快照：用一次 status --porcelain=v2 --branch 加一次 for-each-ref
+# 收集 HEAD、上游、领先/落后、默认分支、分支列表与文件状态。
+
+REFS_COMMAND = ["git", "for-each-ref", "--format=%(refname)%00%(symref)", "refs/heads", "refs/remotes"]
+DEFAULT_BRANCH_FALLBACK = "main"
+
+
+@dataclass
+class RepoSnapshot:
+    path: str
+    is_repo: bool = False
+    head: Optional[str] = None
+    oid: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    # 未设置 refs/remotes/origin/HEAD 时为 None
+    default_branch: Optional[str] = None
+    local_branches: List[str] = field(default_factory=list)
+    remote_branches: List[str] = field(default_factory=list)
+    entries: list = field(default_factory=list)
+    error: str = ''
+    # 分支数据是否来自指纹缓存
+    refs_cached: bool = False
+    process_count: int = 0
+    duration: float = 0.0
+
+    def inherit(self, previous, refs=False, status=False):
+        # 局部刷新时沿用上一次快照中未重新收集的部分
+        if refs:
+            self.default_branch = previous.default_branch
+            self.local_branches = previous.local_branches
+            self.remote_branches = previous.remote_branches
+        if status:
+            self.head = previous.head
+            self.oid = previous.oid
+            self.upstream = previous.upstream
+            self.ahead = previous.ahead
+            self.behind = previous.behind
+            self.entries = previous.entries
+        return self
+
+    @property
+    def detached(self):
+        return self.head is None
+
+    @property
+    def is_clean(self):
+        return not any(entry.kind != KIND_IGNORED for entry in self.entries)
+
+    @property
+    def dirty_count(self):
+        return sum(1 for entry in self.entries if entry.kind != KIND_IGNORED)
+
+    @property
+    def branches(self):
+        # 命令行 status --json 输出的分支名称：本地分支与 origin 上的分支合并显示
+        names = set(self.local_branches)
+        for ref in self.remote_branches:
+            if ref.startswith('origin/'):
+                names.add(ref[len('origin/'):])
+            else:
+                names.add('remotes/' + ref)
+        return sorted(names)
+
+
+def parse_refs(output, snapshot):
+    # 解析 REFS_COMMAND 的输出，填充分支列表与默认分支
+    local, remote = [], []
+    for line in output.splitlines():
+        refname, _, symref = line.partition('\0')
+        if refname.startswith('refs/heads/'):
+            local.append(refname[len('refs/heads/'):])
+        elif refname.startswith('refs/remotes/'):
+            name = refname[len('refs/remotes/'):]
+            if symref:
+                # refs/remotes/origin/HEAD -> refs/remotes/origin/main
+                if name == 'origin/HEAD':
+                    snapshot.default_branch = symref.split('/')[-1]
+                continue
+            remote.append(name)
+    snapshot.local_branches = local
+    snapshot.remote_branches = remote
+
+
+def _load_cached_refs(cache, path, snapshot):
+    # 返回本次使用的指纹；命中缓存时 snapshot.refs_cached 为 True
+    if cache is None:
+        return None
+    fingerprint = cache.fingerprint(path)
+    snapshot.refs_cached = cache.load_refs(path, fingerprint, snapshot)
+    return fingerprint
+
+
+def collect_refs(path, job=None, snapshot=None, cache=None):
+    # 只收集分支相关的部分（refs 变化但工作区未变时使用）
+    started = time.perf_counter()
+    snapshot = snapshot or RepoSnapshot(path=path)
+    fingerprint = _load_cached_refs(cache, path, snapshot)
+    if snapshot.refs_cached:
+        snapshot.is_repo = True
+        snapshot.duration = time.perf_counter() - started
+        return snapshot
+    process = popen_git(REFS_COMMAND, path, job)
+    snapshot.process_count += 1
+    try:
+        output = b''
+        output, error = process.communicate()
+    finally:
+        if job is not None:
+            job.release(process, len(output))
+    if job is not None:
+        job.check()
+    if process.returncode == 0:
+        snapshot.is_repo = True
+        parse_refs(output.decode('utf-8', errors='replace'), snapshot)
+        if cache is not None:
+            cache.store_refs(path, fingerprint, snapshot)
+    else:
+        snapshot.error = error.decode('utf-8', errors='replace').strip()
+    snapshot.duration = time.perf_counter() - started
+    return snapshot
+
+
+def collect_snapshot(path, job=None, on_entries=None, with_refs=True, with_status=True, cache=None):
+    # 在当前线程中同步收集快照；job 为执行引擎的任务（用于取消与超时），
+    # on_entries(batch) 在状态条目解析出来时被逐批调用；
+    # cache 为 RepoStateCache，refs 未变化时不再启动 for-each-ref
+    if not with_status:
+        return collect_refs(path, job, cache=cache)
+    started = time.perf_counter()
+    snapshot = RepoSnapshot(path=path)
+    fingerprint = None
+    if with_refs:
+        fingerprint = _load_cached_refs(cache, path, snapshot)
+        with_refs = not snapshot.refs_cached
+    # status 不需要写回索引，避免与其他 git 进程争用 index.lock
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS='0')
+    refs_process = None
+    refs_size = 0
+    if with_refs:
+        refs_process = popen_git(REFS_COMMAND, path, job, env=env)
+        snapshot.process_count += 1
+    try:
+        status_process = popen_git(STATUS_COMMAND, path, job, env=env)
+        snapshot.process_count += 1
+        try:
+            parser = PorcelainV2Parser()
+            entries = []
+            for batch in iter_status(status_process.stdout, parser=parser):
+                entries.extend(batch)
+                if on_entries:
+                    on_entries(batch)
+            status_error = status_process.stderr.read().decode('utf-8', errors='replace')
+            status_process.wait()
+        finally:
+            if job is not None:
+                job.release(status_process, parser.size)
+        if job is not None:
+            job.check()
+        if status_process.returncode != 0:
+            snapshot.error = status_error.strip()
+            return snapshot
+        branch = parser.branch
+        snapshot.is_repo = True
+        snapshot.entries = entries
+        snapshot.head = None if branch.detached else branch.head
+        snapshot.oid = None if branch.initial else branch.oid
+        snapshot.upstream = branch.upstream
+        snapshot.ahead = branch.ahead
+        snapshot.behind = branch.behind
+        if refs_process is not None:
+            refs_output, _ = refs_process.communicate()
+            refs_size = len(refs_output)
+            if refs_process.returncode == 0:
+                parse_refs(refs_output.decode('utf-8', errors='replace'), snapshot)
+                if cache is not None:
+                    cache.store_refs(path, fingerprint, snapshot)
+        return snapshot
+    finally:
+        if refs_process is not None:
+            if refs_process.poll() is None:
+                refs_process.kill()
+                refs_process.communicate()
+            if job is not None:
+                job.release(refs_process, refs_size)
+        snapshot.duration = time.perf_counter() - started
@@ -0,0 +1,159 @@
+import fnmatch
+import os
+import re
+import stat
+from dataclasses import dataclass, field
+from typing import List, NamedTuple
+
+from gitpro.porcelain import KIND_IGNORED, KIND_UNMERGED, KIND_UNTRACKED
+from gitpro.units import format_size
+
+# 按已解析的状态条目暂存改动，而不是对整个工作区执行 git add .：
+# 可按文件、目录或通配符选择；超过阈值的大文件默认跳过并给出警告；
+# 路径以 NUL 分隔分块交给 git update-index --stdin，每块一个进程。
+# （大量字面路径交给 git add --pathspec-from-file 时，git 会拿每个路径规格去匹配每个索引条目，
+# 5 万个路径需要约 100 秒；update-index 直接按路径更新索引，同样的路径不到 1 秒。）
+
+LARGE_FILE_THRESHOLD = 50 * 1024 * 1024
+STAGE_CHUNK = 20000
+# 与 git 相同：前 8000 字节中出现 NUL 即视为二进制文件
+BINARY_SNIFF = 8000
+STAGE_COMMAND = ["git", "update-index", "--add", "--remove", "-z", "--stdin"]
+# 未跟踪目录在 status 中只显示为 "目录/"，需要展开为其中的文件（遵循 .gitignore）
+UNTRACKED_COMMAND = ["git", "ls-files", "-z", "--others", "--exclude-standard"]
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+class LargeFile(NamedTuple):
+    path: str
+    size: int
+    binary: bool
+
+
+@dataclass
+class StagePlan:
+    # 交给 update-index 的路径（已排除跳过的大文件）
+    paths: List[str] = field(default_factory=list)
+    # 超过阈值的文件；include_large 为 False 时已从 paths 中排除
+    large: List[LargeFile] = field(default_factory=list)
+    include_large: bool = False
+    # 选中的未解决冲突的文件，不暂存
+    unmerged: List[str] = field(default_factory=list)
+    # 已暂存的条目数，提交时总会包含
+    staged: int = 0
+
+    @property
+    def empty(self):
+        return not self.paths and not self.staged
+
+    def chunks(self, size=STAGE_CHUNK):
+        for start in range(0, len(self.paths), size):
+            yield self.paths[start:start + size]
+
+    def warnings(self, threshold=LARGE_FILE_THRESHOLD):
+        lines = []
+        if self.large:
+            action = "将一并暂存" if self.include_large else "已跳过"
+            lines.append(f"{action} {len(self.large)} 个超过 {format_size(threshold)} 的文件：")
+            lines.extend(f"  {f.path}（{format_size(f.size)}{'，二进制' if f.binary else ''}）" for f in self.large[:20])
+            if len(self.large) > 20:
+                lines.append(f"  ... 另有 {len(self.large) - 20} 个")
+        if self.unmerged:
+            lines.append(f"已跳过 {len(self.unmerged)} 个存在冲突的文件：")
+            lines.extend(f"  {path}" for path in self.unmerged[:20])
+        return lines
+
+
+def normalize_selector(selector):
+    selector = selector.strip().replace('\\', '/')
+    while selector.startswith('./'):
+        selector = selector[2:]
+    return selector.rstrip('/')
+
+
+def is_glob(selector):
+    return bool(_GLOB_CHARS.search(selector))
+
+
+def selector_matcher(selectors):
+    # 返回 match(path)：路径等于某个选择项、位于某个目录之下，或匹配某个通配符（* 可跨越目录）
+    selectors = [normalize_selector(s) for s in selectors if s.strip()]
+    if not selectors or '' in selectors or '.' in selectors:
+        return lambda path: True
+    literal = {s for s in selectors if not is_glob(s)}
+    globs = [s for s in selectors if is_glob(s)]
+    glob_match = re.compile('|'.join(fnmatch.translate(g) for g in globs)).match if globs else None
+
+    def match(path):
+        path = path.rstrip('/')
+        if path in literal:
+            return True
+        index = path.find('/')
+        while index > 0:
+            if path[:index] in literal:
+                return True
+            index = path.find('/', index + 1)
+        return glob_match is not None and glob_match(path) is not None
+    return match
+
+
+def _covers(selector, directory):
+    # 选择项可能选中该未跟踪目录中的文件
+    return is_glob(selector) or selector == directory or selector.startswith(directory + '/') \
+        or directory.startswith(selector + '/')
+
+
+def is_binary(path):
+    try:
+        with open(path, 'rb') as f:
+            return b'\0' in f.read(BINARY_SNIFF)
+    except OSError:
+        return False
+
+
+def plan_staging(repo_path, entries, selectors=None, include_large=False, threshold=LARGE_FILE_THRESHOLD,
+                 untracked=None):
+    # entries 为快照中的状态条目；selectors 为 None 时选择全部改动；
+    # untracked() 返回全部未跟踪文件，只在选中了未跟踪目录时调用
+    match = selector_matcher(selectors or [])
+    plan = StagePlan(include_large=include_large)
+    files = []
+    directories = []
+    for entry in entries:
+        if entry.kind == KIND_IGNORED:
+            continue
+        if entry.staged:
+            plan.staged += 1
+        if not entry.unstaged:
+            continue
+        if entry.kind == KIND_UNTRACKED and entry.path.endswith('/'):
+            directory = entry.path.rstrip('/')
+            if selectors is None or any(_covers(normalize_selector(s), directory) for s in selectors):
+                directories.append(directory)
+            continue
+        if not match(entry.path):
+            continue
+        if entry.kind == KIND_UNMERGED:
+            plan.unmerged.append(entry.path)
+            continue
+        # 工作区中已删除的文件不需要检查大小
+        files.append((entry.path, entry.xy[1] != 'D'))
+    if directories and untracked is not None:
+        prefixes = tuple(directory + '/' for directory in directories)
+        files.extend((path, True) for path in untracked() if path.startswith(prefixes) and match(path))
+    for path, exists in files:
+        if exists:
+            try:
+                info = os.lstat(os.path.join(repo_path, path))
+            except OSError:
+                info = None
+            if info is not None and stat.S_ISREG(info.st_mode) and info.st_size > threshold:
+                plan.large.append(LargeFile(path, info.st_size, is_binary(os.path.join(repo_path, path))))
+                if not include_large:
+                    continue
+        plan.paths.append(path)
+    return plan
+
+
+def parse_untracked(output):
+    return [path for path in output.split('\0') if path]
@@ -0,0 +1,164 @@
+import bisect
+
+# 工作区状态模型：按路径保存状态码，刷新时只计算新增 / 删除 / 变化的条目，
+# 状态码的显示文本与标签按状态码预先计算，不再逐行判断。
+
+STATUS_NAMES = {'M': '已修改', 'D': '已删除', 'A': '已暂存', 'R': '已重命名', 'C': '已复制', 'U': '未合并', '??': '未跟踪'}
+_STATUS_CHARS = ' MTADRCU?!'
+UNMERGED_CODES = {'DD', 'AU', 'UD', 'UA', 'DU', 'AA', 'UU'}
+# 变化较少时用二分插入维护顺序，超过该数量则整体重新排序
+_INCREMENTAL_LIMIT = 2000
+
+
+def _classify(code):
+    index_status, worktree_status = code[0], code[1]
+    status_text = f"[{code.strip()}] "
+    if code in UNMERGED_CODES:
+        return status_text + STATUS_NAMES['U'], 'Unmerged'
+    if index_status == '?' and worktree_status == '?':
+        return status_text + STATUS_NAMES['??'], 'Untracked'
+    if index_status == 'R':
+        return status_text + STATUS_NAMES['R'], 'Renamed'
+    if index_status == 'D' or worktree_status == 'D':
+        return status_text + STATUS_NAMES['D'], 'Deleted'
+    if index_status == 'M' or worktree_status == 'M':
+        return status_text + STATUS_NAMES['M'], 'Modified'
+    if index_status == 'A':
+        return status_text + STATUS_NAMES['A'], 'Staged'
+    return status_text + "未知", ''
+
+
+STATUS_CLASSES = {a + b: _classify(a + b) for a in _STATUS_CHARS for b in _STATUS_CHARS}
+
+
+def classify(code):
+    # 返回 (显示文本, 标签)；code 为两位 porcelain 状态码
+    if len(code) == 1:
+        code = ' ' + code
+    cls = STATUS_CLASSES.get(code)
+    if cls is None:
+        cls = STATUS_CLASSES[code] = _classify(code)
+    return cls
+
+
+class StatusDiff:
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self, added=(), removed=(), changed=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class StatusModel:
+    def __init__(self):
+        self._codes = {}
+        self._paths = []
+        # 重命名 / 复制条目的原路径
+        self._origins = {}
+        self._seen = None
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        return path in self._codes
+
+    @property
+    def paths(self):
+        return self._paths
+
+    def code(self, path):
+        return self._codes.get(path)
+
+    def origin(self, path):
+        return self._origins.get(path)
+
+    def row(self, path):
+        # 视图使用的一行数据：(显示文本, 路径, 标签)
+        status_text, tag = classify(self._codes[path])
+        origin = self._origins.get(path)
+        return status_text, (f"{origin} -> {path}" if origin else path), tag
+
+    def rows(self, start, stop):
+        return [self.row(path) for path in self._paths[start:stop]]
+
+    def index(self, path):
+        i = bisect.bisect_left(self._paths, path)
+        if i < len(self._paths) and self._paths[i] == path:
+            return i
+        return -1
+
+    def clear(self):
+        diff = StatusDiff(removed=self._paths)
+        self._codes = {}
+        self._paths = []
+        self._origins = {}
+        self._seen = None
+        return diff
+
+    def apply(self, entries):
+        # entries 为 (code, path) 或 (code, path, 原路径) 序列，代表完整的新状态；
+        # 返回与旧状态的差异
+        self.begin_update()
+        diff = self.feed(entries)
+        diff.removed = self.end_update().removed
+        return diff
+
+    # ---- 流式刷新：begin_update -> 多次 feed -> end_update ----
+    def begin_update(self):
+        self._seen = set()
+
+    def feed(self, entries):
+        # 立即应用一批新增 / 变化的条目，未出现的旧条目在 end_update 时才删除
+        codes = self._codes
+        seen = self._seen
+        added = []
+        changed = []
+        for entry in entries:
+            code, path = entry[0], entry[1]
+            origin = entry[2] if len(entry) > 2 else None
+            if seen is not None:
+                seen.add(path)
+            old = codes.get(path)
+            if old is None:
+                added.append(path)
+            elif old != code or self._origins.get(path) != origin:
+                changed.append(path)
+            codes[path] = code
+            if origin:
+                self._origins[path] = origin
+            elif path in self._origins:
+                del self._origins[path]
+        if added:
+            paths = self._paths
+            if len(added) <= 64:
+                for path in added:
+                    bisect.insort(paths, path)
+            else:
+                # 两段有序序列合并，Timsort 可线性完成
+                added.sort()
+                paths.extend(added)
+                paths.sort()
+        return StatusDiff(added, (), changed)
+
+    def end_update(self):
+        seen = self._seen
+        self._seen = None
+        if seen is None:
+            return StatusDiff()
+        removed = [path for path in self._codes if path not in seen]
+        if not removed:
+            return StatusDiff()
+        for path in removed:
+            del self._codes[path]
+            self._origins.pop(path, None)
+        if len(removed) > _INCREMENTAL_LIMIT:
+            self._paths = [path for path in self._paths if path in seen]
+        else:
+            for path in removed:
+                del self._paths[bisect.bisect_left(self._paths, path)]
+        return StatusDiff(removed=removed)
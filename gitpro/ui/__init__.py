@@ -0,0 +1 @@
+# Tkinter 界面组件
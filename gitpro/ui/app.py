@@ -0,0 +1,772 @@
+import tkinter as tk
+from tkinter import ttk, simpledialog, messagebox, filedialog
+import os
+import time
+
+from gitpro.dispatch import UiDispatcher
+from gitpro.executor import GitExecutor, PRIORITY_INTERACTIVE, PRIORITY_NETWORK, DEFAULT_TIMEOUT, NETWORK_TIMEOUT
+from gitpro.branches import BranchIndex
+from gitpro.cache import RepoStateCache
+from gitpro.clone import clone_plan, run_clone
+from gitpro.diffs import MODE_LABELS, MODE_STAGED, DiffCache, available_modes, diff_fingerprint, load_diff
+from gitpro.logbuffer import LogBuffer
+from gitpro.perf import PerfRecorder, StallMonitor
+from gitpro.service import GitService, ServiceError, describe_event, head_summary, repo_name
+from gitpro.snapshot import DEFAULT_BRANCH_FALLBACK
+from gitpro.status_model import StatusModel
+from gitpro.ui.branch_picker import BranchPicker
+from gitpro.ui.clone_view import CloneDialog, CloneProgressWindow
+from gitpro.ui.diff_view import DiffView
+from gitpro.ui.history_view import HistoryWindow
+from gitpro.ui.log_view import LogView
+from gitpro.ui.perf_view import PerfWindow
+from gitpro.ui.report_view import ReportWindow
+from gitpro.ui.stage_view import SaveProgressDialog
+from gitpro.ui.status_view import VirtualStatusView
+from gitpro.ui.workspace_view import WorkspaceWindow
+from gitpro.watcher import RepoWatcher, SCOPE_BRANCHES, SCOPE_STATUS
+from gitpro.workflow import load_state
+from gitpro.workspace import Workspace, normalize_path
+
+# 界面线程每帧处理回调的时间预算（毫秒）
+UI_FRAME_BUDGET_MS = 8
+# 同时运行的 git 进程上限
+GIT_MAX_WORKERS = 4
+# 缓存分支数据的仓库数量上限
+STATE_CACHE_MAX_REPOS = 8
+# 日志窗口保留的行数；完整的会话日志写入磁盘并按大小轮转
+LOG_MAX_LINES = 1000
+LOG_SPILL_PATH = os.path.join(os.path.expanduser('~'), '.git_manager', 'logs', 'session.log')
+# 从工作区切换仓库时，可直接复用的已采集状态的最长时间（秒）
+WORKSPACE_REUSE_SECONDS = 60
+# 状态列表选择变化后加载差异的延迟（毫秒），滚动或连续按方向键时不逐个加载
+DIFF_DEBOUNCE_MS = 80
+# 读取差异期间刷新差异面板的最短间隔（秒）
+DIFF_PROGRESS_INTERVAL = 0.1
+# 加速仓库（生成提交图、前后测量耗时）的超时（秒）
+ACCELERATE_TIMEOUT = 600
+
+class GitProManager:
+    def __init__(self, root, repo_path=None):
+        self.root = root
+        self.root.title("Git Manager")
+        self.root.geometry("1200x800")
+
+        # 性能记录：git 进程、后台任务与界面回调的耗时，以及主线程卡顿
+        self.perf = PerfRecorder()
+        self.perf_window = None
+        self.dispatcher = UiDispatcher(root, budget_ms=UI_FRAME_BUDGET_MS, on_error=self._on_callback_error,
+                                       recorder=self.perf)
+        self.executor = GitExecutor(max_workers=GIT_MAX_WORKERS, recorder=self.perf)
+        self.stall_monitor = StallMonitor(root, self.perf)
+        self.state_cache = RepoStateCache(max_repos=STATE_CACHE_MAX_REPOS)
+        self.default_branch = DEFAULT_BRANCH_FALLBACK
+        self.current_repo_path = os.getcwd()
+        self.snapshot = None
+        self.branch_index = None
+        self.watcher = None
+        self.workspace = Workspace().load()
+        self.workspace_window = None
+        self.clone_parent_dir = None
+        # 最近查看的差异，按索引与工作区文件的指纹失效
+        self.diff_cache = DiffCache()
+        self._diff_target = None
+        self._diff_loading = None
+        self._diff_after = None
+
+        style = ttk.Style()
+        style.configure("TButton", padding=6, relief="flat", font=('Helvetica', 10))
+        style.configure("TLabel", padding=5, font=('Helvetica', 10))
+        style.configure("Treeview.Heading", font=('Helvetica', 10, 'bold'))
+        style.configure("TFrame", padding=10)
+
+        self.create_menu()
+
+        # 使用 PanedWindow 允许左右拖动
+        main_pane = ttk.PanedWindow(root, orient=tk.HORIZONTAL)
+        main_pane.pack(fill=tk.BOTH, expand=True)
+
+        controls_frame = ttk.LabelFrame(main_pane, text="仓库操作", width=200)
+        main_pane.add(controls_frame, weight=0)
+
+        info_area_frame = ttk.Frame(main_pane)
+        main_pane.add(info_area_frame, weight=1)
+        info_area_frame.rowconfigure(1, weight=1)
+        info_area_frame.columnconfigure(0, weight=1)
+
+        # 左侧按钮区
+        self.btn_open = ttk.Button(controls_frame, text="📂 打开仓库", command=self.open_repository)
+        self.btn_open.pack(fill=tk.X, pady=5)
+        separator_open = ttk.Separator(controls_frame, orient='horizontal')
+        separator_open.pack(fill='x', pady=10)
+
+        self.btn_clone = ttk.Button(controls_frame, text="🛰️ 克隆仓库", command=self.clone_repository)
+        self.btn_clone.pack(fill=tk.X, pady=5)
+        self.btn_workspace = ttk.Button(controls_frame, text="🗂 工作区", command=self.show_workspace)
+        self.btn_workspace.pack(fill=tk.X, pady=5)
+        separator_clone = ttk.Separator(controls_frame, orient='horizontal')
+        separator_clone.pack(fill='x', pady=10)
+
+        self.btn_new = ttk.Button(controls_frame, text="🚀 新建分支", command=self.new_branch)
+        self.btn_new.pack(fill=tk.X, pady=5)
+        self.btn_save = ttk.Button(controls_frame, text="💾 保存进度", command=self.save_progress)
+        self.btn_save.pack(fill=tk.X, pady=5)
+        self.btn_finish = ttk.Button(controls_frame, text="🎉 完成分支", command=self.finish_branch)
+        self.btn_finish.pack(fill=tk.X, pady=5)
+        self.btn_sync = ttk.Button(controls_frame, text="🔄 同步当前分支", command=self.sync_branch)
+        self.btn_sync.pack(fill=tk.X, pady=5)
+        separator = ttk.Separator(controls_frame, orient='horizontal')
+        separator.pack(fill='x', pady=20)
+        self.btn_diagnose = ttk.Button(controls_frame, text="🩺 生成诊断报告", command=self.generate_diagnostic_report)
+        self.btn_diagnose.pack(fill=tk.X, pady=5)
+        self.btn_history = ttk.Button(controls_frame, text="📜 提交历史", command=self.show_history)
+        self.btn_history.pack(fill=tk.X, pady=5)
+
+        # 仓库信息区
+        repo_info_frame = ttk.LabelFrame(info_area_frame, text="当前仓库")
+        repo_info_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        self.current_repo_label = ttk.Label(
+            repo_info_frame,
+            text="正在检测...",
+            anchor="w",
+            wraplength=900,
+            font=('Helvetica', 12, 'bold')  # 加大加粗
+        )
+        self.current_repo_label.pack(fill=tk.X, padx=5, pady=2)
+        self.refresh_info_label = ttk.Label(repo_info_frame, text="", anchor="w")
+        self.refresh_info_label.pack(fill=tk.X, padx=5)
+
+        # 状态区
+        self.status_panel_frame = status_panel_frame = ttk.LabelFrame(info_area_frame, text="工作区状态 (Git Status)")
+        status_panel_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        status_panel_frame.rowconfigure(1, weight=1)
+        status_panel_frame.columnconfigure(0, weight=1)
+
+        top_status_frame = ttk.Frame(status_panel_frame)
+        top_status_frame.grid(row=0, column=0, sticky="ew", pady=5, padx=5)
+        top_status_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(top_status_frame, text="分支:").grid(row=0, column=0, sticky="w")
+        # 输入即可筛选分支，列表只渲染可见的行
+        self.branch_picker = BranchPicker(top_status_frame, on_select=self.switch_to_branch, width=40)
+        self.branch_picker.grid(row=0, column=1, sticky="ew", padx=5)
+        self.btn_refresh_status = ttk.Button(top_status_frame, text="🔄 刷新", command=self.refresh_all_status)
+        self.btn_refresh_status.grid(row=0, column=2, sticky="e")
+        # 自动刷新：监视 .git 与工作区的变化，防抖后按范围刷新
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        self.chk_auto_refresh = ttk.Checkbutton(top_status_frame, text="👁 自动刷新", variable=self.auto_refresh_var,
+                                                command=self._toggle_auto_refresh)
+        self.chk_auto_refresh.grid(row=0, column=3, sticky="e", padx=(5, 0))
+
+        # 状态列表只为可见行创建 Treeview 条目，数据保存在 status_model 中；下方为选中文件的差异
+        status_pane = ttk.PanedWindow(status_panel_frame, orient=tk.VERTICAL)
+        status_pane.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.status_model = StatusModel()
+        self.status_view = VirtualStatusView(status_pane, self.status_model)
+        status_pane.add(self.status_view, weight=1)
+        self.status_tree = self.status_view.tree
+        self.status_tree.bind('<<TreeviewSelect>>', lambda e: self._schedule_diff(), add='+')
+        self.diff_view = DiffView(status_pane, on_mode=lambda mode: self.show_selected_diff(mode=mode),
+                                  on_expand=lambda document: self.show_selected_diff(mode=document.mode, expand=True))
+        status_pane.add(self.diff_view, weight=1)
+
+        # 日志区（可伸缩）
+        log_frame = ttk.LabelFrame(info_area_frame, text="输出日志")
+        log_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+        info_area_frame.rowconfigure(2, weight=1)  # 允许调整高度
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        self.log_buffer = LogBuffer(max_lines=LOG_MAX_LINES, spill_path=LOG_SPILL_PATH)
+        self.log_view = LogView(log_frame, self.log_buffer)
+        self.log_view.grid(row=0, column=0, sticky="nsew")
+        self.log_text = self.log_view.text
+
+        self.repo_controls = [
+            self.btn_new, self.btn_save, self.btn_finish,
+            self.btn_sync, self.btn_diagnose, self.btn_history, self.btn_refresh_status, self.branch_picker
+        ]
+
+        self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
+        self.root.after(100, self.initialize_app)
+        self.dispatcher.start()
+        self.stall_monitor.start()
+
+        self.set_current_repo(repo_path or os.getcwd())
+
+    def create_menu(self):
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+
+        # 文件菜单
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="文件", menu=file_menu)
+        file_menu.add_command(label="打开仓库...", command=self.open_repository)
+        file_menu.add_command(label="克隆仓库...", command=self.clone_repository)
+        file_menu.add_command(label="工作区...", command=self.show_workspace)
+        file_menu.add_separator()
+        file_menu.add_command(label="退出", command=self.shutdown)
+
+        # 操作菜单（功能 3）
+        action_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="操作", menu=action_menu)
+        action_menu.add_command(label="📂 打开仓库", command=self.open_repository)
+        action_menu.add_command(label="🛰️ 克隆仓库", command=self.clone_repository)
+        action_menu.add_separator()
+        action_menu.add_command(label="🚀 新建分支", command=self.new_branch)
+        action_menu.add_command(label="💾 保存进度", command=self.save_progress)
+        action_menu.add_command(label="🎉 完成分支", command=self.finish_branch)
+        action_menu.add_command(label="🔄 同步当前分支", command=self.sync_branch)
+        action_menu.add_command(label="⏯️ 继续中断的操作", command=self.resume_workflow)
+        action_menu.add_command(label="↩️ 回滚中断的操作", command=self.rollback_workflow)
+        action_menu.add_separator()
+        action_menu.add_command(label="⚡ 加速此仓库", command=self.accelerate_repo)
+        action_menu.add_command(label="🩺 生成诊断报告", command=self.generate_diagnostic_report)
+        action_menu.add_command(label="📜 提交历史", command=self.show_history)
+        action_menu.add_command(label="📈 性能", command=self.show_performance)
+
+    def set_current_repo(self, path, snapshot=None):
+        if path != self.current_repo_path:
+            # 切换仓库时取消旧仓库上排队和正在执行的命令
+            self.executor.cancel_group(self.current_repo_path)
+            self._cancel_diff(self.current_repo_path)
+            self.diff_cache.clear()
+            self._diff_target = None
+            self.diff_view.clear()
+        self._stop_watcher()
+        self.current_repo_path = path
+        self.current_repo_label.config(text=f"当前仓库路径: {self.current_repo_path}")
+        if snapshot is not None and snapshot.is_repo:
+            self._adopt_snapshot(snapshot)
+        else:
+            self.initialize_app()
+
+    def _adopt_snapshot(self, snapshot):
+        # 工作区已采集过该仓库的状态：直接显示，只在后台补充分支列表
+        self.log_message(f"使用工作区中已采集的状态: {self.current_repo_path}\n", "INFO")
+        self.status_model.begin_update()
+        self.status_model.feed([(entry.code, entry.path, entry.orig_path) for entry in snapshot.entries])
+        self._apply_snapshot(snapshot)
+        self._set_controls_enabled(True)
+        self.refresh_all_status(scopes={SCOPE_BRANCHES}, quiet=True, on_done=self._start_watcher)
+
+    def show_workspace(self):
+        if self.workspace_window is not None and self.workspace_window.winfo_exists():
+            self.workspace_window.lift()
+            return
+        self.workspace_window = WorkspaceWindow(self.root, self.workspace, self.executor, self.dispatcher,
+                                                cache=self.state_cache, on_open=self.open_from_workspace,
+                                                get_current_repo=lambda: self.current_repo_path,
+                                                on_repos_changed=self._on_repos_changed)
+
+    def _on_repos_changed(self, paths):
+        # 批量操作可能改变了当前仓库
+        if normalize_path(self.current_repo_path) in paths and self.snapshot is not None:
+            self.refresh_all_status()
+
+    def open_from_workspace(self, path):
+        if path == self.current_repo_path:
+            return
+        self.set_current_repo(path, snapshot=self.workspace.snapshot(path, max_age=WORKSPACE_REUSE_SECONDS))
+    
+    def open_repository(self):
+        repo_path = filedialog.askdirectory(title="请选择一个 Git 仓库文件夹")
+        if not repo_path:
+            return
+        # 额外健壮性：检查是否为 git 仓库
+        if not os.path.isdir(os.path.join(repo_path, '.git')):
+            if not messagebox.askyesno("提示", "此目录下未发现 .git，仍要尝试打开并检测吗？"):
+                return
+        self.set_current_repo(repo_path)
+
+    def clone_repository(self):
+        options = CloneDialog(self.root, parent_dir=self.clone_parent_dir).result
+        if options is None:
+            return
+        self.clone_parent_dir = os.path.dirname(options.target)
+        final_path = options.target
+        self.log_message(f"准备克隆 '{options.url}' 到 '{final_path}'...\n", "INFO")
+        for step in clone_plan(options):
+            self.log_message(f"▶️ {step.label}: {' '.join(step.command)}\n", "INFO")
+        self._set_controls_enabled(False)
+        group = ('clone', final_path)
+        progress = CloneProgressWindow(self.root, options.url, on_cancel=lambda: self.executor.cancel_group(group))
+        def clone_task(job):
+            # 进度已在 run_clone 中节流，其余输出行很少，逐行写入日志
+            outcome = run_clone(options, job,
+                                on_progress=lambda p: self.dispatcher.post(progress.update_progress, (p,)),
+                                on_line=lambda line: self.dispatcher.post(self.log_message, (line + "\n",)))
+            return {'stdout': '', 'stderr': outcome.message, 'returncode': outcome.returncode, 'outcome': outcome}
+        def on_clone_done(result):
+            if progress.winfo_exists():
+                progress.destroy()
+            if result.get('cancelled'):
+                self.log_message("\n⏹️ 克隆已取消\n", "INFO")
+                self._set_controls_enabled(True)
+            elif result['returncode'] == 0:
+                self.log_message("\n✅ 克隆成功！\n", "SUCCESS")
+                if messagebox.askyesno("成功", f"仓库已成功克隆到:\n{final_path}\n\n是否立即切换到该仓库进行管理？"):
+                    self.set_current_repo(final_path)
+                else:
+                    self._set_controls_enabled(True)
+            else:
+                detail = result['stderr'] or f"退出代码 {result['returncode']}"
+                self.log_message(f"\n❌ 克隆失败，{detail}\n", "ERROR")
+                self._set_controls_enabled(True)
+        # 克隆不受仓库切换影响，也不设超时
+        self.executor.submit(clone_task, on_done=lambda result: self.dispatcher.post(on_clone_done, result),
+                             group=group, priority=PRIORITY_NETWORK, network=True, timeout=None, name='clone')
+
+    def initialize_app(self):
+        self.log_message(f"正在检查目录: {self.current_repo_path}...\n", "INFO")
+        self._set_repo_controls_enabled(False)
+        self.refresh_all_status(initial=True)
+
+    def _show_not_a_repo(self):
+        self.log_message("当前目录不是一个 Git 仓库。\n", "INFO")
+        self.status_model.clear()
+        self._on_status_model_changed()
+        self.status_view.set_placeholder('⚠️', '不是一个 Git 仓库。请从“文件”菜单打开或克隆。')
+        self.branch_index = None
+        self.branch_picker.set('')
+        self.branch_picker.set_index(None)
+        self.refresh_info_label.config(text="")
+        self.btn_clone.config(state='normal')
+        self._set_repo_controls_enabled(False)
+
+    def _set_repo_controls_enabled(self, enabled: bool):
+        state = 'normal' if enabled else 'disabled'
+        for control in self.repo_controls:
+            try:
+                if isinstance(control, ttk.Combobox):
+                    # Combobox: disabled 状态下避免 set() 触发 TclError
+                    control.config(state='readonly' if enabled else 'disabled')
+                else:
+                    control.config(state=state)
+            except tk.TclError:
+                pass
+        self.root.update_idletasks()
+
+    def _set_controls_enabled(self, enabled: bool):
+        self._set_repo_controls_enabled(enabled)
+        self.btn_clone.config(state='normal' if enabled else 'disabled')
+
+    def refresh_all_status(self, on_done=None, initial=False, scopes=None, quiet=False):
+        # 一次快照刷新所有面板：status --porcelain=v2 --branch + for-each-ref。
+        # scopes 限定刷新范围（自动刷新时使用）；quiet 表示不改变按钮状态
+        with_refs = self.snapshot is None or scopes is None or SCOPE_BRANCHES in scopes
+        with_status = self.snapshot is None or scopes is None or SCOPE_STATUS in scopes
+        if not quiet:
+            self._set_controls_enabled(False)
+        repo_path = self.current_repo_path
+        if with_status:
+            self.status_model.begin_update()
+        streamed = []
+        def on_batch(entries):
+            if repo_path != self.current_repo_path:
+                return
+            streamed.append(True)
+            self.status_model.feed([(entry.code, entry.path, entry.orig_path) for entry in entries])
+            self._on_status_model_changed()
+        service = self._service(repo_path)
+        def snapshot_task(job):
+            # 状态条目边解析边显示，git 仍在扫描时即可看到结果
+            snapshot = service.snapshot(job, on_entries=lambda batch: self.dispatcher.post(on_batch, (batch,)),
+                                        with_refs=with_refs, with_status=with_status)
+            return {'stdout': '', 'stderr': snapshot.error, 'returncode': 0 if snapshot.is_repo else 128, 'snapshot': snapshot}
+        def on_snapshot(result):
+            if repo_path != self.current_repo_path or result.get('cancelled'):
+                return
+            snapshot = result.get('snapshot')
+            if snapshot is None:
+                self.log_message(f"刷新仓库状态时出错: {result['stderr']}", "ERROR")
+                if with_status:
+                    self.status_model.end_update()
+                    self._on_status_model_changed()
+                if not quiet:
+                    self._set_controls_enabled(True)
+            elif not snapshot.is_repo:
+                self.snapshot = None
+                self._show_not_a_repo()
+            else:
+                if initial:
+                    self.log_message("检测到 Git 仓库。\n", "SUCCESS")
+                    if snapshot.default_branch:
+                        self.log_message(f"检测到默认分支为: {snapshot.default_branch}\n", "INFO")
+                    else:
+                        self.log_message(f"无法检测到默认分支，将回退到 '{DEFAULT_BRANCH_FALLBACK}'。\n", "INFO")
+                    state = load_state(repo_path)
+                    if state is not None:
+                        self.log_message(f"⚠️ {state.describe()}\n可从“操作”菜单继续或回滚。\n", "ERROR")
+                if self.snapshot is not None and not (with_refs and with_status):
+                    snapshot.inherit(self.snapshot, refs=not with_refs, status=not with_status)
+                self._apply_snapshot(snapshot, status=with_status, streamed=bool(streamed))
+                if with_refs:
+                    self._refresh_branch_index()
+                if not quiet:
+                    self._set_controls_enabled(True)
+                if initial:
+                    self._start_watcher()
+            if on_done:
+                on_done()
+        self.executor.submit(snapshot_task, on_done=lambda result: self.dispatcher.post(on_snapshot, result),
+                             group=repo_path, priority=PRIORITY_INTERACTIVE,
+                             key=(repo_path, 'snapshot', with_refs, with_status), name='snapshot')
+
+    def _apply_snapshot(self, snapshot, status=True, streamed=True):
+        # streamed 为 False 表示没有逐批收到状态条目（例如结果来自合并的其他任务），此时一次性放入
+        self.snapshot = snapshot
+        if snapshot.path in self.workspace:
+            # 主窗口的刷新结果同步到工作区
+            path = self.workspace.record(snapshot.path, snapshot)
+            if self.workspace_window is not None and self.workspace_window.winfo_exists():
+                self.workspace_window.update_row(path)
+        self.default_branch = snapshot.default_branch or DEFAULT_BRANCH_FALLBACK
+        self.branch_picker.set(snapshot.head or '')
+        self.branch_picker.head = snapshot.head
+        if status:
+            if not streamed and snapshot.entries:
+                self.status_model.feed([(entry.code, entry.path, entry.orig_path) for entry in snapshot.entries])
+            self.status_model.end_update()
+            self.status_view.placeholder = ('✅ 干净', '工作区是干净的')
+            self._on_status_model_changed()
+            if self._diff_target is not None:
+                # 指纹未变的差异直接从缓存显示，变化的重新读取
+                self.show_selected_diff()
+        head_text = head_summary(snapshot)
+        stats = self.state_cache.stats()
+        self.refresh_info_label.config(
+            text=f"{head_text}    |    刷新启动 {snapshot.process_count} 个 git 进程，耗时 {snapshot.duration * 1000:.0f} ms"
+                 f"    |    分支缓存 命中 {stats['hits']} / 未命中 {stats['misses']}")
+
+    def _toggle_auto_refresh(self):
+        if self.auto_refresh_var.get():
+            self._start_watcher()
+        else:
+            self._stop_watcher()
+            self.log_message("已关闭自动刷新。\n", "INFO")
+
+    def _start_watcher(self):
+        self._stop_watcher()
+        if not self.auto_refresh_var.get() or self.snapshot is None:
+            return
+        repo_path = self.current_repo_path
+        try:
+            watcher = RepoWatcher(repo_path, on_change=lambda scopes: self.dispatcher.post(self._on_repo_changed, (repo_path, scopes)))
+            backend = watcher.start()
+        except (ValueError, OSError) as e:
+            self.log_message(f"无法开启自动刷新: {e}\n", "ERROR")
+            return
+        self.watcher = watcher
+        self.log_message(f"已开启自动刷新（{'inotify' if backend == 'inotify' else '定时轮询'}）。\n", "INFO")
+
+    def shutdown(self):
+        # 关闭主窗口：停止后台任务，写完会话日志后退出
+        self._stop_watcher()
+        self.stall_monitor.stop()
+        self.dispatcher.stop()
+        self.executor.shutdown()
+        self.log_buffer.close()
+        self.root.destroy()
+
+    def _stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def _on_repo_changed(self, repo_path, scopes):
+        if repo_path != self.current_repo_path or self.watcher is None:
+            return
+        self.refresh_all_status(scopes=scopes, quiet=True)
+
+    def _on_status_model_changed(self):
+        count = len(self.status_model)
+        title = "工作区状态 (Git Status)"
+        self.status_panel_frame.config(text=f"{title} — {count} 项" if count else title)
+        self.status_view.render()
+
+    def _schedule_diff(self):
+        if self._diff_after is not None:
+            self.root.after_cancel(self._diff_after)
+        self._diff_after = self.root.after(DIFF_DEBOUNCE_MS, self.show_selected_diff)
+
+    def _cancel_diff(self, repo_path):
+        self._diff_loading = None
+        self.executor.cancel_group(('diff', repo_path))
+
+    def show_selected_diff(self, mode=None, expand=False):
+        # 只选中一个文件时在差异面板中显示它的差异；读取在后台进行，边读边显示
+        self._diff_after = None
+        repo_path = self.current_repo_path
+        paths = self.status_view.selected_paths()
+        if len(paths) != 1:
+            self._diff_target = None
+            self._cancel_diff(repo_path)
+            if paths:
+                self.diff_view.show_message(f"已选中 {len(paths)} 项", "选中单个文件以查看差异。")
+            else:
+                self.diff_view.clear()
+            return
+        path = paths[0]
+        code = self.status_model.code(path)
+        modes = available_modes(code) if code and not path.endswith('/') else []
+        if not modes:
+            self._diff_target = None
+            self._cancel_diff(repo_path)
+            message = "未跟踪的目录，展开后选择其中的文件查看差异。" if path.endswith('/') else "没有可显示的差异。"
+            self.diff_view.show_message(path, message)
+            return
+        if mode not in modes:
+            previous = self._diff_target
+            mode = previous[2] if previous and previous[1] == path and previous[2] in modes else modes[0]
+        target = (repo_path, path, mode)
+        title = f"{path}（{MODE_LABELS[mode]}）"
+        cached = self.diff_cache.get(target, diff_fingerprint(repo_path, path))
+        if cached is not None and not (expand and cached.collapsed):
+            self._diff_target = target
+            self.diff_view.show(title, cached, modes, mode)
+            return
+        if target == self._diff_target and target == self._diff_loading and not expand:
+            # 同一个文件正在读取
+            return
+        self._cancel_diff(repo_path)
+        self._diff_target = self._diff_loading = target
+        self.diff_view.show(title, None, modes, mode)
+        # 重命名只记录在索引中，已暂存的差异需要同时给出原路径
+        origin = self.status_model.origin(path) if mode == MODE_STAGED else None
+        last_post = [0.0]
+        def on_progress(document):
+            now = time.monotonic()
+            if now - last_post[0] >= DIFF_PROGRESS_INTERVAL:
+                last_post[0] = now
+                self.dispatcher.post(on_diff_progress, document)
+        def on_diff_progress(document):
+            if self._diff_target != target:
+                return
+            if self.diff_view.document is not document:
+                self.diff_view.show(title, document, modes, mode)
+            else:
+                self.diff_view.update_progress()
+        def diff_task(job):
+            document = load_diff(repo_path, mode, path, origin, job, expand=expand, on_progress=on_progress)
+            return {'stdout': '', 'stderr': document.error, 'returncode': 0, 'document': document}
+        def on_diff(result):
+            if self._diff_loading == target:
+                self._diff_loading = None
+            document = result.get('document')
+            if result.get('cancelled'):
+                if document is not None:
+                    document.close()
+                return
+            if document is not None:
+                self.diff_cache.put(target, document)
+            if self._diff_target != target:
+                return
+            if document is None:
+                self.diff_view.show_message(title, f"读取差异失败: {result['stderr']}")
+            else:
+                self.diff_view.show(title, document, modes, mode)
+        self.executor.submit(diff_task, on_done=lambda result: self.dispatcher.post(on_diff, result),
+                             group=('diff', repo_path), priority=PRIORITY_INTERACTIVE, name='diff')
+
+    def _refresh_branch_index(self):
+        # 分支索引在后台增量更新：只重新读取变化过的引用
+        repo_path = self.current_repo_path
+        if self.branch_index is None or self.branch_index.path != repo_path:
+            self.branch_index = BranchIndex(repo_path)
+        index = self.branch_index
+        def index_task(job):
+            try:
+                changes = index.refresh(job)
+            except ValueError as e:
+                return {'stdout': '', 'stderr': str(e), 'returncode': 1}
+            return {'stdout': '', 'stderr': '', 'returncode': 0, 'changes': changes}
+        def on_index(result):
+            if index is not self.branch_index or result.get('cancelled'):
+                return
+            if result['returncode'] != 0:
+                self.log_message(f"读取分支列表时出错: {result['stderr']}\n", "ERROR")
+                return
+            head = self.snapshot.head if self.snapshot is not None else None
+            self.branch_picker.set_index(index, head)
+        self.executor.submit(index_task, on_done=lambda result: self.dispatcher.post(on_index, result),
+                             group=repo_path, priority=PRIORITY_INTERACTIVE, key=(repo_path, 'branch_index'),
+                             name='branch_index')
+
+    def switch_to_branch(self, branch):
+        if self.snapshot is None:
+            self.log_message("无法确定当前分支以防止切换。", "ERROR")
+            return
+        current_branch = self.snapshot.head
+        if branch.name == current_branch:
+            return
+        # 远程分支：已有同名本地分支时切换过去，否则显式 --track 该远程分支；
+        # 多个远程有同名分支时 git switch <名称> 无法确定跟踪哪一个
+        local = self.branch_index.get(branch.short_name) if branch.remote and self.branch_index else None
+        if not branch.remote or local is not None:
+            target, track = branch.short_name, False
+        else:
+            target, track = branch.name, True
+        if messagebox.askyesno("确认切换", f"您确定要切换到分支 '{branch.name}' 吗？\n请确保您当前的工作已保存。"):
+            self._set_controls_enabled(False)
+            self.run_operation('switch_branch', lambda service, job: service.switch_branch(target, job=job, track=track))
+
+    def _service(self, repo_path=None):
+        repo_path = repo_path or self.current_repo_path
+        name = repo_name(repo_path)
+        return GitService(repo_path, on_event=lambda event: self.dispatcher.post(self._on_service_event, (name, event)),
+                          cache=self.state_cache)
+
+    def _on_service_event(self, name, event):
+        message, tag = describe_event(event, name)
+        self.log_message(message, tag)
+
+    def run_operation(self, name, operation, on_done=None, network=True, timeout=None):
+        # operation(service, job) 在工作线程中执行整个工作流并返回 OperationResult；
+        # 全部步骤结束后在界面线程调用一次 on_done(outcome)，未提供时刷新状态
+        repo_path = self.current_repo_path
+        service = self._service(repo_path)
+        def task(job):
+            return {'stdout': '', 'stderr': '', 'returncode': 0, 'outcome': operation(service, job)}
+        def on_result(result):
+            outcome = result.get('outcome')
+            if result.get('cancelled'):
+                self.log_message("⏹️ 操作已取消\n", "INFO")
+            elif outcome is None:
+                self.log_message(f"❌ 操作失败: {result['stderr']}\n", "ERROR")
+            if repo_path != self.current_repo_path:
+                return
+            if outcome is not None and outcome.interrupted:
+                self._on_interrupted(outcome)
+            if on_done and outcome is not None:
+                on_done(outcome)
+            else:
+                self.refresh_all_status()
+        self.executor.submit(task, on_done=lambda result: self.dispatcher.post(on_result, result), group=repo_path,
+                             priority=PRIORITY_NETWORK if network else PRIORITY_INTERACTIVE, network=network,
+                             timeout=timeout or (NETWORK_TIMEOUT if network else DEFAULT_TIMEOUT), name=name)
+
+    def _on_interrupted(self, outcome):
+        state = load_state(self.current_repo_path)
+        if state is None:
+            return
+        self.log_message(f"⚠️ {state.describe()}\n", "ERROR")
+        if state.published:
+            return
+        if messagebox.askyesno("操作中断", f"{state.describe()}\n\n是否立即回滚到操作开始前的状态？\n"
+                                       f"选择“否”可在解决问题后从“操作”菜单选择“继续中断的操作”。"):
+            self.rollback_workflow(confirm=False)
+
+    def resume_workflow(self):
+        state = load_state(self.current_repo_path)
+        if state is None:
+            messagebox.showinfo("信息", "没有未完成的操作。")
+            return
+        if messagebox.askyesno("继续操作", f"{state.describe()}\n\n是否从停下的步骤继续执行？"):
+            self._set_controls_enabled(False)
+            self.run_operation('resume_workflow', lambda service, job: service.resume_workflow(job=job))
+
+    def rollback_workflow(self, confirm=True):
+        state = load_state(self.current_repo_path)
+        if state is None:
+            messagebox.showinfo("信息", "没有未完成的操作。")
+            return
+        if confirm and not messagebox.askyesno("回滚操作", f"{state.describe()}\n\n是否放弃该操作并恢复到开始前的状态？"):
+            return
+        self._set_controls_enabled(False)
+        self.run_operation('rollback_workflow', lambda service, job: service.rollback_workflow(job=job),
+                           network=False)
+
+    def _on_callback_error(self, callback, e):
+        name = getattr(callback, '__name__', repr(callback))
+        print(f"执行回调 {name} 时出错: {e}")
+        try:
+            self.log_message(f"严重：回调 '{name}' 中出错: {e}", "ERROR")
+        except Exception as log_e:
+            print(f"甚至无法记录回调错误: {log_e}")
+
+    def log_message(self, message, tag=None):
+        # 只写入缓冲区，控件每帧批量刷新一次
+        self.log_buffer.append(message, tag)
+        self.log_view.schedule_flush()
+
+    def new_branch(self):
+        branch_name = simpledialog.askstring("新建分支", "请输入新分支的名称:")
+        if branch_name:
+            self._set_controls_enabled(False)
+            self.run_operation('new_branch', lambda service, job: service.new_branch(branch_name, job=job))
+
+    def save_progress(self):
+        self.refresh_all_status(on_done=self._save_progress_step2)
+
+    def _save_progress_step2(self):
+        # 是否干净、要暂存哪些文件都由已解析的状态决定，不读取列表控件
+        if self.snapshot is None:
+            return
+        if self.snapshot.is_clean:
+            messagebox.showinfo("信息", "工作区是干净的。无需保存。")
+            return
+        result = SaveProgressDialog(self.root, self.snapshot.dirty_count, self.status_view.selected_paths()).result
+        if result is None:
+            return
+        commit_message, selectors, include_large = result
+        self._set_controls_enabled(False)
+        snapshot = self.snapshot
+        self.run_operation('save_progress', lambda service, job: service.save_progress(
+            commit_message, snapshot=snapshot, job=job, selectors=selectors, include_large=include_large))
+
+    def sync_branch(self):
+        self._set_controls_enabled(False)
+        self.run_operation('sync_branch', lambda service, job: service.sync_branch(job=job))
+
+    def finish_branch(self):
+        try:
+            current_branch, default_branch = self._service().finish_target(self.snapshot)
+        except ServiceError as e:
+            messagebox.showerror("错误", str(e))
+            return
+        if messagebox.askyesno("确认完成", f"这将会把 '{current_branch}' 合并到 '{default_branch}'。\n您确定要继续吗？"):
+            self._set_controls_enabled(False)
+            def on_finished(outcome):
+                if outcome.ok and messagebox.askyesno("清理", f"合并成功！是否删除本地和远程分支 '{current_branch}'？"):
+                    self.run_operation('delete_branch', lambda service, job: service.delete_branch(current_branch, job=job))
+                else:
+                    self.refresh_all_status()
+            self.run_operation('finish_branch', lambda service, job: service.finish_branch(current_branch, default_branch, job=job),
+                               on_done=on_finished)
+
+    def accelerate_repo(self):
+        if not messagebox.askyesno("加速此仓库", "将检查并启用 git 的加速设置（未跟踪文件缓存、feature.manyFiles、"
+                                             "文件系统监视、提交图、多包索引），并在前后测量 status 与 log --graph 的耗时。\n"
+                                             "这会修改该仓库的 .git/config。是否继续？"):
+            return
+        self._set_controls_enabled(False)
+        def on_accelerated(outcome):
+            if outcome.message:
+                self.log_message(f"⚡ 加速结果：\n{outcome.message}\n", "SUCCESS" if outcome.ok else "ERROR")
+            if outcome.ok:
+                messagebox.showinfo("加速此仓库", outcome.message)
+            self.refresh_all_status()
+        self.run_operation('accelerate', lambda service, job: service.accelerate(job=job), on_done=on_accelerated,
+                           network=False, timeout=ACCELERATE_TIMEOUT)
+
+    def show_history(self):
+        if not self.current_repo_path:
+            return
+        HistoryWindow(self.root, self.current_repo_path, self.executor, self.dispatcher)
+
+    def show_performance(self):
+        if self.perf_window is not None and self.perf_window.winfo_exists():
+            self.perf_window.lift()
+            return
+        self.perf_window = PerfWindow(self.root, self.perf)
+
+    def generate_diagnostic_report(self):
+        # 每个报告窗口独立执行并保存自己的结果，关闭窗口即取消未完成的部分
+        ReportWindow(self.root, self.current_repo_path, self.executor, self.dispatcher)
+
+
+def run(repo_path=None):
+    root = tk.Tk()
+    app = GitProManager(root, repo_path=repo_path)
+    root.mainloop()
+    return 0
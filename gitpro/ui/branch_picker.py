@@ -0,0 +1,236 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from gitpro.branches import describe_branch
+
+# 可输入筛选的分支选择器：输入框显示当前分支，输入时弹出结果列表。
+# 列表只有固定数量的行，滚动时改写这些行的内容，分支再多也只渲染可见部分。
+
+POPUP_ROWS = 12
+# 输入框失去焦点后关闭弹出列表的延迟（毫秒），留出点击列表的时间
+CLOSE_DELAY_MS = 150
+COLUMNS = [('name', '分支', 260), ('info', '上游', 200), ('date', '最后提交', 90)]
+_ROW_PREFIX = 'r'
+
+
+class BranchPicker(ttk.Frame):
+    def __init__(self, parent, on_select=None, width=40):
+        super().__init__(parent, padding=0)
+        self.on_select = on_select
+        self.index = None
+        self.head = None
+        self.results = []
+        self.offset = 0
+        self.cursor = 0
+        self.search_ms = 0.0
+        self._text = ''
+        self._setting = False
+        self._close_job = None
+        self.columnconfigure(0, weight=1)
+
+        self.var = tk.StringVar()
+        self.entry = ttk.Entry(self, textvariable=self.var, width=width)
+        self.entry.grid(row=0, column=0, sticky="ew")
+        self.var.trace_add('write', lambda *args: self._on_text_changed())
+        self.entry.bind('<Down>', lambda e: self._move(1))
+        self.entry.bind('<Up>', lambda e: self._move(-1))
+        self.entry.bind('<Next>', lambda e: self._move(POPUP_ROWS))
+        self.entry.bind('<Prior>', lambda e: self._move(-POPUP_ROWS))
+        self.entry.bind('<Return>', lambda e: self._choose())
+        self.entry.bind('<Escape>', lambda e: self._restore())
+        self.entry.bind('<FocusIn>', lambda e: self.entry.select_range(0, tk.END))
+        self.entry.bind('<FocusOut>', lambda e: self._schedule_close())
+
+        self.popup = None
+        self.tree = None
+
+    # ---- 对外接口 ----
+    def set_index(self, index, head=None):
+        self.index = index
+        self.head = head
+        if index is None:
+            self.close()
+        elif self.is_open():
+            self._search()
+
+    def set(self, text):
+        # 显示当前分支，不触发搜索；正在输入时只更新 Escape 恢复的内容
+        self._text = text
+        if self.is_open():
+            return
+        self._setting = True
+        try:
+            self.var.set(text)
+        finally:
+            self._setting = False
+
+    def get(self):
+        return self.var.get()
+
+    def configure(self, cnf=None, **kw):
+        # 仓库按钮统一用 config(state=...) 启用 / 禁用
+        if 'state' in kw:
+            state = kw.pop('state')
+            self.entry.config(state=state)
+            if state == 'disabled':
+                self.close()
+        if cnf or kw:
+            return super().configure(cnf, **kw)
+
+    config = configure
+
+    def is_open(self):
+        return self.popup is not None and self.popup.winfo_exists() and self.popup.winfo_ismapped()
+
+    def close(self):
+        if self.popup is not None and self.popup.winfo_exists():
+            self.popup.withdraw()
+
+    # ---- 弹出列表 ----
+    def _build_popup(self):
+        self.popup = tk.Toplevel(self)
+        self.popup.withdraw()
+        self.popup.overrideredirect(True)
+        frame = ttk.Frame(self.popup, padding=1, relief='solid')
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.rowconfigure(0, weight=1)
+        frame.columnconfigure(0, weight=1)
+        self.tree = ttk.Treeview(frame, columns=[c[0] for c in COLUMNS], show='headings', selectmode='browse',
+                                 height=POPUP_ROWS)
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor='w', stretch=column == 'name')
+        self.tree.tag_configure('Local', foreground='dark green')
+        self.tree.tag_configure('Remote', foreground='gray25')
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.count_label = ttk.Label(frame, text="", foreground='gray', padding=(4, 1))
+        self.count_label.grid(row=1, column=0, columnspan=2, sticky="w")
+        # 行对象只创建一次，之后只改写内容
+        for i in range(POPUP_ROWS):
+            self.tree.insert('', tk.END, iid=f"{_ROW_PREFIX}{i}")
+        self.tree.bind('<ButtonRelease-1>', self._on_click)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_by(3))
+
+    def _open(self):
+        if self.popup is None or not self.popup.winfo_exists():
+            self._build_popup()
+        if not self.popup.winfo_ismapped():
+            x = self.entry.winfo_rootx()
+            y = self.entry.winfo_rooty() + self.entry.winfo_height()
+            self.popup.geometry(f"+{x}+{y}")
+            self.popup.deiconify()
+            self.popup.lift()
+
+    def _schedule_close(self):
+        if self._close_job is not None:
+            self.after_cancel(self._close_job)
+        self._close_job = self.after(CLOSE_DELAY_MS, self._close_on_focus_out)
+
+    def _close_on_focus_out(self):
+        self._close_job = None
+        if self.focus_get() is not self.entry:
+            self.close()
+            self.set(self._text)
+
+    def _on_text_changed(self):
+        if self._setting or str(self.entry.cget('state')) == 'disabled':
+            return
+        self._search()
+
+    def _search(self):
+        if self.index is None:
+            return
+        query = self.var.get()
+        # 输入框仍是当前分支名时列出全部分支
+        started = time.perf_counter()
+        self.results = self.index.search('' if query == self._text else query)
+        self.search_ms = (time.perf_counter() - started) * 1000
+        self.offset = 0
+        self.cursor = 0
+        self._open()
+        self.render()
+
+    def render(self):
+        if self.tree is None:
+            return
+        total = len(self.results)
+        self.offset = max(0, min(self.offset, total - POPUP_ROWS))
+        for i in range(POPUP_ROWS):
+            iid = f"{_ROW_PREFIX}{i}"
+            position = self.offset + i
+            if position < total:
+                branch = self.results[position]
+                date = time.strftime('%Y-%m-%d', time.localtime(branch.date)) if branch.date else ''
+                self.tree.item(iid, values=(branch.name, describe_branch(branch, self.head), date),
+                               tags=('Remote' if branch.remote else 'Local',))
+            else:
+                self.tree.item(iid, values=('', '', ''), tags=())
+        selected = f"{_ROW_PREFIX}{self.cursor - self.offset}" if total else ''
+        self.tree.selection_set((selected,) if selected else ())
+        self.scrollbar.set(self.offset / total if total else 0.0,
+                           min(1.0, (self.offset + POPUP_ROWS) / total) if total else 1.0)
+        self.count_label.config(text=f"{total} / {len(self.index)} 个分支，搜索用时 {self.search_ms:.1f} ms"
+                                if self.index is not None else "")
+
+    def _move(self, delta):
+        if not self.is_open():
+            self._search()
+            return "break"
+        total = len(self.results)
+        if not total:
+            return "break"
+        self.cursor = max(0, min(total - 1, self.cursor + delta))
+        if self.cursor < self.offset:
+            self.offset = self.cursor
+        elif self.cursor >= self.offset + POPUP_ROWS:
+            self.offset = self.cursor - POPUP_ROWS + 1
+        self.render()
+        return "break"
+
+    def _scroll_by(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.results) - POPUP_ROWS))
+        self.cursor = max(self.offset, min(self.cursor, self.offset + POPUP_ROWS - 1, len(self.results) - 1))
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.offset = int(float(value) * len(self.results))
+        elif action == 'scroll':
+            self.offset += int(value) * (POPUP_ROWS if unit == 'pages' else 1)
+        self._scroll_by(0)
+
+    def _on_mousewheel(self, event):
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-steps * 3)
+
+    def _on_click(self, event):
+        row = self.tree.identify_row(event.y)
+        if not row.startswith(_ROW_PREFIX):
+            return
+        position = self.offset + int(row[len(_ROW_PREFIX):])
+        if position < len(self.results):
+            self.cursor = position
+            self._choose()
+
+    def _choose(self):
+        if not self.is_open() or not self.results:
+            return "break"
+        branch = self.results[self.cursor]
+        self.close()
+        self.set(self._text)
+        self.entry.icursor(tk.END)
+        if self.on_select is not None:
+            self.on_select(branch)
+        return "break"
+
+    def _restore(self):
+        self.close()
+        self.set(self._text)
+        self.entry.icursor(tk.END)
+        return "break"
@@ -0,0 +1,88 @@
+import tkinter as tk
+from tkinter import ttk
+
+from gitpro.bulk import (BulkRun, OUTCOME_CANCELLED, OUTCOME_CONFLICT, OUTCOME_FAILED, OUTCOME_SKIPPED,
+                         OUTCOME_UPDATED, STATE_DONE, STATE_LABELS, outcome_label)
+
+# 批量操作进度窗口：每个仓库一行，显示状态、尝试次数与耗时；
+# 全部结束后显示汇总，可复制完整报告。关闭窗口时取消尚未完成的仓库。
+
+COLUMNS = [('name', '仓库', 160), ('state', '状态', 90), ('attempts', '尝试', 50), ('duration', '耗时 (s)', 70),
+           ('message', '说明', 380)]
+OUTCOME_TAGS = {OUTCOME_UPDATED: 'Updated', OUTCOME_CONFLICT: 'Conflict', OUTCOME_FAILED: 'Failed',
+                OUTCOME_SKIPPED: 'Skipped', OUTCOME_CANCELLED: 'Skipped'}
+
+
+class BulkWindow(tk.Toplevel):
+    def __init__(self, master, executor, dispatcher, operation, paths, settings, on_finished=None):
+        super().__init__(master)
+        self.dispatcher = dispatcher
+        self.on_finished = on_finished
+        self.run = BulkRun(executor, operation, paths,
+                           on_progress=lambda item: dispatcher.post(self._on_item, item),
+                           on_finished=lambda run: dispatcher.post(self._on_finished, run), **settings)
+        self.title(f"批量{self.run.label}")
+        self.geometry("780x420")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        top = ttk.Frame(self, padding=5)
+        top.pack(fill=tk.X)
+        self.progress = ttk.Progressbar(top, mode='determinate', maximum=max(1, len(self.run.items)))
+        self.progress.pack(fill=tk.X)
+        self.summary_label = ttk.Label(top, text=self.run.summary(), anchor="w")
+        self.summary_label.pack(fill=tk.X)
+
+        body = ttk.Frame(self, padding=(5, 0, 5, 0))
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in COLUMNS], show='headings')
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor='e' if column in ('attempts', 'duration') else 'w')
+        self.tree.tag_configure('Updated', foreground='green')
+        self.tree.tag_configure('Conflict', foreground='dark orange')
+        self.tree.tag_configure('Failed', foreground='red')
+        self.tree.tag_configure('Skipped', foreground='gray')
+        scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        buttons = ttk.Frame(self, padding=5)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="关闭", command=self.close).pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="复制报告", command=self.copy_report).pack(side=tk.RIGHT, padx=5)
+        self.cancel_button = ttk.Button(buttons, text="取消", command=self.run.cancel)
+        self.cancel_button.pack(side=tk.RIGHT)
+
+        for item in self.run.items:
+            self.tree.insert('', tk.END, iid=item.path, values=self._values(item))
+        self.run.start()
+
+    def _values(self, item):
+        state = outcome_label(item.outcome, self.run.operation) if item.state == STATE_DONE else STATE_LABELS[item.state]
+        duration = f"{item.duration:.1f}" if item.duration else ''
+        return (item.name, state, item.attempts or '', duration, item.message)
+
+    def _on_item(self, item):
+        if not self.winfo_exists():
+            return
+        tag = OUTCOME_TAGS.get(item.outcome, '') if item.state == STATE_DONE else ''
+        self.tree.item(item.path, values=self._values(item), tags=(tag,))
+        self.progress['value'] = sum(1 for i in self.run.items if i.state == STATE_DONE)
+        self.summary_label.config(text=self.run.summary())
+
+    def _on_finished(self, run):
+        if self.on_finished is not None:
+            self.on_finished(run)
+        if not self.winfo_exists():
+            return
+        self.cancel_button.config(state=tk.DISABLED)
+        self.summary_label.config(text=f"{run.summary()}    用时 {run.elapsed:.1f} 秒")
+
+    def copy_report(self):
+        self.clipboard_clear()
+        self.clipboard_append(self.run.report_text())
+
+    def close(self):
+        self.run.cancel()
+        self.destroy()
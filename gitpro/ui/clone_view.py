@@ -0,0 +1,171 @@
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from gitpro.clone import FILTERS, CloneOptions, repo_name_from_url
+from gitpro.service import ServiceError
+
+# 克隆对话框（URL、目标目录与快速克隆选项）和克隆进度窗口。
+
+
+class CloneDialog(tk.Toplevel):
+    def __init__(self, master, parent_dir=None):
+        super().__init__(master)
+        self.result = None
+        self.title("克隆仓库")
+        self.resizable(False, False)
+        self.transient(master)
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+        self.url_var = tk.StringVar()
+        self.parent_var = tk.StringVar(value=parent_dir or os.getcwd())
+        self.name_var = tk.StringVar()
+        self.branch_var = tk.StringVar()
+        self.shallow_var = tk.BooleanVar(value=False)
+        self.depth_var = tk.IntVar(value=1)
+        self.filter_var = tk.StringVar(value=FILTERS[''])
+        self.sparse_var = tk.StringVar()
+        self.cache_var = tk.BooleanVar(value=False)
+        self._name_edited = False
+
+        form = ttk.Frame(self, padding=10)
+        form.pack(fill=tk.BOTH, expand=True)
+        form.columnconfigure(1, weight=1)
+        ttk.Label(form, text="远程 URL").grid(row=0, column=0, sticky='w')
+        url_entry = ttk.Entry(form, textvariable=self.url_var, width=56)
+        url_entry.grid(row=0, column=1, columnspan=2, sticky='we')
+        ttk.Label(form, text="存放目录").grid(row=1, column=0, sticky='w')
+        ttk.Entry(form, textvariable=self.parent_var).grid(row=1, column=1, sticky='we')
+        ttk.Button(form, text="浏览...", command=self._browse).grid(row=1, column=2, padx=(5, 0))
+        ttk.Label(form, text="目录名").grid(row=2, column=0, sticky='w')
+        name_entry = ttk.Entry(form, textvariable=self.name_var)
+        name_entry.grid(row=2, column=1, columnspan=2, sticky='we')
+        ttk.Label(form, text="分支（可选）").grid(row=3, column=0, sticky='w')
+        ttk.Entry(form, textvariable=self.branch_var).grid(row=3, column=1, columnspan=2, sticky='we')
+
+        options = ttk.LabelFrame(form, text="快速克隆", padding=8)
+        options.grid(row=4, column=0, columnspan=3, sticky='we', pady=(10, 0))
+        shallow = ttk.Frame(options, padding=0)
+        shallow.pack(fill=tk.X)
+        ttk.Checkbutton(shallow, text="浅克隆，只获取最近", variable=self.shallow_var,
+                        command=self._update_state).pack(side=tk.LEFT)
+        self.depth_spin = ttk.Spinbox(shallow, from_=1, to=100000, textvariable=self.depth_var, width=7)
+        self.depth_spin.pack(side=tk.LEFT, padx=5)
+        ttk.Label(shallow, text="个提交", padding=0).pack(side=tk.LEFT)
+        partial = ttk.Frame(options, padding=(0, 5, 0, 0))
+        partial.pack(fill=tk.X)
+        ttk.Label(partial, text="部分克隆", padding=0).pack(side=tk.LEFT)
+        self.filter_combo = ttk.Combobox(partial, textvariable=self.filter_var, values=list(FILTERS.values()),
+                                         state='readonly', width=32)
+        self.filter_combo.pack(side=tk.LEFT, padx=5)
+        self.filter_combo.bind('<<ComboboxSelected>>', lambda e: self._update_state())
+        sparse = ttk.Frame(options, padding=(0, 5, 0, 0))
+        sparse.pack(fill=tk.X)
+        ttk.Label(sparse, text="只检出目录", padding=0).pack(side=tk.LEFT)
+        ttk.Entry(sparse, textvariable=self.sparse_var, width=40).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        ttk.Label(options, text="多个目录用空格分隔，留空检出全部文件", foreground='gray', padding=0).pack(anchor='w')
+        self.cache_check = ttk.Checkbutton(options, text="使用本地对象缓存（反复克隆同一仓库时只下载新增的对象）",
+                                           variable=self.cache_var, command=self._update_state)
+        self.cache_check.pack(anchor='w', pady=(5, 0))
+
+        buttons = ttk.Frame(self, padding=(10, 0, 10, 10))
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="取消", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="克隆", command=self._ok).pack(side=tk.RIGHT, padx=5)
+
+        self.url_var.trace_add('write', lambda *args: self._on_url_changed())
+        name_entry.bind('<Key>', lambda e: setattr(self, '_name_edited', True))
+        self.bind('<Return>', lambda e: self._ok())
+        self.bind('<Escape>', lambda e: self.destroy())
+        self._update_state()
+        url_entry.focus_set()
+        self.grab_set()
+        self.wait_window()
+
+    def _on_url_changed(self):
+        if not self._name_edited:
+            self.name_var.set(repo_name_from_url(self.url_var.get().strip()))
+
+    def _browse(self):
+        path = filedialog.askdirectory(parent=self, title="请选择一个文件夹来存放克隆的仓库")
+        if path:
+            self.parent_var.set(path)
+
+    def _selected_filter(self):
+        labels = {label: key for key, label in FILTERS.items()}
+        return labels.get(self.filter_var.get(), '')
+
+    def _update_state(self):
+        # 对象缓存只用于完整克隆
+        self.depth_spin.config(state=tk.NORMAL if self.shallow_var.get() else tk.DISABLED)
+        partial = self.shallow_var.get() or self._selected_filter()
+        self.cache_check.config(state=tk.DISABLED if partial else tk.NORMAL)
+        if partial:
+            self.cache_var.set(False)
+
+    def _ok(self):
+        url = self.url_var.get().strip()
+        name = self.name_var.get().strip() or repo_name_from_url(url)
+        try:
+            depth = int(self.depth_var.get()) if self.shallow_var.get() else None
+        except (tk.TclError, ValueError):
+            messagebox.showerror("错误", "克隆深度必须是整数", parent=self)
+            return
+        options = CloneOptions(url=url, target=os.path.join(self.parent_var.get().strip(), name), depth=depth,
+                               filter=self._selected_filter(), sparse=self.sparse_var.get().split(),
+                               use_cache=self.cache_var.get(), branch=self.branch_var.get().strip() or None)
+        try:
+            self.result = options.validate()
+        except ServiceError as e:
+            messagebox.showerror("错误", str(e), parent=self)
+            return
+        self.destroy()
+
+
+class CloneProgressWindow(tk.Toplevel):
+    def __init__(self, master, url, on_cancel=None):
+        super().__init__(master)
+        self.title("正在克隆")
+        self.geometry("520x150")
+        self.resizable(False, False)
+        self.transient(master)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.on_cancel = on_cancel
+
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text=url, foreground='gray', padding=0).pack(anchor='w')
+        self.step_label = ttk.Label(frame, text="准备中...", padding=(0, 5))
+        self.step_label.pack(anchor='w')
+        self.bar = ttk.Progressbar(frame, mode='determinate', maximum=100)
+        self.bar.pack(fill=tk.X)
+        self.detail_label = ttk.Label(frame, text="", padding=(0, 5))
+        self.detail_label.pack(anchor='w')
+        self.cancel_button = ttk.Button(frame, text="取消", command=self.cancel)
+        self.cancel_button.pack(side=tk.RIGHT)
+
+    def update_progress(self, progress):
+        if not self.winfo_exists():
+            return
+        step = f"步骤 {progress.step}/{progress.steps}：{progress.label}" if progress.steps > 1 else progress.label
+        self.step_label.config(text=step)
+        if not progress.phase:
+            self.bar.config(mode='indeterminate')
+            self.bar.start(15)
+            self.detail_label.config(text="")
+            return
+        if str(self.bar.cget('mode')) != 'determinate':
+            self.bar.stop()
+            self.bar.config(mode='determinate')
+        self.bar['value'] = progress.percent
+        detail = f"{progress.phase} {progress.percent}% ({progress.done}/{progress.total})"
+        if progress.size:
+            detail += f"  {progress.size}"
+        if progress.rate:
+            detail += f"  {progress.rate}"
+        self.detail_label.config(text=detail)
+
+    def cancel(self):
+        self.cancel_button.config(state=tk.DISABLED, text="正在取消...")
+        if self.on_cancel:
+            self.on_cancel()
@@ -0,0 +1,211 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+from gitpro.diffs import KIND_BINARY, KIND_GENERATED, MODE_LABELS
+
+# 差异面板：Text 控件中只保留可见的几十行，滚动时从 DiffDocument 读取对应的行重新填充，
+# 滚动条按文档的总行数计算。读取过程中文档不断变长，视图只在可见区域受影响时重绘。
+
+# 可见区域之外多读取的行数
+RENDER_MARGIN = 2
+
+
+class DiffView(ttk.Frame):
+    def __init__(self, parent, on_mode=None, on_expand=None):
+        super().__init__(parent, padding=0)
+        self.on_mode = on_mode
+        self.on_expand = on_expand
+        self.document = None
+        self.offset = 0
+        self._rendered = None
+        self._message = ''
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        toolbar = ttk.Frame(self, padding=0)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 3))
+        toolbar.columnconfigure(0, weight=1)
+        self.title_label = ttk.Label(toolbar, text="选择一个文件查看差异", padding=0, anchor='w')
+        self.title_label.grid(row=0, column=0, sticky="ew")
+        self.mode_var = tk.StringVar()
+        self._mode_by_label = {label: mode for mode, label in MODE_LABELS.items()}
+        self.mode_combobox = ttk.Combobox(toolbar, state="readonly", width=8, textvariable=self.mode_var)
+        self.mode_combobox.bind("<<ComboboxSelected>>", lambda e: self._on_mode_selected())
+        self.expand_button = ttk.Button(toolbar, text="仍然显示", command=self._on_expand)
+        ttk.Button(toolbar, text="▲ 上一处", command=lambda: self.jump_hunk(-1)).grid(row=0, column=3, padx=(5, 0))
+        ttk.Button(toolbar, text="▼ 下一处", command=lambda: self.jump_hunk(1)).grid(row=0, column=4, padx=(5, 0))
+
+        font = tkfont.nametofont('TkFixedFont')
+        self.line_height = max(1, font.metrics('linespace'))
+        self.text = tk.Text(self, wrap=tk.NONE, height=12, font=font, state='disabled', cursor='arrow')
+        self.text.grid(row=1, column=0, sticky="nsew")
+        self.text.tag_configure('add', foreground='dark green', background='#eaffea')
+        self.text.tag_configure('del', foreground='dark red', background='#ffecec')
+        self.text.tag_configure('hunk', foreground='blue')
+        self.text.tag_configure('header', foreground='gray25', font=(font.actual('family'), font.actual('size'), 'bold'))
+        self.text.tag_configure('note', foreground='gray')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        xscrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        xscrollbar.grid(row=2, column=0, sticky="ew")
+        self.text.config(xscrollcommand=xscrollbar.set)
+        self.info_label = ttk.Label(self, text="", foreground='gray', padding=(0, 2))
+        self.info_label.grid(row=3, column=0, columnspan=2, sticky="w")
+
+        self.text.bind('<Configure>', lambda e: self.render(force=True))
+        self.text.bind('<MouseWheel>', self._on_mousewheel)
+        self.text.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.text.bind('<Button-5>', lambda e: self._scroll_by(3))
+        self.text.bind('<Button-1>', lambda e: self.text.focus_set())
+        self.text.bind('<Up>', lambda e: self._scroll_by(-1))
+        self.text.bind('<Down>', lambda e: self._scroll_by(1))
+        self.text.bind('<Prior>', lambda e: self._scroll_by(-self.visible_rows()))
+        self.text.bind('<Next>', lambda e: self._scroll_by(self.visible_rows()))
+        self.text.bind('<Home>', lambda e: self._scroll_to(0))
+        self.text.bind('<End>', lambda e: self._scroll_to(self._total()))
+
+    # ---- 对外接口 ----
+    def show(self, title, document=None, modes=(), mode=None):
+        # 显示新的文档；document 为 None 时只显示标题（正在读取）
+        same = document is not None and document is self.document
+        self.document = document
+        if not same:
+            self.offset = 0
+        self._message = ''
+        self.title_label.config(text=title)
+        if len(modes) > 1:
+            self.mode_combobox.config(values=[MODE_LABELS[m] for m in modes])
+            self.mode_var.set(MODE_LABELS.get(mode, ''))
+            self.mode_combobox.grid(row=0, column=1, padx=(5, 0))
+        else:
+            self.mode_combobox.grid_remove()
+        self.expand_button.grid_remove()
+        self.render(force=True)
+
+    def show_message(self, title, message):
+        self.document = None
+        self.offset = 0
+        self._message = message
+        self.title_label.config(text=title)
+        self.mode_combobox.grid_remove()
+        self.expand_button.grid_remove()
+        self.render(force=True)
+
+    def clear(self):
+        self.show_message("选择一个文件查看差异", '')
+
+    def update_progress(self):
+        # 读取过程中调用：只有可见区域还没填满时才重绘文本，否则只更新滚动条与统计
+        if self.document is not None:
+            self.render()
+
+    def visible_rows(self):
+        height = self.text.winfo_height()
+        if height <= 1:
+            height = int(self.text.cget('height')) * self.line_height
+        return max(1, height // self.line_height)
+
+    def jump_hunk(self, direction):
+        if self.document is None:
+            return
+        line = self.document.next_hunk(self.offset, direction)
+        if line is not None:
+            self._scroll_to(line)
+
+    def render(self, force=False):
+        document = self.document
+        rows = self.visible_rows()
+        total = self._total()
+        self.offset = max(0, min(self.offset, total - rows))
+        window = (id(document), self.offset, min(total, self.offset + rows + RENDER_MARGIN),
+                  document.complete if document else self._message)
+        if force or window != self._rendered:
+            self._fill(document)
+            self._rendered = window
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.info_label.config(text=self._info(document))
+
+    # ---- 内部实现 ----
+    def _total(self):
+        return self.document.line_count if self.document is not None else 0
+
+    def _fill(self, document):
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        if document is None:
+            if self._message:
+                self.text.insert('1.0', self._message, ('note',))
+        elif document.collapsed:
+            self._fill_collapsed(document)
+        elif document.complete and not document.line_count:
+            self.text.insert('1.0', document.error or "没有差异（可能只改变了文件模式或行尾）", ('note',))
+        else:
+            lines = document.lines(self.offset, self.visible_rows() + RENDER_MARGIN)
+            for line in lines:
+                self.text.insert(tk.END, line + '\n', (_line_tag(line),))
+        self.text.config(state='disabled')
+
+    def _fill_collapsed(self, document):
+        info = document.info
+        if info.kind == KIND_BINARY:
+            text = "二进制文件，不显示差异。"
+        else:
+            text = f"{info.reason}，差异已折叠（+{info.added} -{info.deleted} 行）。"
+            if info.kind == KIND_GENERATED and self.on_expand is not None:
+                self.expand_button.grid(row=0, column=2, padx=(5, 0))
+        self.text.insert('1.0', text, ('note',))
+
+    def _info(self, document):
+        if document is None or document.collapsed:
+            return ""
+        state = "" if document.complete else "，正在读取..."
+        info = document.info
+        return (f"+{info.added} -{info.deleted}    第 {self.offset + 1} 行 / 共 {document.line_count} 行，"
+                f"{len(document.hunks)} 处改动{state}")
+
+    def _scroll_to(self, line):
+        self.offset = max(0, line)
+        self.render()
+        return "break"
+
+    def _scroll_by(self, rows):
+        return self._scroll_to(self.offset + rows)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(value) * self._total()))
+        elif action == 'scroll':
+            step = self.visible_rows() if unit == 'pages' else 1
+            self._scroll_by(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows 上 delta 为 120 的倍数，macOS 上为较小的整数
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-steps * 3)
+
+    def _on_mode_selected(self):
+        mode = self._mode_by_label.get(self.mode_var.get())
+        if mode is not None and self.on_mode is not None:
+            self.on_mode(mode)
+
+    def _on_expand(self):
+        self.expand_button.grid_remove()
+        if self.document is not None and self.on_expand is not None:
+            self.on_expand(self.document)
+
+
+def _line_tag(line):
+    if line.startswith(('+++ ', '--- ', 'diff ', 'index ', 'new file', 'deleted file', 'similarity', 'rename ',
+                        'old mode', 'new mode', 'Binary files')):
+        return 'header'
+    if line.startswith('@@'):
+        return 'hunk'
+    if line.startswith('+'):
+        return 'add'
+    if line.startswith('-'):
+        return 'del'
+    return ''
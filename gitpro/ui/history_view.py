@@ -0,0 +1,267 @@
+import os
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from gitpro.executor import DEFAULT_TIMEOUT, PRIORITY_INTERACTIVE, PRIORITY_NORMAL
+from gitpro.history import PAGE_SIZE, HistoryModel
+
+# 提交历史窗口：在 Canvas 上只绘制可见的行，滚动接近末尾时在后台读取下一页。
+
+ROW_HEIGHT = 22
+LANE_WIDTH = 14
+NODE_RADIUS = 4
+LANE_COLORS = ['#1f77b4', '#d62728', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2', '#17becf']
+# 跳转目标不在已加载范围内时，最多继续读取的页数；仍找不到则从该提交开始重新加载
+JUMP_SEARCH_PAGES = 20
+
+
+def _lane_x(column):
+    return 10 + column * LANE_WIDTH
+
+
+def _lane_color(column):
+    return LANE_COLORS[column % len(LANE_COLORS)]
+
+
+class HistoryWindow(tk.Toplevel):
+    def __init__(self, master, repo_path, executor, dispatcher):
+        super().__init__(master)
+        self.repo_path = repo_path
+        self.executor = executor
+        self.dispatcher = dispatcher
+        self.model = None
+        self.offset = 0
+        self.selected = None
+        self._fetching = False
+        self._jump_target = None
+        self._jump_pages = 0
+        self.title(f"提交历史 - {os.path.basename(repo_path)}")
+        self.geometry("1000x650")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self, padding=5)
+        toolbar.pack(fill=tk.X)
+        ttk.Label(toolbar, text="作者:", padding=0).pack(side=tk.LEFT)
+        self.author_var = tk.StringVar()
+        ttk.Entry(toolbar, textvariable=self.author_var, width=16).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(toolbar, text="路径（多个用 ; 分隔）:", padding=0).pack(side=tk.LEFT)
+        self.path_var = tk.StringVar()
+        ttk.Entry(toolbar, textvariable=self.path_var, width=24).pack(side=tk.LEFT, padx=(2, 8))
+        self.all_refs_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="全部分支", variable=self.all_refs_var).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="应用筛选", command=self.apply_filters).pack(side=tk.LEFT, padx=8)
+        ttk.Button(toolbar, text="跳转", command=self.jump).pack(side=tk.RIGHT)
+        self.jump_var = tk.StringVar()
+        jump_entry = ttk.Entry(toolbar, textvariable=self.jump_var, width=20)
+        jump_entry.pack(side=tk.RIGHT, padx=2)
+        jump_entry.bind('<Return>', lambda e: self.jump())
+        ttk.Label(toolbar, text="跳转到分支 / 标签 / 提交:", padding=0).pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self, padding=0)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(body, background='white', highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.status_label = ttk.Label(self, text="", anchor="w")
+        self.status_label.pack(fill=tk.X)
+
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Double-Button-1>', self._on_double_click)
+        self.bind('<Prior>', lambda e: self.scroll_by(-self.visible_rows()))
+        self.bind('<Next>', lambda e: self.scroll_by(self.visible_rows()))
+        self.bind('<Up>', lambda e: self.scroll_by(-1))
+        self.bind('<Down>', lambda e: self.scroll_by(1))
+
+        self.load()
+
+    # ---- 数据加载 ----
+    def load(self, revisions=None):
+        if self.model is not None:
+            self.model.close()
+        paths = [p.strip() for p in self.path_var.get().split(';') if p.strip()]
+        self.model = HistoryModel(self.repo_path, revisions=revisions, author=self.author_var.get().strip() or None,
+                                  paths=paths or None, all_refs=self.all_refs_var.get())
+        self.offset = 0
+        self.selected = None
+        self._fetching = False
+        self.request_page()
+        self.redraw()
+
+    def apply_filters(self):
+        self._jump_target = None
+        self.load()
+
+    def request_page(self):
+        model = self.model
+        if self._fetching or model.exhausted:
+            return
+        self._fetching = True
+        def task(job):
+            started = time.perf_counter()
+            rows = model.fetch(PAGE_SIZE, job)
+            return {'stdout': '', 'stderr': model.stream.error, 'returncode': 0,
+                    'rows': rows, 'duration': time.perf_counter() - started}
+        # git log 进程挂在当前页的任务上：关闭窗口取消任务组即结束进程，每页读取受超时约束
+        self.executor.submit(task, on_done=lambda result: self.dispatcher.post(self._on_page, (model, result)),
+                             group=('history', id(self)), priority=PRIORITY_NORMAL, timeout=DEFAULT_TIMEOUT,
+                             name='history_page')
+
+    def _on_page(self, model, result):
+        if model is not self.model or not self.winfo_exists():
+            return
+        self._fetching = False
+        rows = result.get('rows')
+        if rows is None:
+            self.status_label.config(text=f"读取提交历史失败: {result.get('stderr', '')}")
+            return
+        model.extend(rows)
+        if self._jump_target is not None:
+            self._continue_jump()
+        state = "已全部加载" if model.exhausted else f"已加载（本页 {result['duration'] * 1000:.0f} ms）"
+        error = f"    {model.stream.error}" if model.stream.error else ""
+        self.status_label.config(text=f"{len(model)} 个提交，{state}{error}")
+        self.redraw()
+
+    # ---- 跳转 ----
+    def jump(self):
+        ref = self.jump_var.get().strip()
+        if not ref:
+            return
+        def on_resolved(result):
+            if result.get('cancelled'):
+                return
+            if result['returncode'] != 0:
+                self.dispatcher.post(self.status_label.config, {'text': f"无法解析 '{ref}': {result['stderr'].strip()}"})
+                return
+            self.dispatcher.post(self._start_jump, (result['stdout'].strip(),))
+        self.executor.run_command(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], cwd=self.repo_path,
+                                  on_done=on_resolved, group=('history', id(self)), priority=PRIORITY_INTERACTIVE)
+
+    def _start_jump(self, oid):
+        if not self.winfo_exists():
+            return
+        self._jump_target = oid
+        self._jump_pages = 0
+        self._continue_jump()
+
+    def _continue_jump(self):
+        oid = self._jump_target
+        index = self.model.find(oid)
+        if index >= 0:
+            self._jump_target = None
+            self.selected = index
+            self.offset = max(0, index - self.visible_rows() // 3)
+            self.redraw()
+            return
+        if self.model.exhausted or self._jump_pages >= JUMP_SEARCH_PAGES:
+            # 已加载范围内找不到：以该提交为起点重新加载
+            self._jump_target = None
+            self.load(revisions=[oid])
+            self.selected = 0
+            return
+        self._jump_pages += 1
+        self.request_page()
+
+    # ---- 绘制 ----
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // ROW_HEIGHT)
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete('all')
+        model = self.model
+        rows = self.visible_rows()
+        total = len(model)
+        self.offset = max(0, min(self.offset, max(0, total - rows)))
+        if not model.exhausted and self.offset + rows * 2 > total:
+            self.request_page()
+        visible = model.rows[self.offset:self.offset + rows + 1]
+        graph_width = max([row.width for row in visible] + [1])
+        text_x = _lane_x(graph_width) + 6
+        canvas_width = canvas.winfo_width()
+        for n, row in enumerate(visible):
+            top = n * ROW_HEIGHT
+            mid = top + ROW_HEIGHT // 2
+            bottom = top + ROW_HEIGHT
+            if self.offset + n == self.selected:
+                canvas.create_rectangle(0, top, canvas_width, bottom, fill='#dbe9ff', outline='')
+            x = _lane_x(row.column)
+            for lane in row.passing:
+                canvas.create_line(_lane_x(lane), top, _lane_x(lane), bottom, fill=_lane_color(lane), width=2)
+            for lane in row.joins:
+                canvas.create_line(_lane_x(lane), top, x, mid, fill=_lane_color(lane), width=2)
+            for lane in row.forks:
+                canvas.create_line(x, mid, _lane_x(lane), bottom, fill=_lane_color(lane), width=2)
+            canvas.create_oval(x - NODE_RADIUS, mid - NODE_RADIUS, x + NODE_RADIUS, mid + NODE_RADIUS,
+                               fill=_lane_color(row.column), outline='black')
+            commit = row.commit
+            cursor = canvas.create_text(text_x, mid, text=commit.oid[:8], anchor='w', fill='gray40', font=('Courier', 9))
+            cursor_x = canvas.bbox(cursor)[2] + 8
+            if commit.refs:
+                refs = canvas.create_text(cursor_x, mid, text=f"[{commit.refs}]", anchor='w', fill='dark green',
+                                          font=('Helvetica', 9, 'bold'))
+                cursor_x = canvas.bbox(refs)[2] + 6
+            canvas.create_text(cursor_x, mid, text=commit.subject, anchor='w', font=('Helvetica', 10))
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(commit.timestamp))
+            canvas.create_text(canvas_width - 8, mid, text=f"{commit.author}  {when}", anchor='e', fill='gray30',
+                               font=('Helvetica', 9))
+        # 总长度未知时按“已加载 + 一页”估算滚动条范围
+        estimated = total + (0 if model.exhausted else PAGE_SIZE)
+        if estimated:
+            self.scrollbar.set(self.offset / estimated, min(1.0, (self.offset + rows) / estimated))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # ---- 交互 ----
+    def scroll_by(self, rows):
+        self.offset = max(0, self.offset + rows)
+        self.redraw()
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            estimated = len(self.model) + (0 if self.model.exhausted else PAGE_SIZE)
+            self.offset = int(float(value) * estimated)
+        elif action == 'scroll':
+            step = self.visible_rows() if unit == 'pages' else 1
+            self.offset += int(value) * step
+        self.offset = max(0, self.offset)
+        self.redraw()
+
+    def _on_mousewheel(self, event):
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_by(-steps * 3)
+
+    def _row_at(self, y):
+        index = self.offset + int(self.canvas.canvasy(y)) // ROW_HEIGHT
+        return index if index < len(self.model) else None
+
+    def _on_click(self, event):
+        self.selected = self._row_at(event.y)
+        if self.selected is not None:
+            commit = self.model.rows[self.selected].commit
+            parents = ' '.join(p[:8] for p in commit.parents)
+            self.status_label.config(text=f"{commit.oid}    父提交: {parents or '无'}    {commit.subject}")
+        self.redraw()
+
+    def _on_double_click(self, event):
+        index = self._row_at(event.y)
+        if index is None:
+            return
+        oid = self.model.rows[index].commit.oid
+        self.clipboard_clear()
+        self.clipboard_append(oid)
+        self.status_label.config(text=f"已复制提交号: {oid}")
+
+    def close(self):
+        self._jump_target = None
+        if self.model is not None:
+            self.model.close()
+        self.executor.cancel_group(('history', id(self)))
+        self.destroy()
@@ -0,0 +1,124 @@
+import re
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+
+from gitpro.logbuffer import DEFAULT_TAG
+
+# 输出日志控件：消息先进入 LogBuffer，控件每帧最多刷新一次、批量插入，
+# 超出容量时按块裁剪；支持在缓冲区上搜索和按类型筛选。
+
+ALL_TAGS_LABEL = '全部'
+TAG_LABELS = {'INFO': '信息', 'SUCCESS': '成功', 'ERROR': '错误', DEFAULT_TAG: '命令输出'}
+
+
+class LogView(ttk.Frame):
+    def __init__(self, parent, buffer, flush_ms=16, trim_block=200):
+        super().__init__(parent, padding=0)
+        self.buffer = buffer
+        self.flush_ms = flush_ms
+        self.trim_block = trim_block
+        self._flush_id = None
+        self._widget_lines = 0
+        self._filter_text = ''
+        self._filter_tag = None
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        toolbar = ttk.Frame(self, padding=0)
+        toolbar.grid(row=0, column=0, sticky="ew", pady=(0, 3))
+        toolbar.columnconfigure(1, weight=1)
+        ttk.Label(toolbar, text="搜索:", padding=0).grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, sticky="ew", padx=5)
+        search_entry.bind('<Return>', lambda e: self.apply_filter())
+        ttk.Label(toolbar, text="类型:", padding=0).grid(row=0, column=2, sticky="w")
+        self._tag_by_label = {label: tag for tag, label in TAG_LABELS.items()}
+        self.tag_combobox = ttk.Combobox(toolbar, state="readonly", width=10,
+                                         values=[ALL_TAGS_LABEL] + list(TAG_LABELS.values()))
+        self.tag_combobox.set(ALL_TAGS_LABEL)
+        self.tag_combobox.grid(row=0, column=3, padx=5)
+        self.tag_combobox.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        ttk.Button(toolbar, text="筛选", command=self.apply_filter).grid(row=0, column=4)
+        ttk.Button(toolbar, text="清除", command=self.clear_filter).grid(row=0, column=5, padx=(5, 0))
+
+        self.text = scrolledtext.ScrolledText(self, wrap=tk.WORD, height=10, state='disabled')
+        self.text.grid(row=1, column=0, sticky="nsew")
+        self.text.tag_configure('SUCCESS', foreground='dark green')
+        self.text.tag_configure('ERROR', foreground='red')
+
+    def schedule_flush(self):
+        if self._flush_id is None:
+            self._flush_id = self.after(self.flush_ms, self.flush)
+
+    def flush(self):
+        self._flush_id = None
+        segments, reset = self.buffer.drain()
+        if self._filter_active():
+            if reset:
+                self._render(self._filtered_segments())
+                return
+            segments = [item for item in segments if self._matches(item)]
+        if reset:
+            self._render(segments)
+        elif segments:
+            self._insert(segments)
+
+    def apply_filter(self):
+        self._filter_text = self.search_var.get()
+        self._filter_tag = self._tag_by_label.get(self.tag_combobox.get())
+        self.buffer.drain()
+        self._render(self._filtered_segments() if self._filter_active() else self.buffer.segments())
+
+    def clear_filter(self):
+        self.search_var.set('')
+        self.tag_combobox.set(ALL_TAGS_LABEL)
+        self.apply_filter()
+
+    def _filter_active(self):
+        return bool(self._filter_text) or self._filter_tag is not None
+
+    def _filtered_segments(self):
+        if self._filter_text:
+            return self.buffer.search(self._filter_text, tag=self._filter_tag)
+        return self.buffer.segments(self._filter_tag)
+
+    def _matches(self, item):
+        text, tag = item
+        if self._filter_tag is not None and tag != self._filter_tag:
+            return False
+        return not self._filter_text or re.search(re.escape(self._filter_text), text, re.IGNORECASE) is not None
+
+    def _render(self, segments):
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self._widget_lines = 0
+        self.text.config(state='disabled')
+        if segments:
+            self._insert(segments, force_scroll=True)
+
+    def _insert(self, segments, force_scroll=False):
+        at_bottom = force_scroll or self.text.yview()[1] >= 0.999
+        # 相邻同类型的片段合并，一次 insert 调用插入整批内容
+        args = []
+        last_tag = None
+        chunk = []
+        for text, tag in segments:
+            if tag != last_tag and chunk:
+                args.extend((''.join(chunk), last_tag))
+                chunk = []
+            chunk.append(text)
+            last_tag = tag
+            self._widget_lines += text.count('\n')
+        if chunk:
+            args.extend((''.join(chunk), last_tag))
+        self.text.config(state='normal')
+        self.text.insert(tk.END, *args)
+        # 超过容量一个块以上时才裁剪，避免每条消息都删除首行
+        excess = self._widget_lines - self.buffer.max_lines
+        if excess > self.trim_block:
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self._widget_lines -= excess
+        self.text.config(state='disabled')
+        if at_bottom:
+            self.text.see(tk.END)
@@ -0,0 +1,110 @@
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from gitpro.units import format_size
+
+# 性能窗口：按命令类型、后台任务和界面回调显示 p50 / p95，列出最近的主线程卡顿，
+# 打开期间每秒刷新一次，可导出为 JSON。
+
+REFRESH_MS = 1000
+
+COMMAND_COLUMNS = [('kind', '命令', 140), ('count', '次数', 60), ('p50_ms', 'p50 (ms)', 80), ('p95_ms', 'p95 (ms)', 80),
+                   ('max_ms', '最大 (ms)', 80), ('stdout', '输出总量', 90), ('failures', '失败', 60)]
+JOB_COLUMNS = [('name', '任务', 220), ('count', '次数', 60), ('p50_ms', 'p50 (ms)', 80), ('p95_ms', 'p95 (ms)', 80),
+               ('wait_p95_ms', '排队 p95 (ms)', 100), ('processes', '进程数', 70), ('failures', '失败', 60)]
+CALLBACK_COLUMNS = [('name', '回调', 300), ('count', '次数', 60), ('p50_ms', 'p50 (ms)', 80), ('p95_ms', 'p95 (ms)', 80),
+                    ('max_ms', '最大 (ms)', 80), ('latency_p95_ms', '延迟 p95 (ms)', 100)]
+STALL_COLUMNS = [('time', '时间', 90), ('duration', '时长 (ms)', 90), ('cause', '原因', 520)]
+
+
+class PerfWindow(tk.Toplevel):
+    def __init__(self, master, recorder):
+        super().__init__(master)
+        self.recorder = recorder
+        self._after_id = None
+        self.title("性能")
+        self.geometry("820x480")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self, padding=5)
+        toolbar.pack(fill=tk.X)
+        ttk.Button(toolbar, text="导出 JSON...", command=self.export).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="清空", command=self.clear).pack(side=tk.LEFT, padx=5)
+        self.summary_label = ttk.Label(toolbar, text="", anchor="w")
+        self.summary_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.command_tree = self._add_table(notebook, "git 命令", COMMAND_COLUMNS)
+        self.job_tree = self._add_table(notebook, "后台任务", JOB_COLUMNS)
+        self.callback_tree = self._add_table(notebook, "界面回调", CALLBACK_COLUMNS)
+        self.stall_tree = self._add_table(notebook, "卡顿", STALL_COLUMNS)
+        self.refresh()
+
+    def _add_table(self, notebook, title, columns):
+        frame = ttk.Frame(notebook, padding=0)
+        notebook.add(frame, text=title)
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show='headings')
+        for column, heading, width in columns:
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor='w' if column in ('kind', 'name', 'cause', 'time') else 'e')
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        return tree
+
+    def _fill(self, tree, rows):
+        # 行数很少，整体替换即可
+        tree.delete(*tree.get_children())
+        for values in rows:
+            tree.insert('', tk.END, values=values)
+
+    def refresh(self):
+        self._after_id = None
+        commands = self.recorder.command_stats()
+        self._fill(self.command_tree, [
+            (kind, s['count'], s['p50_ms'], s['p95_ms'], s['max_ms'], format_size(s['stdout_bytes']), s['failures'])
+            for kind, s in sorted(commands.items(), key=lambda item: -item[1]['total_ms'])])
+        jobs = self.recorder.job_stats()
+        self._fill(self.job_tree, [
+            (name, s['count'], s['p50_ms'], s['p95_ms'], s['wait_p95_ms'], s['processes'], s['failures'])
+            for name, s in sorted(jobs.items(), key=lambda item: -item[1]['total_ms'])])
+        callbacks = self.recorder.callback_stats()
+        self._fill(self.callback_tree, [
+            (name, s['count'], s['p50_ms'], s['p95_ms'], s['max_ms'], s['latency_p95_ms'])
+            for name, s in sorted(callbacks.items(), key=lambda item: -item[1]['max_ms'])])
+        stalls = self.recorder.stalls()
+        self._fill(self.stall_tree, [
+            (time.strftime('%H:%M:%S', time.localtime(stall.started)), f"{stall.duration * 1000:.0f}", stall.cause)
+            for stall in reversed(stalls)])
+        processes = sum(s['count'] for s in commands.values())
+        self.summary_label.config(
+            text=f"git 进程 {processes} 个    卡顿 {len(stalls)} 次（阈值 {self.recorder.stall_ms} ms）")
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self, title="导出性能数据", defaultextension=".json",
+                                            initialfile=f"git_manager_perf_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self.recorder.export_json(path)
+        except OSError as e:
+            messagebox.showerror("错误", f"导出失败: {e}", parent=self)
+            return
+        messagebox.showinfo("完成", f"性能数据已导出到:\n{path}", parent=self)
+
+    def clear(self):
+        self.recorder.reset()
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self.refresh()
+
+    def close(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self.destroy()
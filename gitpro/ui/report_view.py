@@ -0,0 +1,115 @@
+import os
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+
+from gitpro.executor import PRIORITY_INTERACTIVE
+from gitpro.report import SECTION_TIMEOUT, DiagnosticReport, failed_outcome, run_section
+
+# 诊断报告窗口：各部分并行执行，输出到达即插入各自的位置（每部分一个 Text 标记），
+# 部分结束后追加耗时与大小。每个窗口有自己的 DiagnosticReport 与任务组，关闭窗口即取消未完成的部分。
+
+
+class ReportWindow(tk.Toplevel):
+    def __init__(self, master, repo_path, executor, dispatcher):
+        super().__init__(master)
+        self.repo_path = repo_path
+        self.executor = executor
+        self.dispatcher = dispatcher
+        self.report = DiagnosticReport(repo_path)
+        self.group = ('report', id(self))
+        self.closed = False
+        # 各部分开始执行的时间，取消或超时的部分据此计算耗时
+        self._started = {}
+        self.title(f"诊断报告 - {os.path.basename(os.path.normpath(repo_path))}")
+        self.geometry("800x560")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.text = scrolledtext.ScrolledText(self, wrap=tk.WORD, font=('Courier', 10))
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        self.text.tag_configure('header', font=('Courier', 10, 'bold'))
+        self.text.tag_configure('footer', foreground='gray')
+        self.text.tag_configure('failed', foreground='red')
+
+        bottom = ttk.Frame(self, padding=(10, 0, 10, 10))
+        bottom.pack(fill=tk.X)
+        self.status_label = ttk.Label(bottom, text="", padding=0)
+        self.status_label.pack(side=tk.LEFT)
+        ttk.Button(bottom, text="关闭", command=self.close).pack(side=tk.RIGHT)
+        ttk.Button(bottom, text="导出...", command=self.export).pack(side=tk.RIGHT, padx=5)
+
+        self.text.insert(tk.END, self.report.header(), ('header',))
+        for index, section in enumerate(self.report.sections):
+            self.text.insert(tk.END, section.header(), ('header',))
+            self.text.insert(tk.END, "\n")
+            # 该部分的输出插入在分隔的空行之前的标记处，标记随插入的内容后移
+            self.text.mark_set(self._mark(index), tk.END + '-2c')
+            self.text.mark_gravity(self._mark(index), tk.RIGHT)
+        self.text.config(state='disabled')
+        self._update_status()
+        self._start()
+
+    def _mark(self, index):
+        return f"section{index}"
+
+    def _start(self):
+        for index, spec in enumerate(self.report.specs):
+            def section_task(job, i=index, s=spec):
+                self._started[i] = time.perf_counter()
+                outcome = run_section(self.repo_path, s, job,
+                                      on_chunk=lambda text: self.dispatcher.post(self._on_chunk, (i, text)))
+                return {'stdout': '', 'stderr': '', 'returncode': 0, 'outcome': outcome}
+            def on_section(result, i=index):
+                self._on_section_done(i, result)
+            self.executor.submit(section_task, on_done=lambda result, cb=on_section: self.dispatcher.post(cb, result),
+                                 group=self.group, priority=PRIORITY_INTERACTIVE, timeout=SECTION_TIMEOUT,
+                                 name='report_section')
+
+    def _insert(self, index, text, tags=()):
+        self.text.config(state='normal')
+        self.text.insert(self._mark(index), text, tags)
+        self.text.config(state='disabled')
+
+    def _on_chunk(self, index, text):
+        if self.closed:
+            return
+        self.report.feed(index, text)
+        self._insert(index, text)
+
+    def _on_section_done(self, index, result):
+        if self.closed:
+            return
+        started = self._started.get(index)
+        outcome = result.get('outcome') or failed_outcome(result, time.perf_counter() - started if started else 0.0)
+        self.report.finish(index, outcome)
+        failed = outcome.returncode != 0 and not outcome.truncated
+        self._insert(index, self.report.sections[index].footer().rstrip('\n') + '\n', ('failed' if failed else 'footer',))
+        self._update_status()
+
+    def _update_status(self):
+        done = self.report.finished_count
+        total = len(self.report.sections)
+        if done < total:
+            text = f"正在生成... {done}/{total} 部分已完成"
+        else:
+            text = f"诊断报告已生成，用时 {time.time() - self.report.started:.1f} 秒"
+        self.status_label.config(text=text)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self, title="导出诊断报告", defaultextension=".txt.gz",
+                                            initialfile=f"git_manager_report_{time.strftime('%Y%m%d_%H%M%S')}.txt.gz",
+                                            filetypes=[("gzip 压缩文本", "*.gz"), ("文本", "*.txt")])
+        if not path:
+            return
+        try:
+            self.report.export(path)
+        except OSError as e:
+            messagebox.showerror("错误", f"导出失败: {e}", parent=self)
+            return
+        note = "" if self.report.complete else "\n（报告尚未完成，未完成的部分已标记）"
+        messagebox.showinfo("完成", f"诊断报告已导出到:\n{path}{note}", parent=self)
+
+    def close(self):
+        self.closed = True
+        self.executor.cancel_group(self.group)
+        self.destroy()
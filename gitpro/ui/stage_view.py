@@ -0,0 +1,88 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from gitpro.staging import LARGE_FILE_THRESHOLD
+from gitpro.units import format_size
+
+# 保存进度对话框：提交信息、要提交的范围（全部改动 / 列表中选中的条目 / 路径或通配符）
+# 以及是否包含大文件。结果为 (提交信息, 选择项或 None, 是否包含大文件)。
+
+SCOPE_ALL = 'all'
+SCOPE_SELECTED = 'selected'
+SCOPE_PATTERNS = 'patterns'
+
+
+class SaveProgressDialog(tk.Toplevel):
+    def __init__(self, master, total, selected=()):
+        super().__init__(master)
+        self.result = None
+        self.selected = list(selected)
+        self.title("保存进度")
+        self.resizable(False, False)
+        self.transient(master)
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+        self.message_var = tk.StringVar()
+        self.scope_var = tk.StringVar(value=SCOPE_SELECTED if self.selected else SCOPE_ALL)
+        self.patterns_var = tk.StringVar()
+        self.large_var = tk.BooleanVar(value=False)
+
+        form = ttk.Frame(self, padding=10)
+        form.pack(fill=tk.BOTH, expand=True)
+        form.columnconfigure(0, weight=1)
+        ttk.Label(form, text="提交信息", padding=0).grid(row=0, column=0, sticky='w')
+        message_entry = ttk.Entry(form, textvariable=self.message_var, width=60)
+        message_entry.grid(row=1, column=0, sticky='we', pady=(2, 8))
+
+        scope = ttk.LabelFrame(form, text="提交范围", padding=8)
+        scope.grid(row=2, column=0, sticky='we')
+        scope.columnconfigure(1, weight=1)
+        ttk.Radiobutton(scope, text=f"全部改动（{total} 项）", value=SCOPE_ALL, variable=self.scope_var,
+                        command=self._update_state).grid(row=0, column=0, columnspan=2, sticky='w')
+        selected_button = ttk.Radiobutton(scope, text=f"列表中选中的 {len(self.selected)} 项", value=SCOPE_SELECTED,
+                                          variable=self.scope_var, command=self._update_state)
+        selected_button.grid(row=1, column=0, columnspan=2, sticky='w')
+        if not self.selected:
+            selected_button.config(state=tk.DISABLED)
+        ttk.Radiobutton(scope, text="路径或通配符", value=SCOPE_PATTERNS, variable=self.scope_var,
+                        command=self._update_state).grid(row=2, column=0, sticky='w')
+        self.patterns_entry = ttk.Entry(scope, textvariable=self.patterns_var)
+        self.patterns_entry.grid(row=2, column=1, sticky='we', padx=(5, 0))
+        ttk.Label(scope, text="多个用空格分隔，例如：src/ docs/*.md README.md", foreground='gray',
+                  padding=0).grid(row=3, column=1, sticky='w', padx=(5, 0))
+        ttk.Checkbutton(form, text=f"包含超过 {format_size(LARGE_FILE_THRESHOLD)} 的大文件（默认跳过）",
+                        variable=self.large_var).grid(row=3, column=0, sticky='w', pady=(8, 0))
+        ttk.Label(form, text="已暂存的改动总会包含在提交中", foreground='gray', padding=0).grid(row=4, column=0, sticky='w')
+
+        buttons = ttk.Frame(self, padding=(10, 0, 10, 10))
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="取消", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="提交并推送", command=self._ok).pack(side=tk.RIGHT, padx=5)
+
+        self.bind('<Return>', lambda e: self._ok())
+        self.bind('<Escape>', lambda e: self.destroy())
+        self._update_state()
+        message_entry.focus_set()
+        self.grab_set()
+        self.wait_window()
+
+    def _update_state(self):
+        self.patterns_entry.config(state=tk.NORMAL if self.scope_var.get() == SCOPE_PATTERNS else tk.DISABLED)
+
+    def _ok(self):
+        message = self.message_var.get().strip()
+        if not message:
+            messagebox.showerror("错误", "请输入提交信息", parent=self)
+            return
+        scope = self.scope_var.get()
+        if scope == SCOPE_SELECTED:
+            selectors = self.selected
+        elif scope == SCOPE_PATTERNS:
+            selectors = self.patterns_var.get().split()
+            if not selectors:
+                messagebox.showerror("错误", "请输入要提交的路径或通配符", parent=self)
+                return
+        else:
+            selectors = None
+        self.result = (message, selectors, self.large_var.get())
+        self.destroy()
@@ -0,0 +1,190 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+# 虚拟化的状态列表：Treeview 中只保留可见区域的行，滚动时按路径增删行，
+# 数据全部来自 StatusModel。
+
+PLACEHOLDER_IID = '::placeholder'
+_IID_PREFIX = 'p:'
+
+_SHIFT_MASK = 0x0001
+_CONTROL_MASK = 0x0004
+
+
+def _iid(path):
+    return _IID_PREFIX + path
+
+
+class VirtualStatusView(ttk.Frame):
+    def __init__(self, parent, model):
+        super().__init__(parent, padding=0)
+        self.model = model
+        self.offset = 0
+        self.placeholder = None
+        self._shown = []
+        self._values = {}
+        self._selected = set()
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=('Status', 'File'), show='headings', selectmode='extended')
+        self.tree.heading('Status', text='状态')
+        self.tree.heading('File', text='文件路径')
+        self.tree.column('Status', width=150, anchor='w', stretch=tk.NO)
+        self.tree.column('File', width=400, anchor='w', stretch=tk.YES)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.tree.tag_configure('Modified', foreground='blue')
+        self.tree.tag_configure('Deleted', foreground='red')
+        self.tree.tag_configure('Untracked', foreground='green')
+        self.tree.tag_configure('Renamed', foreground='orange')
+        self.tree.tag_configure('Staged', foreground='dark green')
+        self.tree.tag_configure('Unmerged', foreground='purple')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        try:
+            self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight'))
+        except (ValueError, tk.TclError):
+            self.row_height = tkfont.nametofont('TkDefaultFont').metrics('linespace') + 4
+
+        self.tree.bind('<Configure>', lambda e: self.render())
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_by(3))
+        self.tree.bind('<ButtonPress-1>', self._on_click, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.tree.bind('<Up>', lambda e: self._move_focus(-1))
+        self.tree.bind('<Down>', lambda e: self._move_focus(1))
+        self.tree.bind('<Prior>', lambda e: self._move_focus(-self.visible_rows()))
+        self.tree.bind('<Next>', lambda e: self._move_focus(self.visible_rows()))
+        self.tree.bind('<Home>', lambda e: self._move_focus(-len(self.model)))
+        self.tree.bind('<End>', lambda e: self._move_focus(len(self.model)))
+
+    # ---- 对外接口 ----
+    def set_placeholder(self, status=None, text=''):
+        # 模型为空时显示的提示行；status 为 None 表示不显示
+        self.placeholder = None if status is None else (status, text)
+        self.render()
+
+    def selected_paths(self):
+        return sorted(self._selected)
+
+    def show(self, path):
+        index = self.model.index(path)
+        if index < 0:
+            return
+        rows = self.visible_rows()
+        if index < self.offset or index >= self.offset + rows:
+            self.offset = max(0, index - rows // 2)
+            self.render()
+
+    def visible_rows(self):
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget('height') or 10) * self.row_height
+        # 扣除表头高度
+        return max(1, (height - self.row_height - 4) // self.row_height)
+
+    def render(self):
+        total = len(self.model)
+        if total == 0:
+            self._sync([])
+            if self.placeholder and not self.tree.exists(PLACEHOLDER_IID):
+                self.tree.insert('', 'end', iid=PLACEHOLDER_IID, values=self.placeholder)
+            elif self.tree.exists(PLACEHOLDER_IID):
+                if self.placeholder:
+                    self.tree.item(PLACEHOLDER_IID, values=self.placeholder)
+                else:
+                    self.tree.delete(PLACEHOLDER_IID)
+            self._selected.clear()
+            self.offset = 0
+            self.scrollbar.set(0.0, 1.0)
+            return
+        if self.tree.exists(PLACEHOLDER_IID):
+            self.tree.delete(PLACEHOLDER_IID)
+        rows = self.visible_rows()
+        self.offset = max(0, min(self.offset, total - rows))
+        window = self.model.paths[self.offset:self.offset + rows + 1]
+        self._sync(window)
+        if self._selected:
+            self._selected = {path for path in self._selected if path in self.model}
+            visible_selected = [_iid(path) for path in window if path in self._selected]
+            if set(visible_selected) != set(self.tree.selection()):
+                self.tree.selection_set(visible_selected)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + rows) / total))
+
+    # ---- 内部实现 ----
+    def _sync(self, window):
+        # 只对可见窗口内增删改的行操作 Treeview
+        keep = set(window)
+        stale = [path for path in self._shown if path not in keep]
+        if stale:
+            self.tree.delete(*[_iid(path) for path in stale])
+            for path in stale:
+                del self._values[path]
+        for i, path in enumerate(window):
+            status_text, display, tag = value = self.model.row(path)
+            old = self._values.get(path)
+            if old is None:
+                self.tree.insert('', i, iid=_iid(path), values=(status_text, display), tags=(tag,))
+            elif old != value:
+                self.tree.item(_iid(path), values=(status_text, display), tags=(tag,))
+            self._values[path] = value
+        iids = [_iid(path) for path in window]
+        if list(self.tree.get_children()) != iids:
+            for i, iid in enumerate(iids):
+                self.tree.move(iid, '', i)
+        self._shown = list(window)
+
+    def _scroll_by(self, rows):
+        self.offset = max(0, self.offset + rows)
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        total = len(self.model)
+        if action == 'moveto':
+            self.offset = int(float(value) * total)
+        elif action == 'scroll':
+            step = self.visible_rows() if unit == 'pages' else 1
+            self.offset += int(value) * step
+        self.offset = max(0, self.offset)
+        self.render()
+
+    def _on_mousewheel(self, event):
+        # Windows 上 delta 为 120 的倍数，macOS 上为较小的整数
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-steps * 3)
+
+    def _on_click(self, event):
+        if not event.state & (_SHIFT_MASK | _CONTROL_MASK):
+            self._selected.clear()
+
+    def _on_select(self, event=None):
+        visible = set(self._shown)
+        current = {iid[len(_IID_PREFIX):] for iid in self.tree.selection() if iid.startswith(_IID_PREFIX)}
+        self._selected = {path for path in self._selected if path not in visible} | current
+
+    def _move_focus(self, delta):
+        total = len(self.model)
+        if not total:
+            return "break"
+        focus = self.tree.focus()
+        if focus.startswith(_IID_PREFIX):
+            index = self.model.index(focus[len(_IID_PREFIX):])
+        else:
+            index = self.offset - (1 if delta > 0 else 0)
+        index = max(0, min(total - 1, index + delta))
+        path = self.model.paths[index]
+        rows = self.visible_rows()
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + rows:
+            self.offset = index - rows + 1
+        self._selected = {path}
+        self.render()
+        self.tree.focus(_iid(path))
+        self.tree.selection_set(_iid(path))
+        self.tree.see(_iid(path))
+        return "break"
@@ -0,0 +1,228 @@
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from gitpro.bulk import BULK_FETCH, BULK_PULL, BULK_PUSH
+from gitpro.ui.bulk_view import BulkWindow
+from gitpro.workspace import WORKSPACE_GROUP, discover_repos, is_repo_dir, normalize_path, refresh_repos
+
+# 工作区窗口：每个登记的仓库一行（分支、改动数、领先 / 落后），
+# 全部刷新时各仓库的结果到达后单独更新对应的行；双击切换主窗口到该仓库。
+# 批量获取 / 拉取 / 推送作用于所选仓库（未选择时为全部仓库），结束后刷新这些仓库。
+
+COLUMNS = [('name', '仓库', 180), ('branch', '分支', 160), ('dirty', '改动', 60), ('ahead', '↑', 50),
+           ('behind', '↓', 50), ('upstream', '上游', 160), ('updated', '更新时间', 80)]
+NUMERIC_COLUMNS = {'dirty', 'ahead', 'behind'}
+
+
+class WorkspaceWindow(tk.Toplevel):
+    def __init__(self, master, workspace, executor, dispatcher, cache=None, on_open=None, get_current_repo=None,
+                 on_repos_changed=None):
+        super().__init__(master)
+        self.workspace = workspace
+        self.executor = executor
+        self.dispatcher = dispatcher
+        self.cache = cache
+        self.on_open = on_open
+        self.get_current_repo = get_current_repo
+        self.on_repos_changed = on_repos_changed
+        self._pending = set()
+        self._sort = ('name', False)
+        self.title("工作区")
+        self.geometry("860x460")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self, padding=5)
+        toolbar.pack(fill=tk.X)
+        ttk.Button(toolbar, text="添加当前仓库", command=self.add_current).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="添加仓库...", command=self.add_repo).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(toolbar, text="扫描目录...", command=self.scan_directory).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(toolbar, text="移除所选", command=self.remove_selected).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(toolbar, text="🔄 全部刷新", command=self.refresh_all).pack(side=tk.LEFT, padx=(15, 0))
+        ttk.Button(toolbar, text="打开所选", command=self.open_selected).pack(side=tk.LEFT, padx=(5, 0))
+        self.status_label = ttk.Label(toolbar, text="", anchor="e")
+        self.status_label.pack(side=tk.RIGHT)
+
+        bulk_bar = ttk.Frame(self, padding=(5, 0, 5, 5))
+        bulk_bar.pack(fill=tk.X)
+        ttk.Button(bulk_bar, text="⬇ 全部获取", command=lambda: self.start_bulk(BULK_FETCH)).pack(side=tk.LEFT)
+        ttk.Button(bulk_bar, text="⏬ 全部拉取", command=lambda: self.start_bulk(BULK_PULL)).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(bulk_bar, text="⬆ 全部推送", command=lambda: self.start_bulk(BULK_PUSH)).pack(side=tk.LEFT, padx=(5, 0))
+        self.bulk_vars = {}
+        for key, label, low, high in (('concurrency', '并发', 1, 16), ('timeout', '超时 (秒)', 10, 3600),
+                                      ('retries', '重试', 0, 5)):
+            ttk.Label(bulk_bar, text=label).pack(side=tk.LEFT, padx=(15, 0))
+            var = tk.IntVar(value=self.workspace.bulk[key])
+            ttk.Spinbox(bulk_bar, from_=low, to=high, textvariable=var, width=5).pack(side=tk.LEFT)
+            self.bulk_vars[key] = var
+
+        body = ttk.Frame(self, padding=(5, 0, 5, 5))
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in COLUMNS], show='headings', selectmode='extended')
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, anchor='e' if column in NUMERIC_COLUMNS else 'w')
+        self.tree.tag_configure('Dirty', foreground='dark orange')
+        self.tree.tag_configure('Error', foreground='red')
+        self.tree.tag_configure('Pending', foreground='gray')
+        scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind('<Double-1>', lambda e: self.open_selected())
+
+        for path in self.workspace.repos:
+            self.update_row(path)
+        # 首次打开时只刷新还没有结果的仓库
+        missing = [path for path in self.workspace.repos if path not in self.workspace.snapshots]
+        if missing:
+            self.refresh(missing)
+        else:
+            self._update_status_label()
+
+    # ---- 行 ----
+    def update_row(self, path):
+        summary = self.workspace.summary(path)
+        updated = self.workspace.updated.get(path)
+        if path in self._pending:
+            tag = 'Pending'
+        elif summary.error:
+            tag = 'Error'
+        elif summary.dirty:
+            tag = 'Dirty'
+        else:
+            tag = ''
+        branch = summary.error if summary.error else summary.branch
+        values = (summary.name, branch or ('刷新中...' if path in self._pending else ''), summary.dirty or '',
+                  summary.ahead or '', summary.behind or '', summary.upstream or '',
+                  time.strftime('%H:%M:%S', time.localtime(updated)) if updated else '')
+        if self.tree.exists(path):
+            self.tree.item(path, values=values, tags=(tag,))
+        else:
+            self.tree.insert('', tk.END, iid=path, values=values, tags=(tag,))
+
+    def sort_by(self, column):
+        reverse = self._sort == (column, False)
+        self._sort = (column, reverse)
+        def key(iid):
+            value = self.tree.set(iid, column)
+            if column in NUMERIC_COLUMNS:
+                return int(value or 0)
+            return str(value).lower()
+        for index, iid in enumerate(sorted(self.tree.get_children(), key=key, reverse=reverse)):
+            self.tree.move(iid, '', index)
+
+    def _update_status_label(self):
+        total = len(self.workspace)
+        dirty = sum(1 for s in self.workspace.summaries() if s.dirty)
+        text = f"{total} 个仓库，{dirty} 个有改动"
+        if self._pending:
+            text = f"正在刷新 {total - len(self._pending)}/{total}    " + text
+        self.status_label.config(text=text)
+
+    # ---- 刷新 ----
+    def refresh_all(self):
+        self.refresh(list(self.workspace.repos))
+
+    def refresh(self, paths):
+        paths = [path for path in paths if path not in self._pending]
+        if not paths:
+            return
+        self._pending.update(paths)
+        for path in paths:
+            self.update_row(path)
+        self._update_status_label()
+        refresh_repos(self.executor, paths,
+                      lambda path, snapshot, result: self.dispatcher.post(self._on_snapshot, (path, snapshot, result)),
+                      cache=self.cache)
+
+    def _on_snapshot(self, path, snapshot, result):
+        if not self.winfo_exists():
+            return
+        self._pending.discard(path)
+        # 取消时保留上一次的结果；出错或超时时该行显示错误
+        if path in self.workspace:
+            if snapshot is not None:
+                self.workspace.record(path, snapshot)
+            elif not result.get('cancelled'):
+                self.workspace.record_failure(path, result)
+        if self.tree.exists(path):
+            self.update_row(path)
+        self._update_status_label()
+
+    # ---- 登记 ----
+    def _add(self, paths):
+        rejected = [path for path in paths if not is_repo_dir(normalize_path(path))]
+        if rejected:
+            messagebox.showwarning("未加入", "以下路径不是 Git 仓库：\n" + "\n".join(rejected), parent=self)
+        added = self.workspace.add(*paths)
+        if added:
+            self._save()
+            for path in added:
+                self.update_row(path)
+            self.refresh(added)
+        return added
+
+    def add_current(self):
+        if self.get_current_repo:
+            self._add([self.get_current_repo()])
+
+    def add_repo(self):
+        path = filedialog.askdirectory(parent=self, title="选择要加入工作区的仓库")
+        if path:
+            self._add([path])
+
+    def scan_directory(self):
+        root = filedialog.askdirectory(parent=self, title="选择要扫描的目录（查找其中的 Git 仓库）")
+        if not root:
+            return
+        found = discover_repos(root)
+        added = self._add(found)
+        messagebox.showinfo("扫描完成", f"找到 {len(found)} 个仓库，新加入 {len(added)} 个。", parent=self)
+
+    def remove_selected(self):
+        selected = self.tree.selection()
+        if not selected:
+            return
+        self.workspace.remove(*selected)
+        self.tree.delete(*selected)
+        self._pending.difference_update(selected)
+        self._save()
+        self._update_status_label()
+
+    def _save(self):
+        try:
+            self.workspace.save()
+        except OSError as e:
+            messagebox.showerror("错误", f"无法保存工作区: {e}", parent=self)
+
+    def open_selected(self):
+        selected = self.tree.selection()
+        if selected and self.on_open:
+            self.on_open(selected[0])
+
+    # ---- 批量操作 ----
+    def start_bulk(self, operation):
+        paths = list(self.tree.selection()) or list(self.workspace.repos)
+        if not paths:
+            return
+        try:
+            settings = {key: max(0, int(var.get())) for key, var in self.bulk_vars.items()}
+        except (tk.TclError, ValueError):
+            messagebox.showerror("错误", "并发、超时与重试必须是整数", parent=self)
+            return
+        if settings != self.workspace.bulk:
+            self.workspace.bulk.update(settings)
+            self._save()
+        BulkWindow(self, self.executor, self.dispatcher, operation, paths, settings, on_finished=self._on_bulk_finished)
+
+    def _on_bulk_finished(self, run):
+        paths = [item.path for item in run.items]
+        if self.winfo_exists():
+            self.refresh([path for path in paths if path in self.workspace])
+        if self.on_repos_changed:
+            self.on_repos_changed(paths)
+
+    def close(self):
+        self.executor.cancel_group(WORKSPACE_GROUP)
+        self.destroy()
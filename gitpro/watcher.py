@@ -0,0 +1,311 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from gitpro.gitdir import resolve_common_dir, resolve_git_dir
+
+# 仓库变更监视：优先使用 Linux inotify，不可用时退回到按 mtime 轮询。
+# 一段时间内的多次变化合并成一次回调，并按变化的位置给出刷新范围。
+
+SCOPE_BRANCHES = 'branches'
+SCOPE_STATUS = 'status'
+ALL_SCOPES = frozenset((SCOPE_BRANCHES, SCOPE_STATUS))
+
+# .git 根目录下需要关注的文件及其影响范围
+GIT_FILE_SCOPES = {
+    'HEAD': ALL_SCOPES,
+    'index': frozenset((SCOPE_STATUS,)),
+    'packed-refs': frozenset((SCOPE_BRANCHES,)),
+}
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _Debouncer:
+    def __init__(self, callback, delay, max_delay):
+        self.callback = callback
+        self.delay = delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._first = None
+        self._timer = None
+
+    def notify(self, scopes):
+        with self._lock:
+            now = time.monotonic()
+            if self._first is None:
+                self._first = now
+            self._pending.update(scopes)
+            if self._timer is not None:
+                self._timer.cancel()
+            # 持续有变化时也要保证在 max_delay 内刷新一次
+            delay = max(0.0, min(self.delay, self._first + self.max_delay - now))
+            self._timer = threading.Timer(delay, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            scopes = frozenset(self._pending)
+            self._pending.clear()
+            self._first = None
+            self._timer = None
+        if scopes:
+            self.callback(scopes)
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._pending.clear()
+            self._first = None
+
+
+class _PollingBackend:
+    name = 'polling'
+
+    def __init__(self, watcher, interval=1.0, worktree_interval=3.0, max_worktree_files=50000):
+        self.watcher = watcher
+        self.interval = interval
+        self.worktree_interval = worktree_interval
+        self.max_worktree_files = max_worktree_files
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._git_state = self._scan_git()
+        self._worktree_state = self._scan_worktree()
+        self._last_worktree_scan = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="repo-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _scan_git(self):
+        w = self.watcher
+        state = {}
+        for name in GIT_FILE_SCOPES:
+            base = w.common_dir if name == 'packed-refs' else w.git_dir
+            state[name] = _stat_key(os.path.join(base, name))
+        refs_dir = os.path.join(w.common_dir, 'refs')
+        for dirpath, _, filenames in os.walk(refs_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                state[path] = _stat_key(path)
+        return state
+
+    def _scan_worktree(self):
+        # 文件过多时只比较目录的 mtime（能发现新增 / 删除，发现不了修改）
+        state = {}
+        count = 0
+        dirs_only = False
+        for dirpath, dirnames, filenames in os.walk(self.watcher.path):
+            if '.git' in dirnames:
+                dirnames.remove('.git')
+            state[dirpath] = _stat_key(dirpath)
+            if dirs_only:
+                continue
+            count += len(filenames)
+            if count > self.max_worktree_files:
+                dirs_only = True
+                continue
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                state[path] = _stat_key(path)
+        return state
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            scopes = set()
+            git_state = self._scan_git()
+            if git_state != self._git_state:
+                for key in set(git_state) | set(self._git_state):
+                    if git_state.get(key) != self._git_state.get(key):
+                        scopes.update(GIT_FILE_SCOPES.get(key, (SCOPE_BRANCHES,)))
+                self._git_state = git_state
+            now = time.monotonic()
+            if now - self._last_worktree_scan >= self.worktree_interval:
+                worktree_state = self._scan_worktree()
+                self._last_worktree_scan = now
+                if worktree_state != self._worktree_state:
+                    scopes.add(SCOPE_STATUS)
+                    self._worktree_state = worktree_state
+            if scopes:
+                self.watcher._notify(scopes)
+
+
+class _InotifyBackend:
+    name = 'inotify'
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = -1
+        self._watches = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._fd = fd
+        try:
+            w = self.watcher
+            self._add_watch(w.git_dir, 'git')
+            if w.common_dir != w.git_dir:
+                self._add_watch(w.common_dir, 'git')
+            self._add_tree(os.path.join(w.common_dir, 'refs'), 'refs')
+            self._add_tree(w.path, 'worktree')
+        except OSError:
+            os.close(fd)
+            self._fd = -1
+            raise
+        self._thread = threading.Thread(target=self._run, name="repo-inotify", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _add_watch(self, path, kind):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK | self.IN_ONLYDIR)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            # ENOSPC：超出 fs.inotify.max_user_watches
+            raise OSError(err, f"无法监视目录: {path}")
+        self._watches[wd] = (path, kind)
+
+    def _add_tree(self, root, kind):
+        for dirpath, dirnames, _ in os.walk(root):
+            if kind == 'worktree' and '.git' in dirnames:
+                dirnames.remove('.git')
+            self._add_watch(dirpath, kind)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                scopes = self._parse(data)
+                if scopes:
+                    self.watcher._notify(scopes)
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _parse(self, data):
+        scopes = set()
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', errors='replace')
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                scopes.update(ALL_SCOPES)
+                continue
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            dir_path, kind = watch
+            if kind == 'git':
+                scopes.update(GIT_FILE_SCOPES.get(name, ()))
+            elif kind == 'refs':
+                scopes.add(SCOPE_BRANCHES)
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._safe_add_tree(os.path.join(dir_path, name), kind)
+            else:
+                if name == '.git':
+                    continue
+                scopes.add(SCOPE_STATUS)
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._safe_add_tree(os.path.join(dir_path, name), kind)
+        return scopes
+
+    def _safe_add_tree(self, path, kind):
+        try:
+            self._add_tree(path, kind)
+        except OSError:
+            pass
+
+
+class RepoWatcher:
+    def __init__(self, path, on_change, debounce=0.3, max_delay=2.0, use_inotify=True, poll_interval=1.0):
+        # on_change(scopes) 在后台线程中调用，scopes 为 SCOPE_* 的 frozenset
+        self.path = path
+        self.git_dir = resolve_git_dir(path)
+        if self.git_dir is None:
+            raise ValueError(f"不是 Git 仓库: {path}")
+        self.common_dir = resolve_common_dir(self.git_dir)
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self._debouncer = _Debouncer(on_change, debounce, max_delay)
+        self._backend = None
+
+    @property
+    def backend(self):
+        return self._backend.name if self._backend else None
+
+    def start(self):
+        if self.use_inotify and sys.platform.startswith('linux'):
+            try:
+                backend = _InotifyBackend(self)
+                backend.start()
+                self._backend = backend
+                return self.backend
+            except (OSError, AttributeError):
+                pass
+        backend = _PollingBackend(self, interval=self.poll_interval)
+        backend.start()
+        self._backend = backend
+        return self.backend
+
+    def stop(self):
+        if self._backend is not None:
+            self._backend.stop()
+            self._backend = None
+        self._debouncer.cancel()
+
+    def _notify(self, scopes):
+        self._debouncer.notify(scopes)
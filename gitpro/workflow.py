@@ -0,0 +1,174 @@
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from gitpro.gitdir import resolve_git_dir
+
+# 多步操作（工作流）的声明与中断状态：一个工作流是一组依次执行的 git 命令，
+# 由 GitService.run_workflow 在同一个工作线程中连续执行，遇到第一个失败即停止。
+# 可继续的工作流在执行期间把进度写入 .git/gitpro-workflow.json，
+# 停在中途（如合并冲突、推送失败、被取消）后可以继续执行，或回滚到开始前的状态。
+
+STATE_FILE = 'gitpro-workflow.json'
+STATE_VERSION = 1
+RESET_KEEP = '--keep'
+RESET_SOFT = '--soft'
+
+
+class Step(NamedTuple):
+    label: str
+    command: Tuple[str, ...]
+    allowed: Tuple[int, ...] = (0,)
+    # 失败时仍继续执行后续步骤
+    optional: bool = False
+    # 步骤停在中途时 .git 中留下的标记文件（如 MERGE_HEAD），以及完成 / 放弃它的命令
+    pending: Optional[str] = None
+    conclude: Optional[Tuple[str, ...]] = None
+    abort: Optional[Tuple[str, ...]] = None
+    # 成功后结果已发布到远程，之后不能回滚
+    publishes: bool = False
+    # 写入标准输入的内容（如 update-index --stdin 的路径列表）
+    input: Optional[str] = None
+
+
+def step(label, command, **kwargs):
+    kwargs = {key: tuple(value) if isinstance(value, list) else value for key, value in kwargs.items()}
+    return Step(label, tuple(command), **kwargs)
+
+
+@dataclass
+class Workflow:
+    name: str
+    steps: List[Step]
+    # 执行期间保存进度，中断后可继续或回滚
+    resumable: bool = False
+    # 回滚时恢复到开始前位置的本地分支；当前分支用 git reset <reset_mode> 恢复
+    touches: List[str] = field(default_factory=list)
+    reset_mode: str = RESET_KEEP
+
+
+@dataclass
+class WorkflowState:
+    name: str
+    steps: List[Step]
+    touches: List[str]
+    reset_mode: str
+    # 下一个（或失败的）步骤的下标
+    next: int = 0
+    failed: bool = False
+    message: str = ''
+    published: bool = False
+    # 开始时所在的分支与各相关分支的提交（分支不存在时为 None）
+    origin_branch: Optional[str] = None
+    refs: Dict[str, Optional[str]] = field(default_factory=dict)
+    started: float = 0.0
+
+    @property
+    def current(self):
+        return self.steps[self.next] if self.next < len(self.steps) else None
+
+    def workflow(self):
+        return Workflow(self.name, self.steps, resumable=True, touches=self.touches, reset_mode=self.reset_mode)
+
+    def describe(self):
+        step_ = self.current
+        where = f"停在第 {self.next + 1}/{len(self.steps)} 步（{step_.label}）" if step_ else "所有步骤已完成"
+        text = f"未完成的操作 '{self.name}'：{where}"
+        if self.message:
+            text += f"\n{self.message}"
+        return text
+
+    def to_dict(self):
+        return {
+            'version': STATE_VERSION, 'name': self.name, 'steps': [list(s) for s in self.steps],
+            'touches': self.touches, 'reset_mode': self.reset_mode, 'next': self.next, 'failed': self.failed,
+            'message': self.message, 'published': self.published, 'origin_branch': self.origin_branch,
+            'refs': self.refs, 'started': self.started,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        steps = []
+        for values in data['steps']:
+            values = [tuple(v) if isinstance(v, list) else v for v in values]
+            steps.append(Step(*values))
+        return cls(name=data['name'], steps=steps, touches=list(data.get('touches', [])),
+                   reset_mode=data.get('reset_mode', RESET_KEEP), next=int(data.get('next', 0)),
+                   failed=bool(data.get('failed')), message=data.get('message', ''),
+                   published=bool(data.get('published')), origin_branch=data.get('origin_branch'),
+                   refs=dict(data.get('refs', {})), started=float(data.get('started', 0.0)))
+
+
+def state_path(repo_path):
+    git_dir = resolve_git_dir(repo_path)
+    return os.path.join(git_dir, STATE_FILE) if git_dir else None
+
+
+def load_state(repo_path):
+    path = state_path(repo_path)
+    if path is None:
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != STATE_VERSION:
+            return None
+        return WorkflowState.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_state(repo_path, state):
+    path = state_path(repo_path)
+    if path is None:
+        return
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state.to_dict(), f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def clear_state(repo_path):
+    path = state_path(repo_path)
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+def new_state(workflow, origin_branch, refs):
+    return WorkflowState(name=workflow.name, steps=list(workflow.steps), touches=list(workflow.touches),
+                         reset_mode=workflow.reset_mode, origin_branch=origin_branch, refs=dict(refs),
+                         started=time.time())
+
+
+def pending_marker(repo_path, step_):
+    # 步骤是否停在中途（标记文件仍存在）
+    if step_ is None or not step_.pending:
+        return False
+    git_dir = resolve_git_dir(repo_path)
+    return git_dir is not None and os.path.exists(os.path.join(git_dir, step_.pending))
+
+
+def rollback_workflow(state, head, oids, pending):
+    # 由当前 HEAD 与各分支的提交生成回滚工作流：放弃停在中途的步骤，回到开始时所在的分支，
+    # 再把相关分支恢复到开始前的提交（当前分支用 reset，其他分支用 branch -f / -D）
+    steps = []
+    if pending and state.current is not None and state.current.abort:
+        steps.append(step(f"放弃：{state.current.label}", state.current.abort))
+    changed = {branch: oid for branch, oid in state.refs.items() if oids.get(branch) != oid}
+    if head in changed and changed[head] is not None:
+        oid = changed.pop(head)
+        steps.append(step(f"恢复 {head} 到 {oid[:8]}", ["git", "reset", state.reset_mode, oid]))
+    if state.origin_branch and state.origin_branch != head:
+        steps.append(step(f"切换回 {state.origin_branch}", ["git", "switch", state.origin_branch]))
+        head = state.origin_branch
+    for branch, oid in changed.items():
+        if oid is None:
+            if branch != head:
+                steps.append(step(f"删除新建的分支 {branch}", ["git", "branch", "-D", branch]))
+        elif branch == head:
+            steps.append(step(f"恢复 {branch} 到 {oid[:8]}", ["git", "reset", state.reset_mode, oid]))
+        else:
+            steps.append(step(f"恢复 {branch} 到 {oid[:8]}", ["git", "branch", "-f", branch, oid]))
+    return Workflow(f"rollback_{state.name}", steps)
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from gitpro.bulk import BULK_DEFAULTS
+from gitpro.executor import PRIORITY_NORMAL, make_result
+from gitpro.snapshot import collect_snapshot
+
+# 多仓库工作区：登记的仓库列表保存在 ~/.git_manager/workspace.json；
+# 刷新时每个仓库提交一个只读取 status 的快照任务（一个 git 进程），
+# 并发数由共享的执行引擎限制，每个仓库的结果到达后单独回调。
+
+WORKSPACE_PATH = os.path.join(os.path.expanduser('~'), '.git_manager', 'workspace.json')
+WORKSPACE_GROUP = 'workspace'
+# 扫描目录时向下查找仓库的最大层数
+DISCOVER_DEPTH = 3
+
+
+def normalize_path(path):
+    return os.path.normpath(os.path.abspath(os.path.expanduser(path)))
+
+
+def is_repo_dir(path):
+    # 与扫描相同的判断：目录下有 .git（目录，或工作树 / 子模块的 .git 文件）
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, '.git'))
+
+
+def discover_repos(root, max_depth=DISCOVER_DEPTH):
+    # 查找 root 下包含 .git 的目录；不进入仓库内部继续查找
+    found = []
+    stack = [(normalize_path(root), 0)]
+    while stack:
+        current, depth = stack.pop()
+        if is_repo_dir(current):
+            found.append(current)
+            continue
+        if depth >= max_depth:
+            continue
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                        stack.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return sorted(found)
+
+
+class RepoSummary(NamedTuple):
+    path: str
+    name: str
+    branch: str
+    dirty: int
+    ahead: int
+    behind: int
+    upstream: Optional[str]
+    error: str
+
+
+def snapshot_error(result):
+    # 快照任务没有返回快照（异常、超时或取消）时的错误说明
+    if result.get('cancelled'):
+        return '刷新已取消'
+    message = (result.get('stderr') or '').strip()
+    return message or ('刷新超时' if result.get('timed_out') else '刷新失败')
+
+
+def summarize_repo(path, snapshot, result=None):
+    # result 为快照任务的结果字典；尚未刷新时为 None
+    name = os.path.basename(path)
+    if snapshot is None:
+        return RepoSummary(path, name, '', 0, 0, 0, None, snapshot_error(result) if result is not None else '')
+    if not snapshot.is_repo:
+        return RepoSummary(path, name, '', 0, 0, 0, None, snapshot.error or '不是一个 Git 仓库')
+    branch = snapshot.head if not snapshot.detached else f"分离 HEAD ({(snapshot.oid or '')[:8]})"
+    return RepoSummary(path, name, branch, snapshot.dirty_count, snapshot.ahead, snapshot.behind,
+                       snapshot.upstream, snapshot.error)
+
+
+class Workspace:
+    def __init__(self, path=WORKSPACE_PATH):
+        self.path = path
+        self.repos = []
+        # 批量获取 / 拉取 / 推送的并发数、每个仓库的超时（秒）与重试次数
+        self.bulk = dict(BULK_DEFAULTS)
+        # 每个仓库最近一次的快照与采集时间；只在调用方线程（界面线程）中修改
+        self.snapshots = {}
+        self.updated = {}
+        # 最近一次刷新失败（异常或超时）的结果字典
+        self.failures = {}
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        self.repos = [normalize_path(p) for p in data.get('repos', []) if isinstance(p, str)]
+        bulk = data.get('bulk')
+        if isinstance(bulk, dict):
+            self.bulk.update({k: v for k, v in bulk.items() if k in BULK_DEFAULTS and isinstance(v, int)})
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'repos': self.repos, 'bulk': self.bulk}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self.repos
+
+    def __len__(self):
+        return len(self.repos)
+
+    def add(self, *paths):
+        # 不是 Git 仓库的路径不登记（调用方可用 is_repo_dir 找出并提示）
+        added = []
+        for path in paths:
+            path = normalize_path(path)
+            if path not in self.repos and is_repo_dir(path):
+                self.repos.append(path)
+                added.append(path)
+        return added
+
+    def remove(self, *paths):
+        removed = []
+        for path in paths:
+            path = normalize_path(path)
+            if path in self.repos:
+                self.repos.remove(path)
+                self.snapshots.pop(path, None)
+                self.updated.pop(path, None)
+                self.failures.pop(path, None)
+                removed.append(path)
+        return removed
+
+    def record(self, path, snapshot):
+        path = normalize_path(path)
+        self.snapshots[path] = snapshot
+        self.updated[path] = time.time()
+        self.failures.pop(path, None)
+        return path
+
+    def record_failure(self, path, result):
+        # 刷新失败时不再保留旧的快照，该仓库显示为错误
+        path = normalize_path(path)
+        self.snapshots.pop(path, None)
+        self.failures[path] = result
+        self.updated[path] = time.time()
+        return path
+
+    def snapshot(self, path, max_age=None):
+        # 返回已采集的快照；max_age（秒）限定最长可接受的时间
+        path = normalize_path(path)
+        snapshot = self.snapshots.get(path)
+        if snapshot is None or (max_age is not None and time.time() - self.updated.get(path, 0) > max_age):
+            return None
+        return snapshot
+
+    def summary(self, path):
+        return summarize_repo(path, self.snapshots.get(path), self.failures.get(path))
+
+    def summaries(self):
+        return [self.summary(path) for path in self.repos]
+
+
+def refresh_repos(executor, paths, on_snapshot, cache=None, priority=PRIORITY_NORMAL, group=WORKSPACE_GROUP):
+    # on_snapshot(path, snapshot, result) 在工作线程中调用；取消或出错时 snapshot 为 None。
+    # 任务键与主窗口的刷新不同：主窗口的刷新需要逐批收到状态条目，且不应随工作区窗口关闭而取消；
+    # 同一仓库排队中的工作区刷新会合并
+    jobs = []
+    for path in paths:
+        def task(job, path=path):
+            snapshot = collect_snapshot(path, job=job, with_refs=False, cache=cache)
+            return make_result('', snapshot.error, 0 if snapshot.is_repo else 128, snapshot=snapshot)
+        jobs.append(executor.submit(
+            task, on_done=lambda result, path=path: on_snapshot(path, result.get('snapshot'), result),
+            group=group, priority=priority, key=(path, 'workspace_snapshot'), name='workspace_snapshot'))
+    return jobs
+
+
+def collect_all(executor, paths, cache=None, on_snapshot=None):
+    # 同步等待所有仓库的结果（命令行使用），返回 {path: 结果字典}，快照在 result['snapshot'] 中
+    results = {}
+    lock = threading.Lock()
+    done = threading.Event()
+    remaining = [len(paths)]
+    if not paths:
+        return results
+    def collect(path, snapshot, result):
+        with lock:
+            results[path] = result
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if on_snapshot is not None:
+            on_snapshot(path, snapshot, result)
+        if finished:
+            done.set()
+    refresh_repos(executor, paths, collect, cache=cache)
+    done.wait()
+    return results